@@ -1,8 +1,15 @@
 #!/usr/bin/env python
+import os
+
 import pygame
 
 from game_of_life_board import GameOfLifeBoard
-import pdb
+from game_of_life_patterns import read_pattern
+from game_of_life_pipeline import GameOfLifePipeline
+from game_of_life_profiler import GameOfLifeProfiler
+from game_of_life_renderer import GameOfLifeRenderer
+from game_of_life_rules import GameOfLifeRule
+from game_of_life_viewport import GameOfLifeViewport
 
 
 class GameOfLife(object):
@@ -24,6 +31,42 @@ class GameOfLife(object):
     KEY_0_CODE = 48  # '0'
     VIEW_BOARD_KEY_CODE = 118  # 'v'
     QUIT_KEY_CODES = {113}  # 'q'
+    FIT_VIEW_KEY_CODE = 102  # 'f'
+    PAUSE_KEY_CODE = 32  # ' '
+    # keys that step the post-game board through its recorded history by
+    # this many generations
+    HISTORY_KEY_STEPS = {
+        pygame.K_COMMA: -1,  # ','
+        pygame.K_PERIOD: 1,  # '.'
+        pygame.K_LEFTBRACKET: -10,  # '['
+        pygame.K_RIGHTBRACKET: 10  # ']'
+    }
+    HISTORY_FIRST_KEY_CODE = pygame.K_HOME
+    HISTORY_LAST_KEY_CODE = pygame.K_END
+    # keys that multiply the generations per second while simulating
+    SPEED_KEY_FACTORS = {
+        pygame.K_EQUALS: 2,  # '='/'+'
+        pygame.K_MINUS: 0.5  # '-'
+    }
+    # arrow keys pan the view by this fraction of the window
+    PAN_KEY_DIRECTIONS = {
+        pygame.K_LEFT: (-1, 0),
+        pygame.K_RIGHT: (1, 0),
+        pygame.K_UP: (0, -1),
+        pygame.K_DOWN: (0, 1)
+    }
+    PAN_FRACTION = 0.25
+    # each mouse wheel step zooms the view in or out by this factor
+    ZOOM_FACTOR = 1.25
+    BOARD_ENGINE = 'numpy'
+    BOARD_TOPOLOGY = 'bounded'
+    MAX_BOARD_DIMENSION = 1000
+    # simulation limits; None is unlimited
+    MAX_GENERATIONS = None
+    MAX_SIMULATION_SECONDS = None
+    # JSON-lines file to trace each generation's phase times and counters
+    # to (see GameOfLifeProfiler); None only prints a summary
+    PROFILE_TRACE_PATH = None
 
     def __init__(self):
         """
@@ -39,6 +82,7 @@ class GameOfLife(object):
         self.game_phase = GameOfLife.GAME_PHASES['initialization']
         self.menu = ['start simulation', 'create board', 'load board', 'quit']
         rows, cols = self.get_board_size()
+        rule = self.get_rule()
 
         self.draw_blank_canvas()
         pygame.display.flip()
@@ -48,6 +92,11 @@ class GameOfLife(object):
                 'rows': rows,
                 'cols': cols,
                 'live_cell_coords': self.load_board(rows, cols),
+                'engine': GameOfLife.BOARD_ENGINE,
+                'detect_cycles': rule.num_states == 2,
+                'rule': rule,
+                'topology': GameOfLife.BOARD_TOPOLOGY,
+                'record_history': True,
                 'GUI_components': {
                     'draw_surface': self.surface,
                     'cell_width': self.screen_info.current_w / cols,
@@ -58,9 +107,18 @@ class GameOfLife(object):
                     'dead_color': self.get_item_color('dead cell'),
                     'cell_draw_func': self.get_cell_draw_func()
                 }
+            },
+            'simulation': {
+                'max_generations': GameOfLife.MAX_GENERATIONS,
+                'max_seconds': GameOfLife.MAX_SIMULATION_SECONDS
             }
         }
         self.game = None
+        self.renderer = None
+        self.viewport = None
+        self.pipeline = None
+        # stat category whose heatmap is shown, or None for the board
+        self.shown_category = None
 
     def start(self):
         """
@@ -84,6 +142,13 @@ class GameOfLife(object):
         self.game = {
             'board': GameOfLifeBoard(**self.menu_selections['board'])
         }
+        self.viewport = GameOfLifeViewport(
+            self.game['board'].rows, self.game['board'].cols,
+            self.screen_info.current_w, self.screen_info.current_h)
+        self.renderer = GameOfLifeRenderer(
+            self.game['board'], self.surface, GameOfLife.CANVAS_COLOR,
+            viewport=self.viewport)
+        self.game['board'].renderer = self.renderer
 
         self.game['board'].display_self()
         pygame.display.flip()
@@ -93,6 +158,8 @@ class GameOfLife(object):
         while self.game_phase == GameOfLife.GAME_PHASES['board creation']:
             self.clock.tick(self.frames_per_second)
             for event in pygame.event.get():
+                if self.handle_view_event(event):
+                    continue
                 if hasattr(event, 'key') and event.key == pygame.K_RETURN:
                     self.game_phase = GameOfLife.GAME_PHASES['transition']
                     break
@@ -102,8 +169,9 @@ class GameOfLife(object):
                     if not clicked_cell:
                         continue
                     clicked_cell.is_alive = not clicked_cell.is_alive
-                    clicked_cell.draw_self()
-                    pygame.display.flip()
+                    self.game['board'].draw_cells(
+                        [(clicked_cell.row, clicked_cell.col)])
+                    self.renderer.present()
                     break
 
         self.start_game()
@@ -114,11 +182,27 @@ class GameOfLife(object):
         """
         self.game_phase = GameOfLife.GAME_PHASES['simulation']
 
-        # simulate
+        # simulate on a worker thread, drawing and handling events here
         pygame.time.delay(self.animation_delay_length)
-        while self.game['board'].advance_board_one_generation():
-            pygame.display.flip()
-            pygame.time.delay(self.animation_delay_length)
+        profiler = GameOfLifeProfiler(
+            trace_path=GameOfLife.PROFILE_TRACE_PATH)
+        self.pipeline = GameOfLifePipeline(
+            self.game['board'],
+            frames_per_second=self.frames_per_second,
+            generations_per_second=(
+                1000 / self.animation_delay_length
+                if self.animation_delay_length else None),
+            display_func=self.renderer.present,
+            event_func=self.handle_simulation_events, profiler=profiler,
+            **self.menu_selections['simulation'])
+        print('<space>: pause/resume\n<+>/<->: faster/slower\n<q>: stop')
+        self.game['result'] = self.pipeline.run()
+        profiler.close()
+        self.game['profile'] = profiler.get_summary()
+        print('Simulation stopped ({}) after {} generations'.format(
+            self.game['result']['stop_reason'],
+            self.game['result']['generations']))
+        print(profiler)
 
         # wait for player to quit
         self.game_phase = GameOfLife.GAME_PHASES['post-game']
@@ -128,37 +212,119 @@ class GameOfLife(object):
         while self.game_phase == GameOfLife.GAME_PHASES['post-game']:
             self.clock.tick(self.frames_per_second)
             for event in pygame.event.get():
+                if (self.handle_view_event(event) or
+                        self.handle_history_event(event)):
+                    continue
                 stat_codes = GameOfLifeBoard.STAT_CATEGORIES
                 if hasattr(event, 'key'):
                     if event.key in GameOfLife.QUIT_KEY_CODES:
                         self.game_phase = GameOfLife.GAME_PHASES['transition']
                         break
                     elif event.key == GameOfLife.VIEW_BOARD_KEY_CODE:
+                        self.shown_category = None
                         self.game['board'].display_self()
                         pygame.display.flip()
                     elif (0 <= event.key - GameOfLife.KEY_0_CODE <
                               len(GameOfLifeBoard.STAT_CATEGORIES)):
-                        # pygame does not draw with alpha. must blit.
-                        color = self.game['board'].GUI_components['alive_color']
-                        board = self.game['board'].board
-                        category = GameOfLifeBoard.STAT_CATEGORIES[event.key-GameOfLife.KEY_0_CODE]
-                        self.draw_blank_canvas()
-                        for row in range(len(board)):
-                            for cell in board[row]:
-                                cell.draw_outline()
-                                shape = cell.GUI_components['shape']
-                                cell_surface = pygame.Surface(
-                                    (shape.width, shape.height),
-                                    pygame.SRCALPHA)
-                                color.a = self.game['board'].get_stat_alpha(
-                                    cell, category)
-                                cell_surface.fill(color)
-                                self.surface.blit(
-                                    cell_surface, (shape.x, shape.y))
-                        color.a = 255  # reset base alpha
+                        category = GameOfLifeBoard.STAT_CATEGORIES[
+                            event.key-GameOfLife.KEY_0_CODE]
+                        self.shown_category = category
+                        self.renderer.draw_stat_heatmap(category)
                         pygame.display.flip()
                         break
 
+    def handle_simulation_events(self):
+        """
+        Handle the events since the last frame of the simulation: pan and
+        zoom the view, pause or resume, change the speed or stop.
+        """
+        pipeline = self.pipeline
+        for event in pygame.event.get():
+            if self.handle_view_event(event):
+                continue
+            if event.type == pygame.QUIT:
+                pipeline.stop()
+            elif event.type != pygame.KEYDOWN:
+                continue
+            elif event.key in GameOfLife.QUIT_KEY_CODES:
+                pipeline.stop()
+            elif event.key == GameOfLife.PAUSE_KEY_CODE:
+                if pipeline.is_paused:
+                    pipeline.resume()
+                else:
+                    pipeline.pause()
+            elif event.key in GameOfLife.SPEED_KEY_FACTORS:
+                factor = GameOfLife.SPEED_KEY_FACTORS[event.key]
+                interval = pipeline.generation_interval
+                if interval is not None:
+                    pipeline.set_generations_per_second(factor / interval)
+                elif factor < 1:
+                    # slowing down an unlimited run starts at a generation
+                    # a frame
+                    pipeline.set_generations_per_second(
+                        self.frames_per_second)
+
+    def handle_view_event(self, event):
+        """
+        Pan or zoom the view for arrow keys, the mouse wheel and the fit
+        view key, and redraw the board or the shown heatmap.
+        Return True if the event was handled, False otherwise.
+        """
+        viewport = self.viewport
+        if event.type == pygame.MOUSEWHEEL:
+            viewport.zoom(GameOfLife.ZOOM_FACTOR**event.y,
+                          *pygame.mouse.get_pos())
+        elif event.type != pygame.KEYDOWN:
+            return False
+        elif event.key in GameOfLife.PAN_KEY_DIRECTIONS:
+            dx, dy = GameOfLife.PAN_KEY_DIRECTIONS[event.key]
+            viewport.pan(dx*viewport.width*GameOfLife.PAN_FRACTION,
+                         dy*viewport.height*GameOfLife.PAN_FRACTION)
+        elif event.key == GameOfLife.FIT_VIEW_KEY_CODE:
+            viewport.fit()
+        else:
+            return False
+        if self.shown_category is None:
+            self.renderer.draw_board()
+        else:
+            self.renderer.draw_stat_heatmap(self.shown_category)
+        self.renderer.present()
+        return True
+
+    def handle_history_event(self, event):
+        """
+        Step, rewind or seek the post-game board through its recorded
+        history for the history keys, and show the board at that
+        generation.
+        Return True if the event was handled, False otherwise.
+        """
+        board = self.game['board']
+        history = board.history
+        if (history is None or not len(history) or
+                event.type != pygame.KEYDOWN):
+            return False
+        if event.key in GameOfLife.HISTORY_KEY_STEPS:
+            generation = (board.generation +
+                          GameOfLife.HISTORY_KEY_STEPS[event.key])
+            generation = min(max(generation, history.first_generation),
+                             history.last_generation)
+        elif event.key == GameOfLife.HISTORY_FIRST_KEY_CODE:
+            generation = history.first_generation
+        elif event.key == GameOfLife.HISTORY_LAST_KEY_CODE:
+            generation = history.last_generation
+        else:
+            return False
+        if generation not in history:
+            print('generation {} was not recorded'.format(generation))
+            return True
+        if self.shown_category is not None:
+            self.shown_category = None
+            board.display_self()
+        board.seek(generation)
+        self.renderer.present()
+        print('generation {}'.format(generation))
+        return True
+
     def display_game_stats(self):
         """
         Display stats for a Game of Life.
@@ -167,6 +333,8 @@ class GameOfLife(object):
         """
         board = self.game['board']
         board.calculate_game_stats()
+        if board.cycle_detector is not None:
+            print(board.cycle_detector)
         for stat in board.stats.values():
             print(stat)
 
@@ -178,6 +346,11 @@ class GameOfLife(object):
         for stat_code, category_name in GameOfLifeBoard.STAT_CATEGORIES.items():
             menu += '\n<{}>: view \'{}\' stats'.format(stat_code, category_name)
         menu += '\n<v>: view end board configuration\n<q>: quit'
+        menu += ('\n<arrow keys>/<mouse wheel>: pan/zoom the view'
+                 '\n<f>: fit the whole board in the view'
+                 '\n<,>/<.>: step back/forward a generation'
+                 '\n<[>/<]>: step back/forward 10 generations'
+                 '\n<home>/<end>: go to the first/last recorded generation')
         print(menu)
 
     def reset_menu_selections(self):
@@ -185,16 +358,14 @@ class GameOfLife(object):
 
     def get_cell_from_screen_coords(self, screen_coords):
         """
-        Return the GameOfLifeCell at the given (x, y) screen coords.
+        Return the GameOfLifeCell at the given (x, y) screen coords in the
+        current view.
         Return None if coords are out of board bounds.
         """
-        row = int(
-            screen_coords[1]/self.game['board'].GUI_components['cell_height'])
-        col = int(
-            screen_coords[0]/self.game['board'].GUI_components['cell_width'])
-        if (row < 0 or row >= self.game['board'].rows or
-                col < 0 or col >= self.game['board'].cols):
+        cell_coords = self.viewport.get_cell_at(*screen_coords)
+        if cell_coords is None:
             return None
+        row, col = cell_coords
         return self.game['board'].board[row][col]
 
     def get_board_size(self):
@@ -206,19 +377,21 @@ class GameOfLife(object):
             try:
                 print('***************')
                 rows = int(input('Enter number of rows: '))
-                if 0 < rows <= 100:
+                if 0 < rows <= GameOfLife.MAX_BOARD_DIMENSION:
                     break
             except:
-                print('enter a number between 1 and 100')
+                print('enter a number between 1 and {}'.format(
+                    GameOfLife.MAX_BOARD_DIMENSION))
 
         while True:
             try:
                 print('***************')
                 cols = int(input('Enter number of columns: '))
-                if 0 < cols <= 100:
+                if 0 < cols <= GameOfLife.MAX_BOARD_DIMENSION:
                     break
             except:
-                print('enter a number between 1 and 100')
+                print('enter a number between 1 and {}'.format(
+                    GameOfLife.MAX_BOARD_DIMENSION))
 
         return rows, cols
 
@@ -235,6 +408,8 @@ class GameOfLife(object):
               'so (0,0) is the top left cell.')
         print(
             'Example: If cells (0,3) and (3,2) are alive, enter \'0,3 3,2\'.')
+        print('Or enter the path of an RLE, Life 1.06 or plaintext pattern '
+              'file to center on the board.')
         print('Leave blank to provide no live cells.')
 
         # could improve defensiveness/readability of this logic
@@ -243,6 +418,15 @@ class GameOfLife(object):
             live_cell_string = input()
             if len(live_cell_string) < 1:
                 break
+            if os.path.isfile(live_cell_string):
+                try:
+                    live_cell_coords, _ = read_pattern(
+                        live_cell_string, rows, cols, center=True)
+                except ValueError as error:
+                    print('Error loading pattern: {}; please try again'
+                          .format(error))
+                    continue
+                break
             live_cells = live_cell_string.split(' ')
             for live_cell in live_cells:
                 coords = live_cell.split(',')
@@ -287,16 +471,31 @@ class GameOfLife(object):
             elif shape == 'circle':
                 return pygame.draw.ellipse
 
+    def get_rule(self):
+        """
+        Get the rule cells follow based on user input, e.g. 'B36/S23' or
+        'highlife'. Defaults to the Game of Life (B3/S23).
+        """
+        print('***************')
+        while True:
+            rulestring = input('Enter rule (e.g. B36/S23, blank for the '
+                               'Game of Life): ').strip()
+            try:
+                return GameOfLifeRule(rulestring or 'B3/S23')
+            except ValueError as error:
+                print(error)
+
     def get_animation_delay_length(self):
         """
         Get the animation delay length based on user input.
+        A delay of 0 runs as many generations as fit between frames.
         """
         print('***************')
         while True:
             try:
-                speed = int(input('Enter animation speed (1 - 10, 10 being '
-                                 'slowest): '))
-                if 1 <= speed <= 10:
+                speed = int(input('Enter animation speed (0 - 10, 10 being '
+                                 'slowest, 0 as fast as possible): '))
+                if 0 <= speed <= 10:
                     return 100*speed
             except:
                 pass
@@ -0,0 +1,350 @@
+#!/usr/bin/env python
+"""
+Benchmark stepping, stats and rendering across board sizes and workloads.
+
+Prints results as JSON. Save a run with --output and compare later runs
+against it with --compare to catch regressions, e.g.:
+    python -m game_of_life_benchmark --sizes 32 256 --output baseline.json
+    python -m game_of_life_benchmark --sizes 32 256 --compare baseline.json
+Rendering benchmarks draw offscreen with SDL's dummy video driver.
+
+--imports times cold imports of the headless modules in fresh interpreters
+and exits with status 1 if one takes longer than --import-budget seconds or
+loads a module only the GUI or stat heatmaps need (see SLOW_MODULES), e.g.
+to time imports alone:
+    python -m game_of_life_benchmark --benchmarks --imports
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from game_of_life_board import GameOfLifeBoard
+from game_of_life_patterns import PATTERNS, center_coords, get_pattern_coords
+
+BENCHMARKS = ['step', 'stats', 'stat_alphas', 'stat_alpha', 'display_self',
+              'render', 'heatmap', 'viewport']
+DEFAULT_SIZES = [32, 128, 512, 1024, 4096]
+DEFAULT_DENSITIES = [0.1, 0.3, 0.5]
+DEFAULT_PATTERNS = ['gosper glider gun', 'r-pentomino', 'acorn']
+DEFAULT_ENGINES = ['python', 'numpy']
+
+# benchmarks that loop over cells in Python are skipped on bigger boards
+MAX_PER_CELL_CELLS = 256*256
+# benchmarks that need a board with per-cell GUI components
+MAX_GUI_CELLS = 512*512
+PER_CELL_BENCHMARKS = {'stat_alpha', 'display_self'}
+GUI_BENCHMARKS = {'display_self', 'render', 'heatmap'}
+# the 'viewport' benchmark draws whole boards of any size to a window of
+# this size, zoomed out to fit
+VIEWPORT_WINDOW_SIZE = (640, 480)
+# generations run before benchmarks that need game stats
+WARMUP_GENERATIONS = 8
+# modules whose cold import time is benchmarked, the seconds each may take,
+# and modules they must not load: scipy is imported when stat alphas are
+# first needed, and pygame only by the GUI
+IMPORT_MODULES = ['game_of_life_board', 'game_of_life_headless']
+DEFAULT_IMPORT_BUDGET = 0.5
+SLOW_MODULES = ['scipy', 'pygame']
+
+
+def get_workloads(sizes, densities, patterns, seed):
+    """
+    Yield (workload name, rows, cols, live cell coords) for each board size
+    with each random density and each pattern centered on the board.
+    Random soups are (n, 2) coord arrays so huge boards load quickly.
+    """
+    rng = np.random.default_rng(seed)
+    for size in sizes:
+        for density in densities:
+            yield ('random {}'.format(density), size, size,
+                   np.argwhere(rng.random((size, size)) < density))
+        for pattern in patterns:
+            try:
+                coords = center_coords(get_pattern_coords(pattern), size, size)
+            except ValueError:
+                continue
+            yield pattern, size, size, coords
+
+
+def time_calls(func, min_time):
+    """
+    Call func until at least min_time seconds pass (and at least once).
+    Return (number of calls, seconds taken).
+    """
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        func()
+        calls += 1
+        seconds = time.perf_counter() - start
+        if seconds >= min_time:
+            return calls, seconds
+
+
+def get_GUI_components(rows, cols, window_size=None):
+    """
+    Return GUI components drawing to an offscreen surface, by default one
+    with at least a pixel per cell.
+    """
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+    import pygame
+    width, height = window_size or (max(cols, 640), max(rows, 480))
+    return {
+        'draw_surface': pygame.Surface((width, height)),
+        'cell_width': width / cols,
+        'cell_height': height / rows,
+        'cell_shape_generator': pygame.Rect,
+        'cell_outline_color': pygame.Color('black'),
+        'alive_color': pygame.Color('red'),
+        'dead_color': pygame.Color('white'),
+        'cell_draw_func': pygame.draw.rect
+    }
+
+
+def run_benchmark(benchmark, engine, rows, cols, live_cell_coords, min_time):
+    """
+    Run one benchmark and return a dict of its results, or None if it is
+    skipped for this board size or engine.
+    """
+    cells = rows*cols
+    if benchmark in PER_CELL_BENCHMARKS or engine == 'python':
+        if cells > MAX_PER_CELL_CELLS:
+            return None
+    if benchmark in GUI_BENCHMARKS and cells > MAX_GUI_CELLS:
+        return None
+    if benchmark in ('stat_alphas', 'heatmap') and engine == 'python':
+        return None  # vectorized paths want array engines
+
+    GUI_components = None
+    if benchmark in GUI_BENCHMARKS:
+        GUI_components = get_GUI_components(rows, cols)
+    elif benchmark == 'viewport':
+        GUI_components = get_GUI_components(rows, cols, VIEWPORT_WINDOW_SIZE)
+    board = GameOfLifeBoard(rows, cols, live_cell_coords, GUI_components,
+                            engine=engine)
+
+    if benchmark == 'step':
+        calls, seconds = time_calls(board.advance_board_one_generation,
+                                    min_time)
+        return {'generations': calls, 'seconds': seconds,
+                'generations_per_second': calls/seconds,
+                'cells_per_second': calls*cells/seconds}
+
+    for _ in range(WARMUP_GENERATIONS):
+        board.advance_board_one_generation()
+    board.calculate_game_stats()
+    category = 'gens_alive'
+
+    if benchmark == 'stats':
+        func = board.calculate_game_stats
+    elif benchmark == 'stat_alphas':
+        func = lambda: board.get_stat_alphas(category)
+    elif benchmark == 'stat_alpha':
+        func = lambda: [board.get_stat_alpha(cell, category)
+                        for row in board.board for cell in row]
+    elif benchmark == 'display_self':
+        func = board.display_self
+    else:
+        from game_of_life_renderer import GameOfLifeRenderer
+        import pygame
+        renderer = GameOfLifeRenderer(
+            board, GUI_components['draw_surface'], pygame.Color('white'))
+        if benchmark in ('render', 'viewport'):
+            func = renderer.draw_board
+        else:
+            def func():
+                renderer.heatmaps.clear()
+                renderer.draw_stat_heatmap(category)
+
+    calls, seconds = time_calls(func, min_time)
+    return {'calls': calls, 'seconds': seconds,
+            'calls_per_second': calls/seconds,
+            'cells_per_second': calls*cells/seconds}
+
+
+def run_benchmarks(benchmarks=None, engines=None, sizes=None, densities=None,
+                   patterns=None, min_time=0.5, seed=0):
+    """
+    Run every benchmark for every engine and workload.
+    Return a JSON-serializable dict with run metadata and a list of results.
+    """
+    benchmarks = BENCHMARKS if benchmarks is None else benchmarks
+    engines = engines or DEFAULT_ENGINES
+    sizes = sizes or DEFAULT_SIZES
+    densities = DEFAULT_DENSITIES if densities is None else densities
+    patterns = DEFAULT_PATTERNS if patterns is None else patterns
+
+    results = []
+    for workload, rows, cols, live_cell_coords in get_workloads(
+            sizes, densities, patterns, seed):
+        for engine in engines:
+            for benchmark in benchmarks:
+                result = run_benchmark(benchmark, engine, rows, cols,
+                                       live_cell_coords, min_time)
+                if result is None:
+                    continue
+                result.update({'benchmark': benchmark, 'engine': engine,
+                               'rows': rows, 'cols': cols,
+                               'workload': workload})
+                results.append(result)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'min_time': min_time,
+            'seed': seed
+        },
+        'results': results
+    }
+
+
+def time_import(module, repeat=3):
+    """
+    Import module in fresh interpreters, repeat times.
+    Return a dict with the fastest import's seconds and the list of slow
+    modules (see SLOW_MODULES) the import loaded.
+    """
+    code = ('import sys, time\n'
+            'start = time.perf_counter()\n'
+            'import {}\n'
+            'print(time.perf_counter() - start)\n'
+            'print(*[name for name in {!r} if name in sys.modules])').format(
+                module, SLOW_MODULES)
+    seconds = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', code], check=True, capture_output=True,
+            text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.split('\n')
+        seconds.append(float(output[0]))
+    return {'module': module, 'seconds': min(seconds),
+            'slow_modules': output[1].split()}
+
+
+def run_import_benchmarks(modules=None, repeat=3):
+    """
+    Time the cold import of each module (IMPORT_MODULES by default).
+    Return a list of results (see 'time_import').
+    """
+    return [time_import(module, repeat)
+            for module in modules or IMPORT_MODULES]
+
+
+def check_import_budget(import_results, budget):
+    """
+    Return the list of import results that took longer than budget seconds
+    or loaded slow modules.
+    """
+    return [result for result in import_results
+            if result['seconds'] > budget or result['slow_modules']]
+
+
+def get_result_key(result):
+    """
+    Return the tuple identifying a benchmark case across runs.
+    """
+    return (result['benchmark'], result['engine'], result['rows'],
+            result['cols'], result['workload'])
+
+
+def compare_results(results, baseline, tolerance):
+    """
+    Compare a run's results to a baseline run's.
+    Return a list of dicts describing cases whose cells per second dropped
+    by more than the tolerance (a fraction, e.g. 0.2 for 20%).
+    """
+    baseline_results = {get_result_key(result): result
+                        for result in baseline['results']}
+    regressions = []
+    for result in results['results']:
+        baseline_result = baseline_results.get(get_result_key(result))
+        if baseline_result is None:
+            continue
+        ratio = (result['cells_per_second'] /
+                 baseline_result['cells_per_second'])
+        if ratio < 1 - tolerance:
+            regressions.append({
+                'benchmark': result['benchmark'],
+                'engine': result['engine'],
+                'rows': result['rows'],
+                'cols': result['cols'],
+                'workload': result['workload'],
+                'baseline_cells_per_second':
+                    baseline_result['cells_per_second'],
+                'cells_per_second': result['cells_per_second'],
+                'ratio': ratio
+            })
+    return regressions
+
+
+def get_arg_parser():
+    """
+    Return the argument parser for the benchmark CLI.
+    """
+    parser = argparse.ArgumentParser(
+        description='Benchmark the Game of Life and print results as JSON.')
+    parser.add_argument('--benchmarks', nargs='*', choices=BENCHMARKS)
+    parser.add_argument('--engines', nargs='+')
+    parser.add_argument('--sizes', nargs='+', type=int,
+                        help='board side lengths (default: {})'.format(
+                            DEFAULT_SIZES))
+    parser.add_argument('--densities', nargs='*', type=float)
+    parser.add_argument('--patterns', nargs='*', choices=list(PATTERNS))
+    parser.add_argument('--min-time', type=float, default=0.5,
+                        help='seconds to repeat each benchmark for')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='file to save results to')
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help='results file to compare against; exits with '
+                             'status 1 if any case regressed')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='allowed slowdown vs the baseline (fraction)')
+    parser.add_argument('--imports', action='store_true',
+                        help='also time cold imports of the headless '
+                             'modules; exits with status 1 if one is over '
+                             'budget')
+    parser.add_argument('--import-budget', type=float,
+                        default=DEFAULT_IMPORT_BUDGET,
+                        help='seconds each cold import may take')
+    return parser
+
+
+def main(argv=None):
+    """
+    Run the benchmark CLI.
+    """
+    args = get_arg_parser().parse_args(argv)
+    results = run_benchmarks(
+        benchmarks=args.benchmarks, engines=args.engines, sizes=args.sizes,
+        densities=args.densities, patterns=args.patterns,
+        min_time=args.min_time, seed=args.seed)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+
+    regressions = []
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare_results(
+                results, json.load(baseline_file), args.tolerance)
+        results['regressions'] = regressions
+    slow_imports = []
+    if args.imports:
+        results['imports'] = run_import_benchmarks()
+        slow_imports = check_import_budget(results['imports'],
+                                           args.import_budget)
+        results['slow_imports'] = slow_imports
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write('\n')
+    return 1 if regressions or slow_imports else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
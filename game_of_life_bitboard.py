@@ -0,0 +1,285 @@
+try:
+    import numpy as np
+except ImportError:  # only needed to save patterns
+    np = None
+
+from game_of_life_engine import set_live_cells
+from game_of_life_patterns import write_rle
+from game_of_life_rules import CONWAY
+from game_of_life_topology import get_rule_suffix, get_topology
+
+
+class GameOfLifeBitBoard(object):
+    """
+    Represent a Game of Life board compactly, as one bit per cell.
+
+    Each row is a Python int whose bit c is the cell in column c, so a
+    generation is computed for a whole row at a time with bitwise full-adder
+    logic instead of cell by cell. Any two-state GameOfLifeRule can be used,
+    on a bounded, torus or Klein bottle board.
+
+    This is a fast path for runs that only need the cells, not a
+    GameOfLifeBoard engine: cells keep no stats and no GUI components, and
+    boards are not drawn, profiled or checked for cycles. Use it through
+    game_of_life_headless.run_simulation with bit_board=True, or directly;
+    board[row][col] returns a lightweight GameOfLifeBitCell view so code
+    that only reads 'is_alive', 'rows' and 'cols' works unchanged.
+    """
+    def __init__(self, rows, cols, live_cell_coords=None, rule=CONWAY,
+                 topology='bounded'):
+        """
+        Init a bit-packed board with the given live cells.
+        Raise ValueError for rules with more than two states and for the
+        infinite topology.
+        """
+        if live_cell_coords is None:
+            live_cell_coords = set([])
+        if rule.num_states > 2:
+            raise ValueError('bit boards only support two-state rules, '
+                             'not {}'.format(rule))
+        self.topology = get_topology(topology, rows, cols)
+        if self.topology.IS_INFINITE:
+            raise ValueError('bit boards do not support the {} '
+                             'topology'.format(self.topology))
+        self.rule = rule
+        self.get_next_bits = compile_rule(rule)
+        self.rows = rows
+        self.cols = cols
+        self.generation = 0
+        self.row_mask = (1 << cols) - 1
+        self.row_bits = [0]*rows
+        for row, col in live_cell_coords:
+            self.row_bits[int(row)] |= 1 << int(col)
+        self.board = GameOfLifeBitBoardRows(self)
+        # read by GameOfLifeSimulationDriver
+        self.draw_on_advance = False
+        self.profiler = None
+        self.cycle_detector = None
+
+    @property
+    def population(self):
+        """
+        Return the number of live cells on the board.
+        """
+        return sum(bin(bits).count('1') for bits in self.row_bits)
+
+    def get_cell_state(self, row, col):
+        """
+        Return True if the cell at (row, col) is alive, False otherwise.
+        """
+        return bool((self.row_bits[row] >> col) & 1)
+
+    def set_cell_state(self, row, col, is_alive):
+        """
+        Set the cell at (row, col) alive or dead.
+        """
+        if is_alive:
+            self.row_bits[row] |= 1 << col
+        else:
+            self.row_bits[row] &= ~(1 << col)
+
+    def get_live_cell_coords(self):
+        """
+        Return a list of (row, col) coords of live cells.
+        """
+        live_cell_coords = []
+        for row, bits in enumerate(self.row_bits):
+            while bits:
+                low_bit = bits & -bits
+                live_cell_coords.append((row, low_bit.bit_length()-1))
+                bits ^= low_bit
+        return live_cell_coords
+
+    def advance_board_one_generation(self):
+        """
+        Set the board to the next state based on the board's rule.
+        See GameOfLifeBoard.advance_board_one_generation for the rules.
+
+        Return True if made a change to the board, False otherwise.
+        """
+        row_mask = self.row_mask
+        row_bits = self.row_bits
+        get_next_bits = self.get_next_bits
+
+        topology = self.topology.NAME
+        wraps_cols = topology != 'bounded'
+        last_col = self.cols-1
+
+        # 2 bit sums of each row's three horizontal neighborhoods
+        sums_of_three = []
+        sums_of_two = []
+        for bits in row_bits:
+            if wraps_cols:
+                west = ((bits << 1) | (bits >> last_col)) & row_mask
+                east = (bits >> 1) | ((bits & 1) << last_col)
+            else:
+                west, east = (bits << 1) & row_mask, bits >> 1
+            sums_of_three.append(
+                (west ^ bits ^ east,
+                 (west & bits) | (west & east) | (bits & east)))
+            sums_of_two.append((west ^ east, west & east))
+        # the sums of row -1 and row 'rows'
+        if topology == 'torus':
+            sums_of_three = [sums_of_three[-1]] + sums_of_three + [
+                sums_of_three[0]]
+        elif topology == 'klein bottle':
+            sums_of_three = [
+                tuple(self.reverse_bits(plane) for plane in sums_of_three[-1])
+            ] + sums_of_three + [
+                tuple(self.reverse_bits(plane) for plane in sums_of_three[0])]
+        else:
+            sums_of_three = [(0, 0)] + sums_of_three + [(0, 0)]
+
+        next_row_bits = []
+        for row, bits in enumerate(row_bits):
+            north_0, north_1 = sums_of_three[row]
+            south_0, south_1 = sums_of_three[row+2]
+            middle_0, middle_1 = sums_of_two[row]
+
+            # north + south, a 3 bit sum
+            carry = north_0 & south_0
+            sum_0 = north_0 ^ south_0
+            sum_1 = north_1 ^ south_1 ^ carry
+            sum_2 = (north_1 & south_1) | (carry & (north_1 ^ south_1))
+
+            # + middle, a 4 bit sum
+            carry = sum_0 & middle_0
+            total_0 = sum_0 ^ middle_0
+            total_1 = sum_1 ^ middle_1 ^ carry
+            carry = (sum_1 & middle_1) | (carry & (sum_1 ^ middle_1))
+            next_row_bits.append(get_next_bits(
+                bits, total_0, total_1, sum_2 ^ carry, sum_2 & carry) &
+                row_mask)
+
+        changed = next_row_bits != row_bits
+        self.row_bits = next_row_bits
+        self.generation += 1
+        return changed
+
+    def reverse_bits(self, bits):
+        """
+        Return a row's bits in reverse column order.
+        """
+        return int('{:0{}b}'.format(bits, self.cols)[::-1], 2)
+
+    def save_pattern(self, path, name=None):
+        """
+        Save the board's live cells, rule and topology to an RLE pattern
+        file at path, like GameOfLifeBoard.save_pattern.
+        """
+        alive = np.zeros((self.rows, self.cols), dtype=np.uint8)
+        set_live_cells(alive, self.get_live_cell_coords())
+        write_rle(path, alive,
+                  rule=self.rule.rulestring + get_rule_suffix(self.topology),
+                  name=name)
+
+
+class GameOfLifeBitBoardRows(object):
+    """
+    Stand-in for a board's 2D list of cells; board[row][col] returns a
+    GameOfLifeBitCell.
+    """
+    def __init__(self, bit_board):
+        self.bit_board = bit_board
+
+    def __len__(self):
+        return self.bit_board.rows
+
+    def __getitem__(self, row):
+        if not 0 <= row < self.bit_board.rows:
+            raise IndexError(row)
+        return GameOfLifeBitBoardRow(self.bit_board, row)
+
+    def __iter__(self):
+        for row in range(self.bit_board.rows):
+            yield self[row]
+
+
+class GameOfLifeBitBoardRow(object):
+    """
+    One row of a GameOfLifeBitBoard's cells.
+    """
+    __slots__ = ('bit_board', 'row')
+
+    def __init__(self, bit_board, row):
+        self.bit_board = bit_board
+        self.row = row
+
+    def __len__(self):
+        return self.bit_board.cols
+
+    def __getitem__(self, col):
+        if not 0 <= col < self.bit_board.cols:
+            raise IndexError(col)
+        return GameOfLifeBitCell(self.bit_board, self.row, col)
+
+    def __iter__(self):
+        for col in range(self.bit_board.cols):
+            yield self[col]
+
+
+class GameOfLifeBitCell(object):
+    """
+    View of one cell of a GameOfLifeBitBoard.
+    """
+    __slots__ = ('bit_board', 'row', 'col')
+
+    def __init__(self, bit_board, row, col):
+        self.bit_board = bit_board
+        self.row = row
+        self.col = col
+
+    @property
+    def is_alive(self):
+        return self.bit_board.get_cell_state(self.row, self.col)
+
+    @is_alive.setter
+    def is_alive(self, is_alive):
+        self.bit_board.set_cell_state(self.row, self.col, is_alive)
+
+
+def compile_rule(rule):
+    """
+    Compile a two-state rule's table into a function of a row's bits and
+    the four bit planes of its neighbor counts (b0 to b3) that returns the
+    row's next bits.
+    Counts that give life to any cell are tested once and the others only
+    for live (survival) or dead (birth) cells, like
+    game_of_life_engine.get_next_alive, so B3/S23 computes
+    '(b0 & b1 & ~b2) | (bits & (~b0 & b1 & ~b2))'.
+    """
+    # (cell state the counts apply to, count tests), where the cell state
+    # is None for counts that apply to every cell
+    groups = [(state, [get_count_test(count) for count in sorted(counts)])
+              for counts, state in ((rule.always_counts, None),
+                                    (rule.survival_only_counts, True),
+                                    (rule.birth_only_counts, False))
+              if counts]
+
+    def get_next_bits(bits, b0, b1, b2, b3):
+        planes = (~b0, b0, ~b1, b1, ~b2, b2, ~b3, b3, -1)
+        next_bits = 0
+        for state, tests in groups:
+            group_bits = 0
+            for first, second, third, fourth in tests:
+                group_bits |= (planes[first] & planes[second] &
+                               planes[third] & planes[fourth])
+            if state is not None:
+                group_bits &= bits if state else ~bits
+            next_bits |= group_bits
+        return next_bits
+    return get_next_bits
+
+
+def get_count_test(count):
+    """
+    Return the indexes of the four bit planes that are all set where a
+    neighbor count equals count, out of the bit planes b0 to b3 and their
+    inverses, ordered as (~b0, b0, ~b1, b1, ~b2, b2, ~b3, b3), and index 8,
+    a plane of all set bits.
+    Counts only reach 8 (0b1000), so b3 is only tested for 0 and 8.
+    """
+    if count == 8:
+        return (7, 8, 8, 8)
+    return tuple(2*bit + (count >> bit & 1) for bit in range(3)) + (
+        6 if count == 0 else 8,)
@@ -1,10 +1,46 @@
+import math
 import statistics
 from functools import partial
 
-from scipy.stats import norm
+try:
+    import numpy as np
+except ImportError:  # only needed for vectorized stat alphas
+    np = None
 
-from game_of_life_cell import GameOfLifeCell
-import pdb
+from game_of_life_cell import GameOfLifeCell, GameOfLifeCellGrid
+from game_of_life_cycle import GameOfLifeCycleDetector
+from game_of_life_engine import ENGINES, set_live_cells
+from game_of_life_history import GameOfLifeHistory
+from game_of_life_patterns import place_coords, read_pattern, write_rle
+from game_of_life_rules import get_rule
+from game_of_life_topology import (get_rule_suffix, get_topology,
+                                   split_rule_suffix)
+from game_of_life_snapshot import GameOfLifeSnapshot, save_snapshot
+from game_of_life_time_series import GameOfLifeTimeSeries
+
+# scipy's standard normal CDF, imported by 'normal_cdf' on first use since
+# scipy is slow to import; False if scipy is not installed
+_ndtr = None
+
+
+def normal_cdf(z_scores):
+    """
+    Return the standard normal CDF of a z-score, or of each z-score in a
+    numpy array.
+    Uses scipy if it is installed, and math.erf otherwise.
+    """
+    global _ndtr
+    if _ndtr is None:
+        try:
+            from scipy.special import ndtr as _ndtr
+        except ImportError:
+            _ndtr = False
+    if _ndtr:
+        return _ndtr(z_scores)
+    if np is not None and isinstance(z_scores, np.ndarray):
+        return 0.5*np.vectorize(math.erfc, otypes=[float])(
+            -z_scores / math.sqrt(2))
+    return 0.5*math.erfc(-z_scores / math.sqrt(2))
 
 
 class GameOfLifeBoard(object):
@@ -12,6 +48,8 @@ class GameOfLifeBoard(object):
     Represent a board in the Game of Life.
     Holds GameOfLifeCells in a 2D list.
     Can hold GUI components or not, depending on client game engine.
+    Generations are computed by a pluggable engine (see ENGINES in
+    game_of_life_engine); 'python' is the default.
     """
     STAT_CATEGORIES = {
         0: 'longest_living_streak',
@@ -23,21 +61,113 @@ class GameOfLifeBoard(object):
     }
 
     def __init__(
-            self, rows, cols, live_cell_coords=None, GUI_components=None):
+            self, rows, cols, live_cell_coords=None, GUI_components=None,
+            engine='python', engine_options=None, streaming_stats=False,
+            detect_cycles=False,
+            cycle_history_size=GameOfLifeCycleDetector.DEFAULT_HISTORY_SIZE,
+            rule='B3/S23', topology=None, record_history=False,
+            history_max_bytes=GameOfLifeHistory.DEFAULT_MAX_BYTES,
+            record_time_series=False,
+            time_series_max_buckets=GameOfLifeTimeSeries.DEFAULT_MAX_BUCKETS):
         """
         Use dependency injection pattern to provide GUI components.
         Leaves room between cell shapes for outlines.
+
+        :param engine: name of the engine that computes generations.
+        Engines that keep state in arrays (e.g. 'numpy') make cells on
+        demand as views when the board has no GUI components.
+        :param engine_options: dict of keyword args for the engine, e.g.
+        {'workers': 4} for the 'parallel' engine.
+        :param streaming_stats: if True, keep GameOfLifeStreamingStats up to
+        date every generation from the cells that flip, so
+        'calculate_game_stats' needs no pass over the cells. Requires numpy.
+        :param detect_cycles: if True, 'advance_board_one_generation'
+        returns False once the board repeats a state seen in the last
+        'cycle_history_size' generations (see GameOfLifeCycleDetector), so
+        oscillators stop like still lifes do. Requires numpy.
+        :param rule: the rule cells follow, as a GameOfLifeRule, rulestring
+        (e.g. 'B36/S23') or rule name (see game_of_life_rules). Generations
+        rules (e.g. 'B2/S/C3') need an engine that keeps cell states in
+        arrays, such as 'numpy', and cannot be used with detect_cycles.
+        :param topology: how the board's edges connect: 'bounded', 'torus',
+        'klein bottle' or 'infinite' (see game_of_life_topology). Defaults
+        to the engine's DEFAULT_TOPOLOGY, which is 'bounded' except for
+        'hashlife'. Stats and cycle detection only cover the board's own
+        cells, also when the universe around an infinite board changes.
+        :param record_history: if True, record each generation in a
+        GameOfLifeHistory of at most 'history_max_bytes', so the board can
+        'seek' back to recent generations. Requires numpy.
+        :param record_time_series: if True, record population metrics every
+        generation in a GameOfLifeTimeSeries, downsampled to at most
+        'time_series_max_buckets' buckets (None keeps every generation).
+        Requires numpy.
         """
         # TODO: error handling for illegal sizes, live tiles
         if GUI_components is None:
             GUI_components = {}
+        if live_cell_coords is None:
+            live_cell_coords = set([])
+        if engine_options is None:
+            engine_options = {}
+        self.rule = get_rule(rule)
+        if detect_cycles and self.rule.num_states > 2:
+            raise ValueError('cycles cannot be detected for rule {}'.format(
+                self.rule))
+        self.topology = get_topology(
+            topology or ENGINES[engine].DEFAULT_TOPOLOGY, rows, cols)
+        if self.topology.IS_INFINITE and 0 in self.rule.birth_counts:
+            raise ValueError('rule {} would fill an infinite board'.format(
+                self.rule))
         self.stats = None
         self.GUI_components = GUI_components
+        # optional GameOfLifeRenderer that draws for the board (see GameOfLife)
+        self.renderer = None
+        # if False, advancing does not draw the flipped cells, e.g. so a
+        # GameOfLifeSimulationDriver can draw several generations at once
+        self.draw_on_advance = True
+        # (row, col) coords of the cells that flipped last generation
+        self.cells_to_flip = []
+        # number of generations the board has advanced
+        self.generation = 0
+        # cached number of live neighbors of every cell, counted at
+        # 'num_live_neighbors_generation' (see 'get_num_live_neighbors_grid')
+        self.num_live_neighbors_grid = None
+        self.num_live_neighbors_generation = None
+        # GameOfLifeCellRuns the streaming stats are updated from
+        self.cell_runs = None
+        # optional GameOfLifeProfiler timing each generation's phases
+        self.profiler = None
         self.rows = rows
         self.cols = cols
-        cell_width = self.GUI_components.get('cell_width')
-        cell_height = self.GUI_components.get('cell_height')
-        surface = self.GUI_components.get('draw_surface')
+        self.engine = ENGINES[engine](
+            self, live_cell_coords, **engine_options)
+        self.cycle_detector = None
+        if detect_cycles:
+            self.cycle_detector = GameOfLifeCycleDetector(
+                rows, cols, history_size=cycle_history_size)
+        # optional GameOfLifeHistory of recent generations; its first
+        # keyframe is recorded when the board first advances
+        self.history = None
+        if record_history:
+            self.history = GameOfLifeHistory(
+                rows, cols, num_states=self.rule.num_states,
+                max_bytes=history_max_bytes)
+        # optional GameOfLifeTimeSeries of population metrics; starts
+        # tracking the board when it first advances
+        self.time_series = None
+        if record_time_series:
+            self.time_series = GameOfLifeTimeSeries(
+                rows, cols, num_states=self.rule.num_states,
+                max_buckets=time_series_max_buckets)
+        self.streaming_stats = None
+        if streaming_stats:
+            self.cell_runs = self.GameOfLifeCellRuns(self)
+            self.streaming_stats = {
+                category: self.GameOfLifeStreamingStat(self, category)
+                for category in GameOfLifeBoard.STAT_CATEGORIES.values()
+            }
+        # cells are views of the engine's state and stats, made on demand
+        self.board = GameOfLifeCellGrid(self.engine, rows, cols)
 
         # shape generator should be a function that takes four args:
         # top left x, top left y, width, and height, all in screen coords,
@@ -50,112 +180,411 @@ class GameOfLifeBoard(object):
         draw_func = (self.GUI_components.get('cell_draw_func') or
                      (lambda draw_surface: None))
 
-        # 2D list comprehension with a GameOfLifeCell in each slot
-        self.board = [
-            [GameOfLifeCell(
-                row, col, is_alive=(row,col) in live_cell_coords,
-                GUI_components={
-                    'shape': self.shape_generator(
-                        (col*cell_width)+1, (row*cell_height)+1,
-                        cell_width-2, cell_height-2),
-                    'outline_color': self.GUI_components.get(
-                        'cell_outline_color'),
-                    'alive_color': self.GUI_components.get('alive_color'),
-                    'dead_color': self.GUI_components.get('dead_color'),
-                    'get_fill_param': lambda is_alive: 0 if is_alive else 0,
-                    'draw_func': partial(draw_func, surface)
-                }
-            )
-                for col in range(cols)]
-            for row in range(rows)
-        ]
+        # GUI components every cell shares; see 'get_cell_GUI_components'
+        self.cell_GUI_components = {}
+        if self.GUI_components:
+            self.cell_GUI_components = {
+                'outline_color': self.GUI_components.get('cell_outline_color'),
+                'alive_color': self.GUI_components.get('alive_color'),
+                'dead_color': self.GUI_components.get('dead_color'),
+                'get_fill_param': lambda is_alive: 0 if is_alive else 0,
+                'draw_func': partial(
+                    draw_func, self.GUI_components.get('draw_surface'))
+            }
+
+    def get_cell_GUI_components(self, row, col):
+        """
+        Return a dict of the GUI components the cell at (row, col) is drawn
+        with: the board's shared colors and draw functions, and the cell's
+        shape. Empty if the board has no GUI.
+        """
+        if not self.cell_GUI_components:
+            return {}
+        cell_width = self.GUI_components.get('cell_width')
+        cell_height = self.GUI_components.get('cell_height')
+        GUI_components = dict(self.cell_GUI_components)
+        GUI_components['shape'] = self.shape_generator(
+            (col*cell_width)+1, (row*cell_height)+1,
+            cell_width-2, cell_height-2)
+        return GUI_components
+
+    @classmethod
+    def load_snapshot(cls, path, GUI_components=None, engine='python',
+                      **kwargs):
+        """
+        Return a board restored from the snapshot file at path (see
+        game_of_life_snapshot), at the snapshot's generation and with its
+        cell stats. The board follows the snapshot's rule and, unless a
+        topology is given, its topology. Other keyword args are passed to
+        the constructor.
+        """
+        snapshot = GameOfLifeSnapshot(path)
+        if kwargs.get('topology') is None:
+            kwargs['topology'] = snapshot.topology
+        board = cls(snapshot.rows, snapshot.cols,
+                    snapshot.get_live_cell_coords(), GUI_components,
+                    engine=engine, rule=snapshot.rule, **kwargs)
+        board.generation = snapshot.generation
+        if snapshot.states is not None:
+            board.engine.alive[...] = snapshot.states
+        for category, values in snapshot.stats.items():
+            board.engine.set_stat_array(category, values)
+        return board
+
+    def save_snapshot(self, path):
+        """
+        Save the board's size, generation, rule, topology, cells and cell
+        stats to a snapshot file at path (see game_of_life_snapshot).
+        Cells around an infinite board are not saved.
+        """
+        alive = np.zeros((self.rows, self.cols), dtype=np.uint8)
+        set_live_cells(alive, self.get_live_cell_coords())
+        save_snapshot(
+            path, alive,
+            {category: self.engine.get_stat_array(category)
+             for category in GameOfLifeCell.STAT_KEYS},
+            generation=self.generation, rule=self.rule.rulestring,
+            topology=self.topology.NAME,
+            states=self.engine.alive if self.rule.num_states > 2 else None)
+
+    @classmethod
+    def load_pattern(cls, path, rows=None, cols=None, center=False,
+                     GUI_components=None, **kwargs):
+        """
+        Return a board with the live cells of the RLE, Life 1.06 or
+        plaintext pattern file at path (see game_of_life_patterns).
+        Rows and cols default to the pattern's size. If center is True the
+        pattern is centered on the board, otherwise it is placed at the top
+        left. The board follows the pattern's rule and topology (e.g.
+        'B3/S23:T40,30' for a 40x30 torus, whose size is then the default
+        size) unless a rule or topology is given.
+        Other keyword args are passed to the constructor.
+        Raise ValueError if the pattern does not fit or its rule is not
+        supported.
+        """
+        live_cell_coords, header = read_pattern(path)
+        rule, topology, topology_rows, topology_cols = split_rule_suffix(
+            header['rule'] or 'B3/S23')
+        if kwargs.get('rule') is None:
+            kwargs['rule'] = rule
+        if kwargs.get('topology') is None:
+            kwargs['topology'] = topology
+        if rows is None:
+            rows = topology_rows or max(header['y'], 1)
+        if cols is None:
+            cols = topology_cols or max(header['x'], 1)
+        live_cell_coords = place_coords(live_cell_coords, rows, cols, center)
+        return cls(rows, cols, live_cell_coords, GUI_components, **kwargs)
+
+    def save_pattern(self, path, name=None):
+        """
+        Save the board's live cells, rule and topology to an RLE pattern
+        file at path. Dying cells of Generations rules are saved as dead.
+        """
+        alive = np.zeros((self.rows, self.cols), dtype=np.uint8)
+        set_live_cells(alive, self.get_live_cell_coords())
+        write_rle(path, alive,
+                  rule=self.rule.rulestring + get_rule_suffix(self.topology),
+                  name=name)
 
     def advance_board_one_generation(self):
         """
-        Set the board to the next state based on the rules of the Game of Life.
+        Set the board to the next state based on the board's rule.
 
-        Rules:
+        Rules for the Game of Life (B3/S23, the default):
         1. A cell's 'neighbors' includes all cells adjacent in row, col, or
             diagonal.
         2. Any live cell with fewer than two live neighbors dies.
         3. Any live cell with more than three live neighbors dies.
         4. Any live cell with two or three live neighbors lives.
         5. Any dead cell with exactly three live neighbors becomes live.
+        Other rules change the numbers of live neighbors in 2-5; see
+        game_of_life_rules.
 
         Return True if made a change to the board, False otherwise.
+        With cycle detection, also return False once the board is in a
+        cycle; see 'cycle_detector' for its period and onset.
         """
-        cells_to_flip = set([])
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.start_generation()
+        detector = self.cycle_detector
+        if detector is not None and detector.hash is None:
+            detector.reset(self.get_live_cell_coords(), self.generation)
+        history = self.history
+        if history is not None and history.last_generation != self.generation:
+            history.record_keyframe(self.engine.get_alive_array(),
+                                    self.generation)
+        time_series = self.time_series
+        if (time_series is not None and
+                time_series.last_generation != self.generation):
+            time_series.reset(self)
+        cell_runs = self.cell_runs
+        if cell_runs is not None and cell_runs.generation != self.generation:
+            self.reset_streaming_stats()
+        self.cells_to_flip = self.engine.advance_one_generation()
+        self.generation += 1
+        if profiler is not None:
+            profiler.end_phase('step')
+        if self.draw_on_advance:
+            self.draw_cells(self.cells_to_flip)
+            if profiler is not None:
+                profiler.end_phase('render')
+        if cell_runs is not None:
+            self.update_streaming_stats()
+        is_in_cycle = (detector is not None and
+                       detector.update(self.cells_to_flip, self.generation))
+        if history is not None:
+            history.record(self)
+        if time_series is not None:
+            time_series.record(self)
+        if profiler is not None:
+            profiler.end_phase('stats')
+            profiler.end_generation(self)
+        return not is_in_cycle and len(self.cells_to_flip) > 0
 
-        # calculate next gen and increment counters for current gen
-        for row in range(self.rows):
-            for col in range(self.cols):
-                cell = self.board[row][col]
-                if cell.is_alive:
-                    cell.stats['gens_alive'] += 1
-                    cell.stats['current_living_streak'] += 1
-                    if (cell.stats['current_living_streak'] >
-                            cell.stats['longest_living_streak']):
-                        cell.stats['longest_living_streak'] = \
-                            cell.stats['current_living_streak']
-                else:
-                    cell.stats['gens_dead'] += 1
-                    cell.stats['current_death_streak'] += 1
-                    if (cell.stats['current_death_streak'] >
-                            cell.stats['longest_death_streak']):
-                        cell.stats['longest_death_streak'] = \
-                            cell.stats['current_death_streak']
-                will_be_alive = self.get_next_cell_state(cell)
-                if ((will_be_alive and not cell.is_alive) or
-                        (not will_be_alive and cell.is_alive)):
-                    cell.stats['current_living_streak'] = 0
-                    cell.stats['current_dead_streak'] = 0
-                    cells_to_flip.add(cell)
-
-        # set next gen
-        for cell in cells_to_flip:
-            cell.is_alive = not cell.is_alive
-            if cell.is_alive:
-                cell.stats['births'] += 1
-            else:
-                cell.stats['deaths'] += 1
-            cell.draw_self()
+    def advance_board_power_of_two_generations(self, k):
+        """
+        Advance the board 2^k generations in one step.
+        Only engines that can skip generations support this (e.g. 'hashlife');
+        cell stat counters are not updated for the skipped generations.
+
+        Return True if made a change to the board, False otherwise.
+        """
+        if not hasattr(self.engine, 'advance_power_of_two_generations'):
+            raise ValueError('engine cannot skip generations')
+        self.cells_to_flip = self.engine.advance_power_of_two_generations(k)
+        self.generation += 2**k
+        if self.draw_on_advance:
+            self.draw_cells(self.cells_to_flip)
+        if self.cycle_detector is not None:
+            if self.cycle_detector.hash is not None:
+                self.cycle_detector.hash ^= self.cycle_detector.get_hash(
+                    self.cells_to_flip)
+                self.cycle_detector.clear_history()
+                self.cycle_detector.record(self.generation)
+        if self.history is not None:
+            self.history.record_keyframe(self.engine.get_alive_array(),
+                                         self.generation)
+        return len(self.cells_to_flip) > 0
+
+    def seek(self, generation):
+        """
+        Set the board's cells back (or forward) to a generation recorded in
+        its history (see 'record_history'), e.g. to replay how a pattern
+        evolved. Cell stat counters are left as they are. Advancing the
+        board from there records over the history's later generations.
+
+        Return True if made a change to the board, False otherwise.
+        Raise ValueError if the board records no history or is infinite,
+        and KeyError if the generation is not recorded.
+        """
+        if self.history is None:
+            raise ValueError('board does not record its history')
+        if self.topology.IS_INFINITE:
+            raise ValueError('cannot seek an infinite board, whose cells '
+                             'outside the board are not recorded')
+        states = self.history.get_states(generation)
+        alive = self.engine.get_alive_array()
+        self.cells_to_flip = np.argwhere(alive != states)
+        self.engine.set_cell_states(
+            self.cells_to_flip, states[tuple(self.cells_to_flip.T)])
+        self.generation = generation
+        self.invalidate_cell_caches()
+        if self.cycle_detector is not None:
+            self.cycle_detector.hash = None
+        if self.draw_on_advance:
+            self.draw_cells(self.cells_to_flip.tolist())
+        return len(self.cells_to_flip) > 0
+
+    def fast_forward_cycle(self, generation_limit):
+        """
+        Advance a board that is in a cycle (see 'detect_cycles') to the
+        given generation.
+
+        Runs one more period to measure how each cell's stat counters change
+        over a cycle, then adds that change for all remaining whole cycles at
+        once instead of running them, and runs the leftover generations.
+        Counters and streaks end up the same as if every generation was run.
+        """
+        detector = self.cycle_detector
+        if detector is None or detector.period is None:
+            raise ValueError('board is not in a detected cycle')
+        period = detector.period
+        num_cycles = (generation_limit - self.generation) // period
+        if num_cycles > 1:
+            stats_before = {
+                category: self.engine.get_stat_array(category).copy()
+                for category in GameOfLifeCell.STAT_KEYS}
+            flipped = np.zeros((self.rows, self.cols), dtype=bool)
+            for _ in range(period):
+                self.advance_board_one_generation()
+                if len(self.cells_to_flip):
+                    flipped[tuple(np.asarray(self.cells_to_flip).T)] = True
+            stats_after = {
+                category: self.engine.get_stat_array(category).copy()
+                for category in GameOfLifeCell.STAT_KEYS}
+
+            # counters grow by the same amount every cycle; streaks only
+            # grow for cells that never flip, and otherwise repeat
+            skipped_cycles = num_cycles-1
+            stats = {
+                category: (stats_after[category] + skipped_cycles *
+                           (stats_after[category] - stats_before[category]))
+                for category in ('gens_alive', 'gens_dead', 'births',
+                                 'deaths', 'current_living_streak',
+                                 'current_death_streak')}
+            for longest, current in (
+                    ('longest_living_streak', 'current_living_streak'),
+                    ('longest_death_streak', 'current_death_streak')):
+                stats[longest] = np.where(
+                    flipped, stats_after[longest],
+                    np.maximum(stats_after[longest], stats[current]))
+            for category, values in stats.items():
+                self.engine.set_stat_array(category, values)
+            self.generation += skipped_cycles*period
+
+        while self.generation < generation_limit:
+            self.advance_board_one_generation()
+
+    def invalidate_cell_caches(self):
+        """
+        Forget what the board keeps up to date from its cells, after they
+        were set other than by advancing: the neighbor counts cached by
+        'get_num_live_neighbors_grid' and the cell runs the streaming stats
+        are updated from, which are read from every cell when next needed.
+        """
+        self.num_live_neighbors_grid = None
+        if self.cell_runs is not None:
+            self.cell_runs.generation = None
+
+    def reset_streaming_stats(self):
+        """
+        Count the streaming stats from every cell.
+        """
+        self.cell_runs.reset()
+        for stat in self.streaming_stats.values():
+            stat.reset()
+
+    def update_streaming_stats(self):
+        """
+        Update the streaming stats from the cells that flipped last
+        generation.
+        """
+        born, died = self.cell_runs.get_flips(self.cells_to_flip)
+        for stat in self.streaming_stats.values():
+            stat.update(born, died)
+        self.cell_runs.update(born, died)
+
+    def draw_cells(self, cell_coords):
+        """
+        Draw the cells at the given (row, col) coords, if the board has
+        GUI components. Uses the board's renderer if it has one.
+        """
+        if self.renderer is not None:
+            self.renderer.draw_cells(cell_coords)
+        elif self.GUI_components:
+            for row, col in cell_coords:
+                self.board[row][col].draw_self()
 
-        return len(cells_to_flip) > 0
+    def get_live_cell_coords(self):
+        """
+        Return a sequence of (row, col) coords of live cells.
+        """
+        return self.engine.get_live_cell_coords()
 
     def get_next_cell_state(self, cell):
         """
         Returns True if next state for given cell is alive, False otherwise.
 
-        Currently, game rules are hardcoded into this method.
+        Looked up in the board's rule table, for two-state rules.
         """
-        num_live_neighbors = self.get_num_live_neighbors(cell)
-        if not cell.is_alive:
-            return num_live_neighbors == 3
-        if num_live_neighbors < 2 or num_live_neighbors > 3:
-            return False
-        return True
+        return self.rule.next_states[cell.is_alive][
+            self.get_num_live_neighbors(cell)] == 1
 
     def get_num_live_neighbors(self, cell):
         """
         Return the number of live neighbors for a cell.
+        Neighbors are found through the topology, so edges need no checks
+        here.
         """
-        num_live_neighbors = 0
-        for curr_row in range(cell.row-1, cell.row+2):
-            if curr_row < 0 or curr_row >= self.rows:
-                continue
-            for curr_col in range(cell.col-1, cell.col+2):
-                if ((curr_row == cell.row and curr_col == cell.col) or
-                        (curr_col < 0 or curr_col >= self.cols)):
-                    continue
-                if self.board[curr_row][curr_col].is_alive:
-                    num_live_neighbors += 1
-        return num_live_neighbors
+        return self.engine.get_num_live_neighbors(cell.row, cell.col)
+
+    def get_num_live_neighbors_grid(self):
+        """
+        Return a (rows, cols) uint8 array with the number of live neighbors
+        of every cell, which must not be written to.
+        Counted once per generation and cached until the board advances or
+        a cell is set. Requires numpy.
+        """
+        if (self.num_live_neighbors_grid is None or
+                self.num_live_neighbors_generation != self.generation):
+            self.num_live_neighbors_grid = \
+                self.engine.get_num_live_neighbors_grid()
+            self.num_live_neighbors_generation = self.generation
+        return self.num_live_neighbors_grid
+
+    def get_nums_live_neighbors(self, cell_coords=None):
+        """
+        Return the numbers of live neighbors of many cells at once, as a
+        uint8 array, from the cached grid (see
+        'get_num_live_neighbors_grid').
+
+        :param cell_coords: the cells to count: an (n, 2) array or sequence
+        of (row, col) coords, giving n counts in the same order; a
+        (rows, cols) bool mask, giving counts of the cells it selects in
+        row-major order; or None for a (rows, cols) array of every cell.
+        """
+        return self.get_num_live_neighbors_grid()[
+            self.get_cells_index(cell_coords)]
+
+    def get_next_cell_states(self, cell_coords=None):
+        """
+        Return the next states of many cells at once, selected by
+        cell_coords as in 'get_nums_live_neighbors': a bool array of which
+        will be alive for two-state rules, else a uint8 array of states.
+        Same values as calling 'get_next_cell_state' on each cell.
+        """
+        index = self.get_cells_index(cell_coords)
+        next_states = self.rule.table[
+            self.engine.get_alive_array()[index],
+            self.get_num_live_neighbors_grid()[index]]
+        if self.rule.num_states == 2:
+            return next_states == 1
+        return next_states
+
+    def get_cells_index(self, cell_coords):
+        """
+        Return an index into (rows, cols) arrays that selects the given
+        cells (see 'get_nums_live_neighbors').
+        Raise IndexError if a coord is off the board.
+        """
+        if cell_coords is None:
+            return Ellipsis
+        cell_coords = np.asarray(cell_coords)
+        if cell_coords.dtype == bool:
+            if cell_coords.shape != (self.rows, self.cols):
+                raise IndexError('mask of shape {} does not match a {}x{} '
+                                 'board'.format(cell_coords.shape,
+                                                self.rows, self.cols))
+            return cell_coords
+        cell_coords = cell_coords.astype(np.intp, copy=False).reshape(-1, 2)
+        rows, cols = cell_coords[:, 0], cell_coords[:, 1]
+        if len(cell_coords) and (
+                rows.min() < 0 or rows.max() >= self.rows or
+                cols.min() < 0 or cols.max() >= self.cols):
+            raise IndexError('cell coords are off the {}x{} board'.format(
+                self.rows, self.cols))
+        return rows, cols
 
     def display_self(self, stat=''):
         """
         Displays the board in the GUI by drawing each cell and cell outline
         with the provided draw functions.
         """
+        if self.renderer is not None and not stat:
+            self.renderer.draw_board()
+            return
         for row in range(self.rows):
             for col in range(self.cols):
                 cell = self.board[row][col]
@@ -178,7 +607,7 @@ class GameOfLifeBoard(object):
 
         z_score = ((cell.stats[category] - self.stats[category].stats['mean']) /
                    self.stats[category].stats['stdev'])
-        percent_below = norm.cdf(z_score)
+        percent_below = normal_cdf(z_score)
         if percent_below > 0.95:
             alpha = 255
         elif percent_below < 0.05:
@@ -187,23 +616,48 @@ class GameOfLifeBoard(object):
             alpha = int(percent_below*255)
         return alpha
 
+    def get_stat_alphas(self, category):
+        """
+        Get the alpha values of every cell for the given stat category at
+        once, as a (rows, cols) uint8 array.
+        Same values as calling 'get_stat_alpha' on each cell.
+        """
+        values = self.engine.get_stat_array(category)
+        stat = self.stats[category].stats
+        if stat['stdev'] == 0:
+            alphas = np.full(values.shape, int(0.5*255), dtype=np.uint8)
+        else:
+            percent_below = normal_cdf((values - stat['mean']) / stat['stdev'])
+            alphas = (percent_below*255).astype(np.uint8)
+            alphas[percent_below > 0.95] = 255
+            alphas[percent_below < 0.05] = 0
+        alphas[values == 0] = 0
+        return alphas
+
     def calculate_game_stats(self):
         """
         Calculate the stats for the game, such as cell with longest living
         streak, cell with most deaths, percentiles for each cell, etc.
         Stores results in the board's 'stats' variable.
         """
+        if self.streaming_stats is not None:
+            if self.cell_runs.generation != self.generation:
+                self.reset_streaming_stats()
+            for stat in self.streaming_stats.values():
+                stat.calculate_stats()
+            self.stats = dict(self.streaming_stats)
+            return
+
         self.stats = {
             category: self.GameOfLifeStat(self, category)
             for category in GameOfLifeBoard.STAT_CATEGORIES.values()
         }
 
-        for row in range(self.rows):
-            for col in range(self.cols):
-                cell_stats = self.board[row][col].stats
-                for stat in self.stats.values():
-                    stat.stats['list'].append(
-                        (cell_stats[stat.category], (row, col)))
+        coords = [(row, col) for row in range(self.rows)
+                  for col in range(self.cols)]
+        for stat in self.stats.values():
+            stat.stats['list'] = list(zip(
+                self.engine.get_stat_values(stat.category), coords))
 
         for stat in self.stats.values():
             stat.calculate_stats()
@@ -270,3 +724,456 @@ class GameOfLifeBoard(object):
             self.stats['mean'] = sum(stat_vals) / len(self.stats['list'])
             self.stats['stdev'] = statistics.pstdev(
                 stat_vals, mu=self.stats['mean'])
+
+    class GameOfLifeStreamingStat(GameOfLifeStat):
+        """
+        Hold GameOfLife stats for a board and stat category, kept up to date
+        generation by generation from the cells that flip instead of from a
+        list of every cell.
+
+        A cell's value only changes when it flips, or grows by one every
+        generation while it stays alive (gens_alive, and a living streak
+        once it is the cell's longest) or dead. So cells are counted in two
+        GameOfLifeStatHistograms: 'fixed' by their value, and 'growing' by
+        how far their value is behind the board's generation, which stays
+        the same while they grow. Each 'update' only moves the cells that
+        flipped or whose streak caught up with their longest streak between
+        the histograms, so mean, stdev, min, max and the exact median
+        (selected from the histograms) and the coords of the min and max
+        cells are available at any generation without a pass over the cells.
+        A pass is only made when the cell with the min or max value left
+        its histogram, or the board changed other than by advancing (see
+        GameOfLifeBoard.invalidate_cell_caches).
+        """
+        # whether cells grow in each category while alive (True) or dead
+        # (False); births and deaths only change when cells flip
+        GROWS_WHILE_ALIVE = {
+            'gens_alive': True,
+            'longest_living_streak': True,
+            'gens_dead': False,
+            'longest_death_streak': False
+        }
+
+        def __init__(self, board, category):
+            super().__init__(board, category, stats={
+                'max': None,
+                'min': None,
+                'median': None,
+                'mean': None,
+                'stdev': None
+            })
+            self.grows_while_alive = self.GROWS_WHILE_ALIVE.get(category)
+            self.is_streak = category in ('longest_living_streak',
+                                          'longest_death_streak')
+            num_cells = board.rows*board.cols
+            # ties go to the first cell with the max value and the last cell
+            # with the min value, like GameOfLifeStat
+            self.fixed = GameOfLifeBoard.GameOfLifeStatHistogram(
+                num_cells, low_prefers_last=True, high_prefers_last=False)
+            self.growing = GameOfLifeBoard.GameOfLifeStatHistogram(
+                num_cells, low_prefers_last=False, high_prefers_last=True)
+            # for streaks, arrays of flat indexes of cells whose current
+            # streak catches up with their longest streak, by the generation
+            # it does
+            self.catch_ups = {}
+
+        def reset(self):
+            """
+            Count every cell's value at the board's generation. The board's
+            cell runs (see GameOfLifeCellRuns) must be up to date.
+            """
+            board = self.board
+            generation = board.generation
+            cell_runs = board.cell_runs
+            values = board.engine.get_stat_array(self.category).ravel()
+            indexes = np.arange(values.size)
+            is_growing = np.zeros(values.size, dtype=bool)
+            self.catch_ups = {}
+            if self.grows_while_alive is not None:
+                is_growing = cell_runs.alive == self.grows_while_alive
+                if self.is_streak:
+                    is_catching_up = is_growing & (
+                        generation - cell_runs.run_starts < values)
+                    is_growing &= ~is_catching_up
+                    self.schedule_catch_ups(
+                        indexes[is_catching_up],
+                        cell_runs.run_starts[is_catching_up] +
+                        values[is_catching_up])
+            self.fixed.reset(values[~is_growing], indexes[~is_growing])
+            self.growing.reset(generation - values[is_growing],
+                               indexes[is_growing])
+
+        def schedule_catch_ups(self, indexes, generations):
+            """
+            Grow the cells at the given flat indexes from the given
+            generations on, when their current streak catches up with their
+            longest streak, unless they flip first.
+            """
+            if not indexes.size:
+                return
+            order = np.argsort(generations, kind='stable')
+            generations, indexes = generations[order], indexes[order]
+            starts = np.flatnonzero(np.diff(generations)) + 1
+            for generation, generation_indexes in zip(
+                    generations[np.concatenate(([0], starts))].tolist(),
+                    np.split(indexes, starts)):
+                self.catch_ups.setdefault(generation, []).append(
+                    generation_indexes)
+
+        def catch_up(self):
+            """
+            Start growing the cells whose current streak caught up with their
+            longest streak this generation.
+            """
+            board = self.board
+            generation = board.generation
+            scheduled = self.catch_ups.pop(generation, None)
+            if scheduled is None:
+                return
+            indexes = np.concatenate(scheduled)
+            cell_runs = board.cell_runs
+            values = board.engine.get_cell_stat_values(self.category,
+                                                       indexes)
+            # cells that flipped since they were scheduled are on new
+            # streaks, which cannot have caught up yet
+            streaks = generation - cell_runs.run_starts[indexes]
+            is_caught_up = ((cell_runs.alive[indexes] ==
+                             self.grows_while_alive) &
+                            (streaks == values) & (streaks > 0))
+            indexes, values = indexes[is_caught_up], values[is_caught_up]
+            self.fixed.remove(values, indexes)
+            self.growing.add(generation - values, indexes)
+
+        def update(self, born, died):
+            """
+            Account for the generation just run, in which the cells at the
+            flat indexes born and died flipped. Call before the board's cell
+            runs are updated with the flips.
+            """
+            board = self.board
+            engine = board.engine
+            generation = board.generation
+            if self.is_streak:
+                self.catch_up()
+            if self.grows_while_alive is None:
+                indexes = born if self.category == 'births' else died
+                values = engine.get_cell_stat_values(self.category, indexes)
+                self.fixed.remove(values-1, indexes)
+                self.fixed.add(values, indexes)
+                return
+
+            # cells that stopped and started growing
+            stopped, started = ((died, born) if self.grows_while_alive
+                                else (born, died))
+            stopped_values = engine.get_cell_stat_values(self.category,
+                                                         stopped)
+            started_values = engine.get_cell_stat_values(self.category,
+                                                         started)
+            if self.is_streak:
+                # only streaks that were the longest grew, and new streaks
+                # start at 0, so only grow now if there was no longest one
+                was_growing = (generation -
+                               board.cell_runs.run_starts[stopped] ==
+                               stopped_values)
+                stopped = stopped[was_growing]
+                stopped_values = stopped_values[was_growing]
+                is_catching_up = started_values > 0
+                self.schedule_catch_ups(
+                    started[is_catching_up],
+                    generation + started_values[is_catching_up])
+                started = started[~is_catching_up]
+                started_values = started_values[~is_catching_up]
+            self.growing.remove(generation - stopped_values, stopped)
+            self.fixed.add(stopped_values, stopped)
+            self.fixed.remove(started_values, started)
+            self.growing.add(generation - started_values, started)
+
+        def get_value_counts(self):
+            """
+            Return an array of the number of cells with each value.
+            """
+            generation = self.board.generation
+            fixed, growing = self.fixed, self.growing
+            # values are never negative
+            fixed_counts = fixed.counts[fixed.offset:]
+            growing_counts = growing.counts[:generation+growing.offset+1]
+            lowest = (int(np.flatnonzero(growing_counts)[0])
+                      if growing.count else len(growing_counts))
+            # the growing cells counted at index i have the value top - i
+            top = generation + growing.offset
+            value_counts = np.zeros(max(len(fixed_counts), top-lowest+1),
+                                    dtype=np.int64)
+            value_counts[:len(fixed_counts)] += fixed_counts
+            if growing.count:
+                value_counts[top-len(growing_counts)+1:top-lowest+1] += (
+                    growing_counts[lowest:][::-1])
+            return value_counts
+
+        def get_cell_index(self, value, is_max):
+            """
+            Return the flat index of the first cell with the given max value,
+            or the last cell with the given min value.
+            """
+            generation = self.board.generation
+            while True:
+                indexes = []
+                for histogram, key, is_high in (
+                        (self.fixed, value, is_max),
+                        (self.growing, generation-value, not is_max)):
+                    if histogram.has_key(key):
+                        indexes.append(histogram.get_high_index() if is_high
+                                       else histogram.get_low_index())
+                if None not in indexes:
+                    return min(indexes) if is_max else max(indexes)
+                # the tracked cell left its histogram; recount to find one
+                self.reset()
+
+        def get_value_at_rank(self, rank, cumulative_counts):
+            """
+            Return the value with the given zero-indexed rank in sorted order.
+            """
+            return int(np.searchsorted(cumulative_counts, rank, side='right'))
+
+        def calculate_stats(self):
+            """
+            Calculate and set the stats from the histograms and their sums.
+            Coords match GameOfLifeStat: the first cell (in row-major order)
+            with the max value and the last cell with the min value.
+            """
+            generation = self.board.generation
+            fixed, growing = self.fixed, self.growing
+            num_values = fixed.count + growing.count
+            value_counts = self.get_value_counts()
+            cumulative_counts = np.cumsum(value_counts)
+            nonzero_values = np.flatnonzero(value_counts)
+            self.stats['max'] = int(nonzero_values[-1])
+            self.stats['min'] = int(nonzero_values[0])
+            cols = self.board.cols
+            self.stats['max_coords'] = divmod(
+                self.get_cell_index(self.stats['max'], True), cols)
+            self.stats['min_coords'] = divmod(
+                self.get_cell_index(self.stats['min'], False), cols)
+
+            middle = num_values // 2
+            if num_values % 2:
+                self.stats['median'] = self.get_value_at_rank(
+                    middle, cumulative_counts)
+            else:
+                self.stats['median'] = (
+                    self.get_value_at_rank(middle-1, cumulative_counts) +
+                    self.get_value_at_rank(middle, cumulative_counts)) / 2
+            # growing cells' values are the generation minus their keys
+            total = (fixed.total + growing.count*generation -
+                     growing.total)
+            total_of_squares = (
+                fixed.total_of_squares +
+                growing.count*generation*generation -
+                2*generation*growing.total + growing.total_of_squares)
+            self.stats['mean'] = total / num_values
+            self.stats['stdev'] = math.sqrt(
+                num_values*total_of_squares - total*total) / num_values
+
+    class GameOfLifeStatHistogram(object):
+        """
+        Count the integer keys of some of a board's cells, with exact sums
+        of the keys and squared keys, and track the cells with the lowest
+        and highest keys.
+
+        Ties between cells with the same key go to the first cell in
+        row-major order, or to the last one for the lowest key if
+        'low_prefers_last' and for the highest key if 'high_prefers_last'.
+        Tracked cells are kept as ranks: key*num_cells plus the cell's place
+        in that order, counted so the tracked cells have the lowest and
+        highest ranks. Removing a tracked cell leaves it unknown until a
+        cell ranked beyond it is added or the histogram is reset; its rank
+        still bounds the ranks left.
+        """
+
+        def __init__(self, num_cells, low_prefers_last, high_prefers_last):
+            self.num_cells = num_cells
+            self.low_prefers_last = low_prefers_last
+            self.high_prefers_last = high_prefers_last
+            self.reset(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.intp))
+
+        def reset(self, keys, indexes):
+            """
+            Count only the given keys of the cells at the given flat indexes.
+            """
+            # counts[key+offset] is the number of cells with the key
+            self.offset = max(-int(keys.min()), 0) if keys.size else 0
+            self.counts = np.bincount(keys+self.offset, minlength=1)
+            self.count = int(keys.size)
+            self.total = int(keys.sum())
+            self.total_of_squares = int((keys*keys).sum())
+            # ranks of the cells with the lowest and highest keys, None if
+            # there are no cells
+            self.low_rank = self.get_rank(keys, indexes, False)
+            self.high_rank = self.get_rank(keys, indexes, True)
+            self.is_low_known = self.is_high_known = True
+
+        def get_rank(self, keys, indexes, is_high):
+            """
+            Return the lowest rank of the cells with the given keys and flat
+            indexes, or the highest rank if is_high; None if there are none.
+            """
+            if not keys.size:
+                return None
+            key = int(keys.max() if is_high else keys.min())
+            tied_indexes = indexes[keys == key]
+            prefers_last = (self.high_prefers_last if is_high
+                            else self.low_prefers_last)
+            index = int(tied_indexes.max() if prefers_last
+                        else tied_indexes.min())
+            return key*self.num_cells + self.get_place(index, is_high)
+
+        def get_place(self, index, is_high):
+            """
+            Return the place of the cell at the given flat index, or the
+            index of the cell at the given place, in the order ranks count
+            cells in for the lowest key, or the highest key if is_high.
+            """
+            # the preferred cell of a tie has the lowest place for the lowest
+            # key and the highest place for the highest key
+            if is_high != (self.high_prefers_last if is_high
+                           else self.low_prefers_last):
+                return self.num_cells-1 - index
+            return index
+
+        def get_low_index(self):
+            """
+            Return the flat index of the cell with the lowest key, or None if
+            it is unknown.
+            """
+            if not self.is_low_known:
+                return None
+            return self.get_place(self.low_rank % self.num_cells, False)
+
+        def get_high_index(self):
+            """
+            Return the flat index of the cell with the highest key, or None if
+            it is unknown.
+            """
+            if not self.is_high_known:
+                return None
+            return self.get_place(self.high_rank % self.num_cells, True)
+
+        def has_key(self, key):
+            """
+            Return True if any cell has the given key.
+            """
+            index = key + self.offset
+            return 0 <= index < len(self.counts) and self.counts[index] > 0
+
+        def add(self, keys, indexes):
+            """
+            Count the given keys of the cells at the given flat indexes.
+            """
+            if not keys.size:
+                return
+            shift = -int(keys.min()) - self.offset
+            if shift > 0:
+                self.counts = np.concatenate(
+                    (np.zeros(shift, dtype=self.counts.dtype), self.counts))
+                self.offset += shift
+            size = int(keys.max()) + self.offset + 1
+            if size > len(self.counts):
+                self.counts = np.concatenate((
+                    self.counts,
+                    np.zeros(max(size, 2*len(self.counts)) - len(self.counts),
+                             dtype=self.counts.dtype)))
+            np.add.at(self.counts, keys+self.offset, 1)
+            self.count += int(keys.size)
+            self.total += int(keys.sum())
+            self.total_of_squares += int((keys*keys).sum())
+
+            low_rank = self.get_rank(keys, indexes, False)
+            if self.low_rank is None or low_rank < self.low_rank:
+                self.low_rank = low_rank
+                self.is_low_known = True
+            high_rank = self.get_rank(keys, indexes, True)
+            if self.high_rank is None or high_rank > self.high_rank:
+                self.high_rank = high_rank
+                self.is_high_known = True
+
+        def remove(self, keys, indexes):
+            """
+            Stop counting the given keys of the cells at the given flat
+            indexes.
+            """
+            if not keys.size:
+                return
+            np.subtract.at(self.counts, keys+self.offset, 1)
+            self.count -= int(keys.size)
+            self.total -= int(keys.sum())
+            self.total_of_squares -= int((keys*keys).sum())
+            if not self.count:
+                self.low_rank = self.high_rank = None
+                self.is_low_known = self.is_high_known = True
+                return
+            # cells are counted once, so a tracked cell leaves if its index
+            # is removed
+            if self.is_low_known and np.any(indexes == self.get_low_index()):
+                self.is_low_known = False
+            if self.is_high_known and np.any(
+                    indexes == self.get_high_index()):
+                self.is_high_known = False
+
+    class GameOfLifeCellRuns(object):
+        """
+        Track whether each cell of a board is alive and the generation its
+        current run of generations alive or dead started at, for
+        GameOfLifeStreamingStats, as flat arrays in row-major order.
+        Kept up to date from the cells that flip each generation;
+        'generation' is the board's generation it is up to date at, or None
+        if it needs a 'reset' from every cell.
+        """
+
+        def __init__(self, board):
+            self.board = board
+            self.generation = None
+            self.alive = None
+            self.run_starts = None
+
+        def reset(self):
+            """
+            Read every cell's state and current streak from the engine.
+            """
+            board = self.board
+            engine = board.engine
+            self.alive = (engine.get_alive_array() == 1).ravel()
+            streaks = np.where(
+                self.alive,
+                engine.get_stat_array('current_living_streak').ravel(),
+                engine.get_stat_array('current_death_streak').ravel())
+            self.run_starts = board.generation - streaks
+            self.generation = board.generation
+
+        def get_flips(self, cells_to_flip):
+            """
+            Return arrays of the flat indexes of the cells among cells_to_flip
+            that were born and that died. Other cells in cells_to_flip are
+            dying cells of Generations rules.
+            """
+            board = self.board
+            cell_coords = np.asarray(cells_to_flip, dtype=np.intp).reshape(
+                -1, 2)
+            indexes = cell_coords[:, 0]*board.cols + cell_coords[:, 1]
+            if board.rule.num_states == 2:
+                is_born = ~self.alive[indexes]
+            else:
+                is_alive = board.engine.get_alive_array()[
+                    cell_coords[:, 0], cell_coords[:, 1]] == 1
+                flipped = is_alive != self.alive[indexes]
+                indexes, is_born = indexes[flipped], is_alive[flipped]
+            return indexes[is_born], indexes[~is_born]
+
+        def update(self, born, died):
+            """
+            Start new runs for the cells at the flat indexes born and died,
+            which flipped last generation.
+            """
+            self.alive[born] = True
+            self.alive[died] = False
+            self.run_starts[born] = self.board.generation
+            self.run_starts[died] = self.board.generation
+            self.generation = self.board.generation
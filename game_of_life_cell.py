@@ -1,43 +1,61 @@
-
-
 class GameOfLifeCell(object):
     """
     Represent a cell in the Game of Life.
+
+    Cells are lightweight views: a cell's state and stats live in its
+    board's engine, in one array for alive states and one per stat key,
+    and its GUI settings are shared by the whole board. Cells are made on
+    demand and hold nothing but their engine and coords, so any number of
+    cells can view the same board cell.
     """
-    def __init__(
-            self, row, col, is_alive=False, GUI_components=None):
+    __slots__ = ('engine', 'row', 'col')
+    STAT_KEYS = ('gens_alive', 'gens_dead', 'longest_living_streak',
+                 'current_living_streak', 'longest_death_streak',
+                 'current_death_streak', 'births', 'deaths')
+
+    def __init__(self, engine, row, col):
         """
-        Init a cell in the Game of Life.
-        Clients should provide any GUI components they expect to use, such
-        as shapes, colors, draw functions, etc.
+        Init a view of the cell at (row, col) of the engine's board.
         """
-        if GUI_components is None:
-            GUI_components = {}
+        self.engine = engine
         self.row = row
         self.col = col
-        self.is_alive = is_alive
-        self.stats = {
-            'gens_alive': 0,
-            'gens_dead': 0,
-            'longest_living_streak': 0,
-            'current_living_streak': 0,
-            'longest_death_streak': 0,
-            'current_death_streak': 0,
-            'births': 0,
-            'deaths': 0
-        }
-        self.GUI_components = GUI_components
+
+    @property
+    def is_alive(self):
+        return self.engine.is_cell_alive(self.row, self.col)
+
+    @is_alive.setter
+    def is_alive(self, is_alive):
+        self.engine.set_cell_alive(self.row, self.col, is_alive)
+        self.engine.board.invalidate_cell_caches()
+
+    @property
+    def stats(self):
+        """
+        Dict-like view of the cell's stat counters, by stat key.
+        """
+        return self.engine.get_cell_stats(self.row, self.col)
+
+    @property
+    def GUI_components(self):
+        """
+        Dict of the GUI components the cell is drawn with: the board's
+        shared colors and draw functions, and the cell's shape.
+        """
+        return self.engine.board.get_cell_GUI_components(self.row, self.col)
 
     def draw_outline(self):
         """
         If possible, draw outline with thickness 1 around cell's shape.
         """
-        if any(not self.GUI_components.get(GUI_key) for GUI_key in
+        GUI_components = self.GUI_components
+        if any(not GUI_components.get(GUI_key) for GUI_key in
                ['shape', 'draw_func', 'outline_color']):
             return None
-        shape = self.GUI_components['shape']
-        self.GUI_components['draw_func'](
-            self.GUI_components['outline_color'],
+        shape = GUI_components['shape']
+        GUI_components['draw_func'](
+            GUI_components['outline_color'],
             [shape.x-1, shape.y-1, shape.width+2, shape.height+2], 1)
 
     def draw_self(self, stat_modifiers=None):
@@ -50,24 +68,111 @@ class GameOfLifeCell(object):
         :param stat_modifiers: dict of instructions for drawing the cell
         as a stat.
         """
-        if any(not self.GUI_components.get(GUI_key) for GUI_key in
+        GUI_components = self.GUI_components
+        if any(not GUI_components.get(GUI_key) for GUI_key in
                ['shape', 'draw_func', 'alive_color',
                 'dead_color', 'get_fill_param']):
             return None
 
+        is_alive = self.is_alive
         old_alpha = None
         if stat_modifiers:
-            color = self.GUI_components.get('alive_color')
+            color = GUI_components.get('alive_color')
             old_alpha = color.a
             color.a = stat_modifiers.get('alpha')
         else:
-            color = (self.GUI_components.get('alive_color') if self.is_alive
-                     else self.GUI_components.get('dead_color'))
+            color = (GUI_components.get('alive_color') if is_alive
+                     else GUI_components.get('dead_color'))
 
-        self.GUI_components['draw_func'](
-            color, self.GUI_components.get('shape'),
-            self.GUI_components['get_fill_param'](self.is_alive))
+        GUI_components['draw_func'](
+            color, GUI_components.get('shape'),
+            GUI_components['get_fill_param'](is_alive))
 
-        self.GUI_components['current_alpha'] = color.a
         if old_alpha:
             color.a = old_alpha
+
+
+class GameOfLifeCellStatsView(object):
+    """
+    Dict-like access to one cell's entries in a dict of stat arrays, at
+    the given index: a flat index for flat arrays, or a (row, col) tuple
+    for 2D arrays.
+    """
+    __slots__ = ('stat_arrays', 'index')
+
+    def __init__(self, stat_arrays, index):
+        self.stat_arrays = stat_arrays
+        self.index = index
+
+    def __getitem__(self, key):
+        return int(self.stat_arrays[key][self.index])
+
+    def __setitem__(self, key, val):
+        self.stat_arrays[key][self.index] = val
+
+    def __contains__(self, key):
+        return key in self.stat_arrays
+
+    def __iter__(self):
+        return iter(self.stat_arrays)
+
+    def __len__(self):
+        return len(self.stat_arrays)
+
+    def keys(self):
+        return self.stat_arrays.keys()
+
+    def items(self):
+        return [(key, self[key]) for key in self.stat_arrays]
+
+    def get(self, key, default=None):
+        return self[key] if key in self.stat_arrays else default
+
+
+class GameOfLifeCellGrid(object):
+    """
+    Stand-in for a board's 2D list of cells that makes cell views on
+    demand, so boards never build rows*cols cell objects.
+    """
+    __slots__ = ('engine', 'rows', 'cols')
+
+    def __init__(self, engine, rows, cols):
+        self.engine = engine
+        self.rows = rows
+        self.cols = cols
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, row):
+        if not 0 <= row < self.rows:
+            raise IndexError(row)
+        return GameOfLifeCellGridRow(self.engine, row, self.cols)
+
+    def __iter__(self):
+        for row in range(self.rows):
+            yield self[row]
+
+
+class GameOfLifeCellGridRow(object):
+    """
+    One row of a GameOfLifeCellGrid.
+    """
+    __slots__ = ('engine', 'row', 'cols')
+
+    def __init__(self, engine, row, cols):
+        self.engine = engine
+        self.row = row
+        self.cols = cols
+
+    def __len__(self):
+        return self.cols
+
+    def __getitem__(self, col):
+        if not 0 <= col < self.cols:
+            raise IndexError(col)
+        return GameOfLifeCell(self.engine, self.row, col)
+
+    def __iter__(self):
+        for col in range(self.cols):
+            yield GameOfLifeCell(self.engine, self.row, col)
@@ -0,0 +1,127 @@
+import collections
+
+try:
+    import numpy as np
+except ImportError:  # only needed when cycles are detected
+    np = None
+
+
+class GameOfLifeCycleDetector(object):
+    """
+    Detect when a board starts repeating itself.
+
+    Keeps a Zobrist hash of the board's live cells: the XOR of a random 64
+    bit key per live cell. Flipping a cell XORs its key in or out, so the
+    hash is updated from each generation's flipped cells alone. The hash of
+    every recent generation is kept in a bounded table; when a hash comes
+    back, the board has entered a cycle whose period is the number of
+    generations since it was last seen (period 1 is a still life).
+
+    Cell keys are derived from the cell index with the splitmix64 mixer, so
+    no per-cell table is stored. Cycles longer than the history size are
+    not detected.
+    """
+    DEFAULT_HISTORY_SIZE = 1024
+
+    def __init__(self, rows, cols, history_size=DEFAULT_HISTORY_SIZE, seed=0):
+        """
+        Init a detector for a rows x cols board.
+        Call 'reset' with the live cells before the first 'update'.
+        """
+        if np is None:
+            raise ImportError('cycle detection requires numpy')
+        self.rows = rows
+        self.cols = cols
+        self.history_size = history_size
+        self.salt = np.uint64(np.random.default_rng(seed).integers(
+            0, 2**64, dtype=np.uint64))
+        # hash of the current generation, None until reset
+        self.hash = None
+        # hash -> last generation it was seen, and hashes oldest first
+        self.history = {}
+        self.history_order = collections.deque()
+        self.period = None
+        self.onset = None
+
+    def __str__(self):
+        if self.period is None:
+            return 'no cycle detected'
+        return 'entered cycle of period {} at generation {}'.format(
+            self.period, self.onset)
+
+    def get_cell_keys(self, cell_coords):
+        """
+        Return an array of the 64 bit keys of the cells at the given
+        (row, col) coords.
+        """
+        if not isinstance(cell_coords, np.ndarray):
+            cell_coords = list(cell_coords)
+        cell_coords = np.asarray(cell_coords, dtype=np.uint64).reshape(-1, 2)
+        key = (cell_coords[:, 0]*np.uint64(self.cols) + cell_coords[:, 1] +
+               self.salt)
+        # splitmix64; uint64 arrays wrap around on overflow
+        key += np.uint64(0x9E3779B97F4A7C15)
+        key = (key ^ (key >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        key = (key ^ (key >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return key ^ (key >> np.uint64(31))
+
+    def get_hash(self, cell_coords):
+        """
+        Return the XOR of the keys of the cells at the given coords.
+        """
+        return int(np.bitwise_xor.reduce(self.get_cell_keys(cell_coords),
+                                         initial=np.uint64(0)))
+
+    def reset(self, live_cell_coords, generation):
+        """
+        Start tracking the board from the given live cells at the given
+        generation, forgetting any history.
+        """
+        self.hash = self.get_hash(live_cell_coords)
+        self.clear_history()
+        self.record(generation)
+
+    def clear_history(self):
+        """
+        Forget the hashes of previous generations, e.g. after generations
+        were skipped.
+        """
+        self.history.clear()
+        self.history_order.clear()
+        self.period = None
+        self.onset = None
+
+    def record(self, generation):
+        """
+        Remember the current hash as seen at the given generation.
+        """
+        self.history[self.hash] = generation
+        self.history_order.append(self.hash)
+        if len(self.history_order) > self.history_size:
+            # forget the oldest hash unless it was seen again since
+            oldest_hash = self.history_order.popleft()
+            if self.history[oldest_hash] <= generation - self.history_size:
+                del self.history[oldest_hash]
+
+    def update(self, cells_to_flip, generation):
+        """
+        Update the hash with the cells that flipped to reach the given
+        generation.
+        Return True if the board is in a cycle, False otherwise. The first
+        time a cycle is found its 'period' and 'onset' (the first generation
+        in the cycle) are set.
+        """
+        return self.update_hash(self.get_hash(cells_to_flip), generation)
+
+    def update_hash(self, flipped_hash, generation):
+        """
+        Like 'update', given the XOR of the flipped cells' keys instead of
+        their coords, e.g. computed for many boards at once.
+        """
+        self.hash ^= flipped_hash
+        last_seen = self.history.get(self.hash)
+        if last_seen is not None and self.period is None:
+            self.period = generation - last_seen
+            self.onset = last_seen
+        self.record(generation)
+        return self.period is not None
@@ -0,0 +1,209 @@
+import itertools
+import time
+
+
+class GameOfLifeSimulationDriver(object):
+    """
+    Run a GameOfLifeBoard's simulation under generation and time limits.
+
+    Stepping and display are decoupled: generations run as fast as they can
+    (or at most 'generations_per_second'), and the board is drawn at most
+    'frames_per_second' times a second. Cells flipped between frames are
+    drawn together at the next frame, so every generation that fits between
+    two frames is run without being drawn (frame skipping) and a slow
+    renderer never slows down the simulation.
+
+    Can also checkpoint the board to snapshot files (see
+    GameOfLifeBoard.save_snapshot) every few generations and when the run
+    stops, so a long run can be resumed with GameOfLifeBoard.load_snapshot.
+
+    With a GameOfLifeProfiler, the board's generations are profiled during
+    the run, along with the time spent drawing frames, presenting them,
+    waiting and checkpointing.
+    """
+    STOP_REASONS = {'stable', 'cycle', 'max_generations', 'max_seconds'}
+
+    def __init__(self, board, max_generations=None, max_seconds=None,
+                 frames_per_second=None, generations_per_second=None,
+                 display_func=None, checkpoint_path=None,
+                 checkpoint_every=None, clock=time.perf_counter,
+                 sleep=time.sleep, profiler=None):
+        """
+        :param max_generations: stop once the board reaches this generation.
+        :param max_seconds: stop once this much wall-clock time has passed.
+        :param frames_per_second: draw the board this often; None never
+        draws (e.g. for a board without GUI components).
+        :param generations_per_second: run at most this many generations a
+        second, e.g. to keep a small board watchable; None is unlimited.
+        :param display_func: function called with no args after each frame
+        is drawn, e.g. to push the drawn cells to the display.
+        :param checkpoint_path: snapshot file path to checkpoint to. May
+        contain '{generation}', e.g. 'run-{generation}.snap', to keep every
+        checkpoint instead of replacing the last one.
+        :param checkpoint_every: checkpoint each time the board's generation
+        is a multiple of this; None only checkpoints when the run stops.
+        :param clock: function returning the time in seconds.
+        :param sleep: function that waits the given number of seconds.
+        :param profiler: optional GameOfLifeProfiler to profile the run.
+
+        Raise ValueError if checkpoint_every is not positive or is given
+        without a checkpoint_path.
+        """
+        if checkpoint_every is not None:
+            if checkpoint_path is None:
+                raise ValueError('checkpoint_every needs a checkpoint path')
+            if checkpoint_every < 1:
+                raise ValueError('checkpoint_every must be at least 1')
+        self.board = board
+        self.max_generations = max_generations
+        self.max_seconds = max_seconds
+        self.frame_interval = (None if frames_per_second is None
+                               else 1 / frames_per_second)
+        self.generation_interval = (None if generations_per_second is None
+                                    else 1 / generations_per_second)
+        self.display_func = display_func or (lambda: None)
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.clock = clock
+        self.sleep = sleep
+        self.profiler = profiler
+        # flipped cell coords of each generation not drawn yet
+        self.undrawn_cells_to_flip = []
+        self.num_undrawn_cells = 0
+        self.frames = 0
+
+    def run(self):
+        """
+        Advance the board until it stops changing (see
+        GameOfLifeBoard.advance_board_one_generation) or a limit is reached.
+
+        Return a dict with the reason the simulation stopped (one of
+        STOP_REASONS, see 'get_stop_reason' for boards that stopped
+        changing), the board's generation, the seconds taken and the
+        number of frames drawn.
+        """
+        board = self.board
+        draws_frames = self.frame_interval is not None
+        draw_on_advance = board.draw_on_advance
+        board_profiler = board.profiler
+        if draws_frames:
+            board.draw_on_advance = False
+        if self.profiler is not None:
+            board.profiler = self.profiler
+        start_time = self.clock()
+        next_frame_time = start_time
+        next_generation_time = start_time
+
+        try:
+            while True:
+                now = self.clock()
+                if (self.max_generations is not None and
+                        board.generation >= self.max_generations):
+                    stop_reason = 'max_generations'
+                    break
+                if (self.max_seconds is not None and
+                        now - start_time >= self.max_seconds):
+                    stop_reason = 'max_seconds'
+                    break
+                if draws_frames and now >= next_frame_time:
+                    self.draw_frame()
+                    # after a slow frame, wait a whole interval again
+                    next_frame_time = max(next_frame_time+self.frame_interval,
+                                          now)
+                if (self.generation_interval is not None and
+                        now < next_generation_time):
+                    self.wait(now, next_generation_time, next_frame_time,
+                              start_time)
+                    continue
+
+                is_changing = board.advance_board_one_generation()
+                if draws_frames:
+                    self.undrawn_cells_to_flip.append(board.cells_to_flip)
+                    self.num_undrawn_cells += len(board.cells_to_flip)
+                if not is_changing:
+                    stop_reason = get_stop_reason(board)
+                    break
+                if (self.checkpoint_every is not None and
+                        board.generation % self.checkpoint_every == 0):
+                    self.save_checkpoint()
+                if self.generation_interval is not None:
+                    next_generation_time = max(
+                        next_generation_time+self.generation_interval, now)
+        finally:
+            board.draw_on_advance = draw_on_advance
+            board.profiler = board_profiler
+
+        if draws_frames:
+            self.draw_frame()
+        if self.checkpoint_path is not None:
+            self.save_checkpoint()
+        return {
+            'stop_reason': stop_reason,
+            'generations': board.generation,
+            'seconds': self.clock() - start_time,
+            'frames': self.frames
+        }
+
+    def wait(self, now, next_generation_time, next_frame_time, start_time):
+        """
+        Sleep until the next generation is due, waking early for a frame or
+        the time limit.
+        """
+        wake_time = next_generation_time
+        if self.frame_interval is not None:
+            wake_time = min(wake_time, next_frame_time)
+        if self.max_seconds is not None:
+            wake_time = min(wake_time, start_time+self.max_seconds)
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.start_phase()
+        self.sleep(max(wake_time-now, 0))
+        if profiler is not None:
+            profiler.end_phase('idle')
+
+    def save_checkpoint(self):
+        """
+        Save the board to the checkpoint path.
+        """
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.start_phase()
+        self.board.save_snapshot(
+            self.checkpoint_path.format(generation=self.board.generation))
+        if profiler is not None:
+            profiler.end_phase('checkpoint')
+
+    def draw_frame(self):
+        """
+        Draw the cells flipped since the last frame and call the display
+        function. Redraws the whole board if that is less work.
+        """
+        board = self.board
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.start_phase()
+        if self.num_undrawn_cells > board.rows*board.cols:
+            board.display_self()
+        elif self.num_undrawn_cells:
+            board.draw_cells(
+                itertools.chain.from_iterable(self.undrawn_cells_to_flip))
+        self.undrawn_cells_to_flip = []
+        self.num_undrawn_cells = 0
+        if profiler is not None:
+            profiler.end_phase('render')
+        self.display_func()
+        if profiler is not None:
+            profiler.end_phase('present')
+        self.frames += 1
+
+
+def get_stop_reason(board):
+    """
+    Return why a board stopped changing: 'cycle' if its cycle detector
+    found it repeating with a period above 1 (an oscillator), else
+    'stable' (a still life).
+    """
+    detector = board.cycle_detector
+    if detector is not None and detector.period and detector.period > 1:
+        return 'cycle'
+    return 'stable'
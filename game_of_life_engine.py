@@ -0,0 +1,1154 @@
+import array
+import collections
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:  # numpy engine is optional
+    np = None
+
+from game_of_life_cell import GameOfLifeCell, GameOfLifeCellStatsView
+from game_of_life_hashlife import GameOfLifeHashLife
+from game_of_life_rules import CONWAY
+from game_of_life_topology import NEIGHBOR_OFFSETS
+
+
+class GameOfLifeEngine(object):
+    """
+    Compute generations for a GameOfLifeBoard.
+    An engine applies the board's rule (see game_of_life_rules) to get from
+    one generation to the next and keeps each cell's stat counters up to
+    date. It also holds the cells' state and stats, which the board's cells
+    (see GameOfLifeCell) are views of.
+    Subclasses implement 'advance_one_generation' and the cell accessors
+    'is_cell_alive', 'set_cell_alive' and 'get_cell_stats'.
+    """
+    # engines whose stat arrays are up to date every generation, so
+    # streaming stats need no pass over the cells
+    HAS_STAT_ARRAYS = True
+    # engines that can hold the dying states of Generations rules
+    SUPPORTS_MULTI_STATE_RULES = False
+    # names of the topologies the engine can step (see game_of_life_topology)
+    # and the one boards use by default
+    TOPOLOGIES = ('bounded', 'torus', 'klein bottle', 'infinite')
+    DEFAULT_TOPOLOGY = 'bounded'
+
+    def __init__(self, board, live_cell_coords):
+        """
+        Init an engine for the given board.
+        The board's rows, cols, rule and topology are already set when
+        engines are created. Raise ValueError if the engine cannot run the
+        rule or topology.
+        """
+        self.board = board
+        if board.rule.num_states > 2 and not self.SUPPORTS_MULTI_STATE_RULES:
+            raise ValueError(
+                '{} only supports two-state rules, not {}'.format(
+                    type(self).__name__, board.rule))
+        if board.topology.NAME not in self.TOPOLOGIES:
+            raise ValueError('{} does not support the {} topology'.format(
+                type(self).__name__, board.topology))
+
+    def advance_one_generation(self):
+        """
+        Set the board to its next generation and update cell stat counters.
+        Return a sequence of (row, col) coords of cells that flipped: a list
+        of tuples, or an (n, 2) int array for engines that use numpy.
+        """
+        raise NotImplementedError
+
+    def is_cell_alive(self, row, col):
+        """
+        Return True if the cell at (row, col) is alive, False otherwise.
+        """
+        raise NotImplementedError
+
+    def set_cell_alive(self, row, col, is_alive):
+        """
+        Set whether the cell at (row, col) is alive, e.g. when clicked.
+        """
+        raise NotImplementedError
+
+    def set_cell_states(self, cell_coords, states):
+        """
+        Set the cells at the given (row, col) coords (an (n, 2) int array)
+        to the given states (1 alive, 0 dead), e.g. to restore a recorded
+        generation. Engines with Generations rules also take dying states.
+        """
+        for (row, col), state in zip(cell_coords.tolist(), states.tolist()):
+            self.set_cell_alive(row, col, state == 1)
+
+    def get_cell_stats(self, row, col):
+        """
+        Return a dict-like view of the stat counters of the cell at
+        (row, col) (see GameOfLifeCellStatsView).
+        """
+        raise NotImplementedError
+
+    def get_outside_num_live_neighbors(self, row, col):
+        """
+        Return the number of live neighbors the cell at (row, col) has
+        beyond the board's edges, which is 0 unless the topology is
+        infinite.
+        """
+        return 0
+
+    def get_num_live_neighbors(self, row, col):
+        """
+        Return the number of live neighbors of the cell at (row, col).
+        """
+        num_live_neighbors = 0
+        for neighbor_row, neighbor_col in \
+                self.board.topology.neighbor_coords[row][col]:
+            if self.is_cell_alive(neighbor_row, neighbor_col):
+                num_live_neighbors += 1
+        if self.board.topology.IS_INFINITE:
+            num_live_neighbors += self.get_outside_num_live_neighbors(row,
+                                                                      col)
+        return num_live_neighbors
+
+    def get_num_live_neighbors_grid(self):
+        """
+        Return a (rows, cols) uint8 array with the number of live neighbors
+        of every cell. Requires numpy.
+        """
+        board = self.board
+        rows, cols = board.rows, board.cols
+        padded = np.zeros((rows+2, cols+2), dtype=np.uint8)
+        num_live_neighbors = count_live_neighbors(board.topology.pad(
+            get_live(self.get_alive_array(), board.rule), padded))
+        if board.topology.IS_INFINITE:
+            # only edge cells have neighbors beyond the board
+            edge_coords = ({(row, col) for row in (0, rows-1)
+                            for col in range(cols)} |
+                           {(row, col) for row in range(rows)
+                            for col in (0, cols-1)})
+            for row, col in edge_coords:
+                num_live_neighbors[row, col] += \
+                    self.get_outside_num_live_neighbors(row, col)
+        return num_live_neighbors
+
+    def get_live_cell_coords(self):
+        """
+        Return a sequence of (row, col) coords of live cells.
+        """
+        return [(row, col) for row in range(self.board.rows)
+                for col in range(self.board.cols)
+                if self.is_cell_alive(row, col)]
+
+    def get_population(self):
+        """
+        Return the number of live cells.
+        """
+        return len(self.get_live_cell_coords())
+
+    def get_alive_array(self):
+        """
+        Return a (rows, cols) uint8 array of cell states: 1 for live cells,
+        0 for dead ones and higher for dying states of Generations rules.
+        Engines that keep their cells in an array return a view of it,
+        which must not be written to. Requires numpy.
+        """
+        alive = np.zeros((self.board.rows, self.board.cols), dtype=np.uint8)
+        set_live_cells(alive, self.get_live_cell_coords())
+        return alive
+
+    def get_num_cells_evaluated(self):
+        """
+        Return the number of cells whose next state was computed last
+        generation.
+        """
+        return self.board.rows*self.board.cols
+
+    def get_stat_values(self, category):
+        """
+        Return a list of every cell's value for the given stat key, in
+        row-major order.
+        """
+        return [self.get_cell_stats(row, col)[category]
+                for row in range(self.board.rows)
+                for col in range(self.board.cols)]
+
+    def get_stat_array(self, category):
+        """
+        Return a (rows, cols) int64 array of every cell's value for the given
+        stat key. Requires numpy.
+        """
+        return np.array(self.get_stat_values(category), dtype=np.int64
+                        ).reshape(self.board.rows, self.board.cols)
+
+    def get_cell_stat_values(self, category, indexes):
+        """
+        Return an int64 array of the values for the given stat key of the
+        cells at the given int array of flat indexes (row*cols + col).
+        Requires numpy.
+        """
+        cols = self.board.cols
+        return np.array([self.get_cell_stats(*divmod(index, cols))[category]
+                         for index in indexes.tolist()], dtype=np.int64)
+
+    def set_stat_array(self, category, values):
+        """
+        Set every cell's value for the given stat key from a (rows, cols)
+        array.
+        """
+        for row in range(self.board.rows):
+            for col in range(self.board.cols):
+                self.get_cell_stats(row, col)[category] = int(values[row, col])
+
+
+class GameOfLifePythonEngine(GameOfLifeEngine):
+    """
+    Step the board one cell at a time with plain Python.
+    State lives in a flat bytearray 'alive' of the board padded with a one
+    cell border, like the numpy engines' padded arrays, so every cell's
+    neighbors are at the same index offsets; the border is filled from the
+    cells the topology wraps it to each generation. Stats live in one flat
+    int64 array.array per stat key, indexed the same way, so a board of any
+    size is a handful of allocations.
+    """
+    def __init__(self, board, live_cell_coords):
+        super().__init__(board, live_cell_coords)
+        if np is not None and isinstance(live_cell_coords, np.ndarray):
+            live_cell_coords = live_cell_coords.reshape(-1, 2).tolist()
+        rows, cols = board.rows, board.cols
+        self.padded_cols = padded_cols = cols+2
+        num_cells = (rows+2)*padded_cols
+        # index offsets of a cell's neighbors in the padded arrays
+        self.neighbor_offsets = tuple(
+            d_row*padded_cols + d_col for d_row, d_col in NEIGHBOR_OFFSETS)
+        # index of each border cell -> index of the cell the topology
+        # wraps it to, or None if it is always dead
+        self.border_sources = {}
+        for row in range(-1, rows+1):
+            for col in ((-1, cols) if 0 <= row < rows else range(-1, cols+1)):
+                coords = board.topology.wrap(row, col)
+                self.border_sources[self.get_index(row, col)] = (
+                    None if coords is None else self.get_index(*coords))
+        self.wrapped_border = [
+            (index, source) for index, source in self.border_sources.items()
+            if source is not None]
+
+        self.alive = bytearray(num_cells)
+        for row, col in live_cell_coords:
+            self.alive[self.get_index(row, col)] = 1
+        self.fill_border()
+        self.stats = {key: array.array('q', bytes(8*num_cells))
+                      for key in GameOfLifeCell.STAT_KEYS}
+        # for the infinite topology: live cells beyond the board's edges,
+        # and the number of them next to each board cell by index
+        self.outside_live_cell_coords = set([])
+        self.outside_num_live_neighbors = {}
+        self.edge_coords = sorted(
+            {(row, col) for row in range(rows)
+             for col in (0, cols-1)} |
+            {(row, col) for row in (0, rows-1)
+             for col in range(cols)})
+
+    def get_index(self, row, col):
+        """
+        Return the index of the cell at (row, col) in the padded arrays.
+        """
+        return (row+1)*self.padded_cols + col+1
+
+    def get_board_indexes(self):
+        """
+        Return a list of the indexes of the board's cells, in row-major
+        order.
+        """
+        padded_cols, cols = self.padded_cols, self.board.cols
+        return [index for row in range(1, self.board.rows+1)
+                for index in range(row*padded_cols + 1,
+                                   row*padded_cols + cols+1)]
+
+    def fill_border(self):
+        """
+        Copy the cells the topology wraps the border to into the border.
+        """
+        alive = self.alive
+        for index, source in self.wrapped_border:
+            alive[index] = alive[source]
+
+    def is_cell_alive(self, row, col):
+        return self.alive[self.get_index(row, col)] == 1
+
+    def set_cell_alive(self, row, col, is_alive):
+        self.alive[self.get_index(row, col)] = 1 if is_alive else 0
+        self.fill_border()
+
+    def set_cell_states(self, cell_coords, states):
+        # fill the border once rather than once per cell
+        alive = self.alive
+        for (row, col), state in zip(cell_coords.tolist(), states.tolist()):
+            alive[self.get_index(row, col)] = 1 if state == 1 else 0
+        self.fill_border()
+
+    def get_cell_stats(self, row, col):
+        return GameOfLifeCellStatsView(self.stats, self.get_index(row, col))
+
+    def get_live_cell_coords(self):
+        padded_cols = self.padded_cols
+        alive = self.alive
+        return [(index // padded_cols - 1, index % padded_cols - 1)
+                for index in self.get_board_indexes() if alive[index]]
+
+    def get_stat_values(self, category):
+        values = self.stats[category]
+        return [values[index] for index in self.get_board_indexes()]
+
+    def get_alive_array(self):
+        return np.frombuffer(self.alive, dtype=np.uint8).reshape(
+            self.board.rows+2, self.padded_cols)[1:-1, 1:-1]
+
+    def get_stat_array(self, category):
+        # a view of the stats, like the numpy engine's arrays
+        return np.frombuffer(self.stats[category], dtype=np.int64).reshape(
+            self.board.rows+2, self.padded_cols)[1:-1, 1:-1]
+
+    def get_cell_stat_values(self, category, indexes):
+        return np.frombuffer(self.stats[category], dtype=np.int64)[
+            self.get_padded_indexes(indexes)]
+
+    def get_padded_indexes(self, indexes):
+        """
+        Return the indexes in the padded arrays of the cells at the given
+        int array of flat indexes (row*cols + col).
+        """
+        # each row above adds two border cells, and the top border a row
+        return indexes + 2*(indexes // self.board.cols) + self.padded_cols+1
+
+    def set_stat_array(self, category, values):
+        self.get_stat_array(category)[...] = values
+
+    def get_outside_num_live_neighbors(self, row, col):
+        return self.outside_num_live_neighbors.get(self.get_index(row, col),
+                                                   0)
+
+    def get_num_live_neighbors(self, row, col):
+        alive = self.alive
+        index = (row+1)*self.padded_cols + col+1
+        above = index - self.padded_cols - 1
+        below = index + self.padded_cols - 1
+        num_live_neighbors = (
+            alive[above] + alive[above+1] + alive[above+2] +
+            alive[index-1] + alive[index+1] +
+            alive[below] + alive[below+1] + alive[below+2])
+        if self.outside_num_live_neighbors:
+            num_live_neighbors += self.outside_num_live_neighbors.get(index, 0)
+        return num_live_neighbors
+
+    def set_outside_live_cell_coords(self, outside_live_cell_coords):
+        """
+        For the infinite topology, set the live cells beyond the board's
+        edges and count how many of them are next to each board cell.
+        """
+        rows, cols = self.board.rows, self.board.cols
+        self.outside_live_cell_coords = outside_live_cell_coords
+        self.outside_num_live_neighbors = collections.Counter(
+            self.get_index(row+d_row, col+d_col)
+            for row, col in outside_live_cell_coords
+            for d_row, d_col in NEIGHBOR_OFFSETS
+            if 0 <= row+d_row < rows and 0 <= col+d_col < cols)
+
+    def step_outside(self):
+        """
+        For the infinite topology, return the set of coords of live cells
+        beyond the board's edges next generation.
+        Cells beyond the edges are kept sparsely, as the live ones' coords.
+        """
+        board = self.board
+        counts = collections.Counter()
+        for row, col in self.outside_live_cell_coords:
+            for d_row, d_col in NEIGHBOR_OFFSETS:
+                counts[(row+d_row, col+d_col)] += 1
+        for row, col in self.edge_coords:
+            if self.alive[self.get_index(row, col)]:
+                for d_row, d_col in NEIGHBOR_OFFSETS:
+                    counts[(row+d_row, col+d_col)] += 1
+
+        next_outside_live_cell_coords = set([])
+        next_states = board.rule.next_states
+        for coords in counts.keys() | self.outside_live_cell_coords:
+            row, col = coords
+            if (not (0 <= row < board.rows and 0 <= col < board.cols) and
+                    next_states[coords in self.outside_live_cell_coords][
+                        counts[coords]] == 1):
+                next_outside_live_cell_coords.add(coords)
+        return next_outside_live_cell_coords
+
+    def step_cells(self, indexes):
+        """
+        Increment the stat counters of the cells at the given indexes for
+        the current generation and find which of them flip.
+        Return the list of indexes of cells that flip.
+        """
+        alive = self.alive
+        stats = self.stats
+        gens_alive = stats['gens_alive']
+        gens_dead = stats['gens_dead']
+        current_living_streak = stats['current_living_streak']
+        longest_living_streak = stats['longest_living_streak']
+        current_death_streak = stats['current_death_streak']
+        longest_death_streak = stats['longest_death_streak']
+        above_left = -self.padded_cols - 1
+        below_left = self.padded_cols - 1
+        next_states = self.board.rule.next_states
+        outside_num_live_neighbors = self.outside_num_live_neighbors
+        flips = []
+        for index in indexes:
+            is_alive = alive[index]
+            if is_alive:
+                gens_alive[index] += 1
+                current_living_streak[index] += 1
+                if current_living_streak[index] > longest_living_streak[index]:
+                    longest_living_streak[index] = \
+                        current_living_streak[index]
+            else:
+                gens_dead[index] += 1
+                current_death_streak[index] += 1
+                if current_death_streak[index] > longest_death_streak[index]:
+                    longest_death_streak[index] = current_death_streak[index]
+            above = index + above_left
+            below = index + below_left
+            num_live_neighbors = (
+                alive[above] + alive[above+1] + alive[above+2] +
+                alive[index-1] + alive[index+1] +
+                alive[below] + alive[below+1] + alive[below+2])
+            if outside_num_live_neighbors:
+                num_live_neighbors += outside_num_live_neighbors.get(index, 0)
+            if next_states[is_alive][num_live_neighbors] != is_alive:
+                current_living_streak[index] = 0
+                current_death_streak[index] = 0
+                flips.append(index)
+        return flips
+
+    def flip_cells(self, flips):
+        """
+        Flip the cells at the given indexes and count their births and
+        deaths.
+        Return a list of their (row, col) coords.
+        """
+        alive = self.alive
+        births = self.stats['births']
+        deaths = self.stats['deaths']
+        padded_cols = self.padded_cols
+        for index in flips:
+            alive[index] ^= 1
+            if alive[index]:
+                births[index] += 1
+            else:
+                deaths[index] += 1
+        self.fill_border()
+        return [(index // padded_cols - 1, index % padded_cols - 1)
+                for index in flips]
+
+    def advance_one_generation(self):
+        is_infinite = self.board.topology.IS_INFINITE
+        if is_infinite:
+            next_outside_live_cell_coords = self.step_outside()
+        cells_to_flip = self.flip_cells(
+            self.step_cells(self.get_board_indexes()))
+        if is_infinite:
+            self.set_outside_live_cell_coords(next_outside_live_cell_coords)
+        return cells_to_flip
+
+
+class GameOfLifeActiveEngine(GameOfLifePythonEngine):
+    """
+    Step the board cell by cell like the python engine, but only evaluate
+    cells that flipped last generation and their neighbors; every other
+    cell's neighborhood is unchanged, so it cannot flip.
+    Stat counters of cells that are not evaluated are caught up lazily
+    when their stats are read (see 'catch_up_cells').
+
+    The first generation evaluates every cell. Cells set alive or dead
+    through the board's cells are evaluated again next generation; cells
+    changed in 'alive' directly must be reported with 'mark_dirty'.
+    """
+    HAS_STAT_ARRAYS = False
+
+    def __init__(self, board, live_cell_coords):
+        super().__init__(board, live_cell_coords)
+        self.generation = 0
+        # generation each cell's stat counters are caught up to
+        self.caught_up_generations = array.array('q', bytes(len(
+            self.stats['births'])*8))
+        # indexes of board cells and coords of cells beyond the edges (of
+        # an infinite board's universe) that flipped; None means every cell
+        self.dirty_indexes = None
+        self.dirty_outside_coords = set([])
+        self.cells_evaluated = 0
+
+    def set_cell_alive(self, row, col, is_alive):
+        # the skipped generations were spent in the old state
+        self.catch_up_cells([self.get_index(row, col)])
+        super().set_cell_alive(row, col, is_alive)
+        self.mark_dirty([(row, col)])
+
+    def set_cell_states(self, cell_coords, states):
+        coords = cell_coords.tolist()
+        self.catch_up_cells([self.get_index(row, col) for row, col in coords])
+        super().set_cell_states(cell_coords, states)
+        self.mark_dirty(coords)
+
+    def get_cell_stats(self, row, col):
+        index = self.get_index(row, col)
+        self.catch_up_cells([index])
+        return GameOfLifeCellStatsView(self.stats, index)
+
+    def get_stat_values(self, category):
+        self.catch_up_cells(self.get_board_indexes())
+        return super().get_stat_values(category)
+
+    def get_stat_array(self, category):
+        self.catch_up_cells(self.get_board_indexes())
+        return super().get_stat_array(category)
+
+    def get_cell_stat_values(self, category, indexes):
+        self.catch_up_cells(self.get_padded_indexes(indexes).tolist())
+        return super().get_cell_stat_values(category, indexes)
+
+    def get_num_cells_evaluated(self):
+        return self.cells_evaluated
+
+    def catch_up_cells(self, indexes):
+        """
+        Catch the stat counters of the cells at the given indexes up with
+        the generations the engine skipped them for; they cannot have
+        flipped in those generations.
+        """
+        alive = self.alive
+        stats = self.stats
+        caught_up_generations = self.caught_up_generations
+        generation = self.generation
+        for index in indexes:
+            skipped_generations = generation - caught_up_generations[index]
+            if not skipped_generations:
+                continue
+            if alive[index]:
+                stats['gens_alive'][index] += skipped_generations
+                stats['current_living_streak'][index] += skipped_generations
+                stats['longest_living_streak'][index] = max(
+                    stats['longest_living_streak'][index],
+                    stats['current_living_streak'][index])
+            else:
+                stats['gens_dead'][index] += skipped_generations
+                stats['current_death_streak'][index] += skipped_generations
+                stats['longest_death_streak'][index] = max(
+                    stats['longest_death_streak'][index],
+                    stats['current_death_streak'][index])
+            caught_up_generations[index] = generation
+
+    def mark_dirty(self, cell_coords):
+        """
+        Make sure the cells at the given (row, col) coords and their
+        neighbors are evaluated next generation.
+        """
+        if self.dirty_indexes is None:
+            return
+        rows, cols = self.board.rows, self.board.cols
+        for row, col in cell_coords:
+            if 0 <= row < rows and 0 <= col < cols:
+                self.dirty_indexes.add(self.get_index(row, col))
+            else:
+                self.dirty_outside_coords.add((row, col))
+
+    def get_cells_to_evaluate(self):
+        """
+        Return an iterable of indexes of cells that may flip this
+        generation.
+        Neighbors in the border are evaluated as the cells the topology
+        wraps them to. Dirty coords beyond the board's edges (cells of an
+        infinite board's universe that flipped) only make their neighbors
+        on the board dirty.
+        """
+        if self.dirty_indexes is None:
+            return self.get_board_indexes()
+        rows, cols = self.board.rows, self.board.cols
+        border_sources = self.border_sources
+        cells_to_evaluate = set(self.dirty_indexes)
+        for index in self.dirty_indexes:
+            for offset in self.neighbor_offsets:
+                neighbor_index = index + offset
+                if neighbor_index in border_sources:
+                    neighbor_index = border_sources[neighbor_index]
+                    if neighbor_index is None:
+                        continue
+                cells_to_evaluate.add(neighbor_index)
+        for row, col in self.dirty_outside_coords:
+            for d_row, d_col in NEIGHBOR_OFFSETS:
+                if 0 <= row+d_row < rows and 0 <= col+d_col < cols:
+                    cells_to_evaluate.add(self.get_index(row+d_row,
+                                                         col+d_col))
+        return cells_to_evaluate
+
+    def advance_one_generation(self):
+        is_infinite = self.board.topology.IS_INFINITE
+        next_generation = self.generation + 1
+        cells_to_evaluate = self.get_cells_to_evaluate()
+        if is_infinite:
+            next_outside_live_cell_coords = self.step_outside()
+
+        self.catch_up_cells(cells_to_evaluate)
+        flips = self.step_cells(cells_to_evaluate)
+        caught_up_generations = self.caught_up_generations
+        for index in cells_to_evaluate:
+            caught_up_generations[index] = next_generation
+        cells_to_flip = self.flip_cells(flips)
+
+        self.generation = next_generation
+        self.cells_evaluated = len(cells_to_evaluate)
+        self.dirty_indexes = set(flips)
+        self.dirty_outside_coords = set([])
+        if is_infinite:
+            self.dirty_outside_coords = (
+                self.outside_live_cell_coords ^ next_outside_live_cell_coords)
+            self.set_outside_live_cell_coords(next_outside_live_cell_coords)
+        return cells_to_flip
+
+
+class GameOfLifeNumpyEngine(GameOfLifeEngine):
+    """
+    Step the whole board at once with NumPy array operations.
+    State lives in a uint8 'alive' array and stats in one int64 array per
+    stat key; the board's cells are views onto these arrays.
+    For Generations rules 'alive' holds each cell's state: 1 is alive and
+    2 and up are dying.
+    With the infinite topology 'alive' is a view of the board's window of a
+    larger 'universe' array (see 'init_universe').
+    """
+    SUPPORTS_MULTI_STATE_RULES = True
+
+    def __init__(self, board, live_cell_coords):
+        if np is None:
+            raise ImportError('the numpy engine requires numpy')
+        super().__init__(board, live_cell_coords)
+        shape = (board.rows, board.cols)
+        self.alive = np.zeros(shape, dtype=np.uint8)
+        set_live_cells(self.alive, live_cell_coords)
+        self.stats = {
+            key: np.zeros(shape, dtype=np.int64)
+            for key in GameOfLifeCell.STAT_KEYS
+        }
+        # neighbor counts are summed into a buffer with a one cell border,
+        # filled in by the board's topology
+        self._padded = np.zeros((board.rows+2, board.cols+2), dtype=np.uint8)
+        self.universe = None
+        # (row, col) of the board's top left cell in the universe
+        self.window_origin = (0, 0)
+        if board.topology.IS_INFINITE:
+            self.init_universe()
+
+    def init_universe(self):
+        """
+        For the infinite topology, keep the board's cells in the middle of a
+        larger 'universe' array that grows as patterns spread (see
+        'grow_universe'). Cells outside the board have no stats.
+        """
+        rows, cols = self.alive.shape
+        self.universe = np.zeros((rows+2, cols+2), dtype=np.uint8)
+        self.universe[1:-1, 1:-1] = self.alive
+        self.window_origin = (1, 1)
+        self.alive = self.universe[1:-1, 1:-1]
+        self._padded = np.zeros((rows+4, cols+4), dtype=np.uint8)
+
+    def grow_universe(self):
+        """
+        If any cell on the universe's outer edge is not dead, grow the
+        universe on every side, so cells born next generation are inside
+        it. Grows by half its size at a time, so spreading patterns only
+        make it grow a logarithmic number of times.
+        """
+        universe = self.universe
+        if not (universe[0].any() or universe[-1].any() or
+                universe[:, 0].any() or universe[:, -1].any()):
+            return
+        margin = max(16, max(universe.shape) // 2)
+        height, width = universe.shape
+        self.universe = np.zeros((height+2*margin, width+2*margin),
+                                 dtype=np.uint8)
+        self.universe[margin:-margin, margin:-margin] = universe
+        top, left = self.window_origin
+        self.window_origin = (top+margin, left+margin)
+        self.alive = self.universe[self.get_window()]
+        self._padded = np.zeros((height+2*margin+2, width+2*margin+2),
+                                dtype=np.uint8)
+
+    def get_window(self):
+        """
+        Return the (row slice, col slice) of the board's cells in the
+        universe.
+        """
+        top, left = self.window_origin
+        return (slice(top, top+self.board.rows),
+                slice(left, left+self.board.cols))
+
+    def is_cell_alive(self, row, col):
+        return bool(self.alive[row, col] == 1)
+
+    def set_cell_alive(self, row, col, is_alive):
+        self.alive[row, col] = is_alive
+
+    def set_cell_states(self, cell_coords, states):
+        self.alive[cell_coords[:, 0], cell_coords[:, 1]] = states
+
+    def get_cell_stats(self, row, col):
+        return GameOfLifeCellStatsView(self.stats, (row, col))
+
+    def get_stat_values(self, category):
+        return self.stats[category].ravel().tolist()
+
+    def get_live_cell_coords(self):
+        return np.argwhere(get_live(self.alive, self.board.rule))
+
+    def get_population(self):
+        return int(np.count_nonzero(self.alive == 1))
+
+    def get_alive_array(self):
+        return self.alive
+
+    def get_stat_array(self, category):
+        return self.stats[category]
+
+    def get_cell_stat_values(self, category, indexes):
+        return np.take(self.stats[category], indexes)
+
+    def set_stat_array(self, category, values):
+        self.stats[category][...] = values
+
+    def get_outside_num_live_neighbors(self, row, col):
+        if self.universe is None:
+            return 0
+        top, left = self.window_origin
+        neighborhood = get_live(
+            self.universe[top+row-1:top+row+2, left+col-1:left+col+2],
+            self.board.rule)
+        return int(neighborhood.sum()) - int(neighborhood[1, 1]) - sum(
+            self.is_cell_alive(*coords)
+            for coords in self.board.topology.neighbor_coords[row][col])
+
+    def get_num_live_neighbors_grid(self):
+        """
+        Return an array with the number of live neighbors of every cell.
+        """
+        rule = self.board.rule
+        if self.universe is not None:
+            self._padded[1:-1, 1:-1] = get_live(self.universe, rule)
+            return count_live_neighbors(self._padded)[self.get_window()]
+        return count_live_neighbors(get_live(
+            self.board.topology.pad(self.alive, self._padded), rule))
+
+    def advance_one_generation(self):
+        rule = self.board.rule
+        if self.universe is not None:
+            return self.advance_universe_one_generation()
+        next_states, changed = step_cells(
+            self.alive,
+            get_live(self.board.topology.pad(self.alive, self._padded), rule),
+            self.stats, rule)
+        self.alive[...] = next_states
+        return np.argwhere(changed)
+
+    def advance_universe_one_generation(self):
+        """
+        Advance the whole universe of an infinite board and update the stats
+        of the board's cells.
+        Return an (n, 2) array of (row, col) coords of board cells that
+        changed state.
+        """
+        rule = self.board.rule
+        self.grow_universe()
+        self._padded[1:-1, 1:-1] = get_live(self.universe, rule)
+        next_universe = get_next_cell_states(
+            self.universe, count_live_neighbors(self._padded), rule)
+        next_states = next_universe[self.get_window()]
+        update_stat_arrays(self.stats, self.alive == 1, next_states == 1)
+        changed = next_states != self.alive
+        self.universe[...] = next_universe
+        return np.argwhere(changed)
+
+    def set_next_generation(self, will_be_alive):
+        """
+        Increment stat counters for the current generation, then set the
+        board to the given next generation (a bool array).
+        Return an (n, 2) array of (row, col) coords of cells that flipped.
+        """
+        flipped = update_stat_arrays(
+            self.stats, self.alive.astype(bool), will_be_alive)
+        self.alive[...] = will_be_alive
+        return np.argwhere(flipped)
+
+
+class GameOfLifeParallelEngine(GameOfLifeNumpyEngine):
+    """
+    Step the board in row stripes, one per worker process.
+    Alive state (double buffered) and stat arrays live in shared memory, so
+    workers step their stripe in place and only read one halo row above and
+    below it from their neighbors' stripes. Only flipped coords are sent back.
+
+    Call 'close' (or drop the engine) to stop the workers and free the
+    shared memory. The infinite topology is not supported, since the shared
+    arrays cannot grow.
+    """
+    TOPOLOGIES = ('bounded', 'torus', 'klein bottle')
+
+    def __init__(self, board, live_cell_coords, workers=None):
+        if np is None:
+            raise ImportError('the parallel engine requires numpy')
+        GameOfLifeEngine.__init__(self, board, live_cell_coords)
+        shape = (board.rows, board.cols)
+        self.workers = workers or os.cpu_count() or 1
+        self.current_buffer = 0
+
+        self._alive_memory = shared_memory.SharedMemory(
+            create=True, size=2*board.rows*board.cols)
+        self._stats_memory = shared_memory.SharedMemory(
+            create=True,
+            size=8*len(GameOfLifeCell.STAT_KEYS)*board.rows*board.cols)
+        self._alive_buffers = np.ndarray(
+            (2,) + shape, dtype=np.uint8, buffer=self._alive_memory.buf)
+        self._alive_buffers[...] = 0
+        set_live_cells(self._alive_buffers[0], live_cell_coords)
+        stat_arrays = np.ndarray(
+            (len(GameOfLifeCell.STAT_KEYS),) + shape, dtype=np.int64,
+            buffer=self._stats_memory.buf)
+        stat_arrays[...] = 0
+        self.stats = dict(zip(GameOfLifeCell.STAT_KEYS, stat_arrays))
+        # the numpy engine's attributes, for the methods inherited from it;
+        # boards are never infinite, so there is no universe
+        self._padded = np.zeros((board.rows+2, board.cols+2), dtype=np.uint8)
+        self.universe = None
+        self.window_origin = (0, 0)
+
+        row_stripes = np.array_split(
+            np.arange(board.rows), min(self.workers, board.rows))
+        self.stripes = [(int(stripe[0]), int(stripe[-1])+1)
+                        for stripe in row_stripes]
+        self._pool = ProcessPoolExecutor(
+            max_workers=len(self.stripes), initializer=_attach_worker_arrays,
+            initargs=(self._alive_memory.name, self._stats_memory.name,
+                      shape, board.rule, board.topology))
+        self._finalizer = weakref.finalize(
+            self, _release_parallel_resources, self._pool,
+            [self._alive_memory, self._stats_memory])
+
+    @property
+    def alive(self):
+        return self._alive_buffers[self.current_buffer]
+
+    def advance_one_generation(self):
+        futures = [
+            self._pool.submit(_step_stripe, self.current_buffer, start, stop)
+            for start, stop in self.stripes
+        ]
+        flipped_coords = [future.result() for future in futures]
+        self.current_buffer = 1 - self.current_buffer
+        return np.concatenate(flipped_coords)
+
+    def close(self):
+        """
+        Stop the worker processes and free the shared memory.
+        The engine cannot be used afterwards.
+        """
+        self._alive_buffers = None
+        self.stats = None
+        self._finalizer()
+
+
+# arrays attached to shared memory in each parallel engine worker process
+_worker_arrays = {}
+
+
+def _attach_worker_arrays(alive_memory_name, stats_memory_name, shape,
+                          rule, topology):
+    """
+    Attach a parallel engine worker process to the engine's shared memory
+    and give it the board's rule and topology.
+    """
+    _worker_arrays['rule'] = rule
+    _worker_arrays['topology'] = topology
+    alive_memory = shared_memory.SharedMemory(name=alive_memory_name)
+    stats_memory = shared_memory.SharedMemory(name=stats_memory_name)
+    _worker_arrays['memory'] = (alive_memory, stats_memory)
+    _worker_arrays['alive'] = np.ndarray(
+        (2,) + shape, dtype=np.uint8, buffer=alive_memory.buf)
+    stat_arrays = np.ndarray(
+        (len(GameOfLifeCell.STAT_KEYS),) + shape, dtype=np.int64,
+        buffer=stats_memory.buf)
+    _worker_arrays['stats'] = dict(zip(GameOfLifeCell.STAT_KEYS, stat_arrays))
+
+
+def _step_stripe(current_buffer, start, stop):
+    """
+    Step rows [start, stop) from the current alive buffer into the other
+    one and update their stats.
+    Return an array of (row, col) coords of cells that flipped.
+    """
+    alive = _worker_arrays['alive'][current_buffer]
+    next_alive = _worker_arrays['alive'][1-current_buffer]
+    rule = _worker_arrays['rule']
+    rows, cols = alive.shape
+
+    # stripe plus one halo row from each neighboring stripe (or wrapped
+    # around the board's edges)
+    padded = np.zeros((stop-start+2, cols+2), dtype=np.uint8)
+    _worker_arrays['topology'].pad(alive, padded, start, stop)
+
+    next_states, changed = step_cells(
+        alive[start:stop], get_live(padded, rule),
+        {key: stat_array[start:stop]
+         for key, stat_array in _worker_arrays['stats'].items()},
+        rule)
+    next_alive[start:stop] = next_states
+    return np.argwhere(changed) + (start, 0)
+
+
+def _release_parallel_resources(pool, shared_memories):
+    """
+    Shut down a parallel engine's workers and unlink its shared memory.
+    """
+    pool.shutdown()
+    for memory in shared_memories:
+        try:
+            memory.close()
+        except BufferError:  # arrays still exported; freed with them
+            pass
+        memory.unlink()
+
+
+def set_live_cells(alive, live_cell_coords):
+    """
+    Set the cells at the given coords alive in a uint8 array.
+    Coords can be any iterable of (row, col) pairs, or an (n, 2) int array,
+    which is much faster for large boards.
+    """
+    if not isinstance(live_cell_coords, np.ndarray):
+        live_cell_coords = np.array(list(live_cell_coords), dtype=np.intp)
+    live_cell_coords = live_cell_coords.reshape(-1, 2)
+    alive[live_cell_coords[:, 0], live_cell_coords[:, 1]] = 1
+
+
+def count_live_neighbors(padded):
+    """
+    Return the number of live neighbors of each cell of a uint8 array of
+    cells surrounded by a one cell border (e.g. zeros or halo cells).
+    Leading axes count a stack of boards at once.
+    """
+    rows, cols = padded.shape[-2]-2, padded.shape[-1]-2
+    counts = np.zeros(padded.shape[:-2] + (rows, cols), dtype=np.uint8)
+    for d_row in range(3):
+        for d_col in range(3):
+            if d_row == 1 and d_col == 1:
+                continue
+            counts += padded[..., d_row:d_row+rows, d_col:d_col+cols]
+    return counts
+
+
+def get_live(states, rule):
+    """
+    Return an array that is 1 (or True) where cells in a uint8 array of
+    cell states are alive.
+    """
+    if rule.num_states == 2:
+        return states
+    return states == 1
+
+
+def is_count_in(num_live_neighbors, counts):
+    """
+    Return a bool array of which cells' number of live neighbors is one of
+    the given counts, or None if there are no counts.
+    """
+    if not counts:
+        return None
+    if len(counts) > 2:
+        count_table = np.zeros(9, dtype=bool)
+        count_table[list(counts)] = True
+        return count_table.take(num_live_neighbors)
+    is_in = None
+    for count in sorted(counts):
+        is_count = num_live_neighbors == count
+        is_in = is_count if is_in is None else is_in | is_count
+    return is_in
+
+
+def get_next_alive(alive, num_live_neighbors, rule=CONWAY):
+    """
+    Return a bool array of which cells of a two-state rule are alive next
+    generation.
+    The rule's table is compiled to a few count tests: counts that give
+    life to any cell are tested once (3 for B3/S23), and the others only
+    for live (survival) or dead (birth) cells, so B3/S23 costs three
+    comparisons.
+    """
+    next_alive = is_count_in(num_live_neighbors, rule.always_counts)
+    survives = is_count_in(num_live_neighbors, rule.survival_only_counts)
+    is_born = is_count_in(num_live_neighbors, rule.birth_only_counts)
+    for term in (None if survives is None else alive & survives,
+                 None if is_born is None else ~alive & is_born):
+        if term is None:
+            continue
+        if next_alive is None:
+            next_alive = term
+        else:
+            next_alive |= term
+    if next_alive is None:
+        return np.zeros(alive.shape, dtype=bool)
+    return next_alive
+
+
+def get_next_states(states, num_live_neighbors, rule):
+    """
+    Return a uint8 array of each cell's state next generation, looked up
+    in the rule's table by state and number of live neighbors.
+    """
+    return rule.table[states, num_live_neighbors]
+
+
+def get_next_cell_states(states, num_live_neighbors, rule):
+    """
+    Return each cell's state next generation: a bool array of which cells
+    are alive for two-state rules, else a uint8 array of states.
+    """
+    if rule.num_states == 2:
+        return get_next_alive(states.astype(bool), num_live_neighbors, rule)
+    return get_next_states(states, num_live_neighbors, rule)
+
+
+def step_cells(states, padded, stats, rule):
+    """
+    Compute the next generation of a uint8 array of cell states and update
+    their stat arrays. Padded holds the cells' live cells (see 'get_live')
+    surrounded by a one cell border, for counting neighbors.
+    Return (next states, bool array of which cells changed state).
+    """
+    num_live_neighbors = count_live_neighbors(padded)
+    if rule.num_states == 2:
+        alive = states.astype(bool)
+        will_be_alive = get_next_alive(alive, num_live_neighbors, rule)
+        return will_be_alive, update_stat_arrays(stats, alive, will_be_alive)
+    next_states = get_next_states(states, num_live_neighbors, rule)
+    update_stat_arrays(stats, states == 1, next_states == 1)
+    return next_states, next_states != states
+
+
+def update_stat_arrays(stats, alive, will_be_alive):
+    """
+    Increment the stat arrays for the current generation (a bool array) and
+    record flips to the next generation.
+    Return a bool array of which cells flipped.
+    """
+    dead = ~alive
+
+    # increment counters for current gen
+    stats['gens_alive'] += alive
+    stats['current_living_streak'] += alive
+    np.maximum(stats['longest_living_streak'],
+               stats['current_living_streak'],
+               out=stats['longest_living_streak'])
+    stats['gens_dead'] += dead
+    stats['current_death_streak'] += dead
+    np.maximum(stats['longest_death_streak'],
+               stats['current_death_streak'],
+               out=stats['longest_death_streak'])
+
+    # record flips to next gen
+    flipped = will_be_alive != alive
+    stats['current_living_streak'][flipped] = 0
+    stats['current_death_streak'][flipped] = 0
+    stats['births'] += flipped & will_be_alive
+    stats['deaths'] += flipped & alive
+    return flipped
+
+
+class GameOfLifeHashLifeEngine(GameOfLifeNumpyEngine):
+    """
+    Step an unbounded GameOfLifeHashLife universe and show the board as a
+    rows x cols window onto it, with top left cell at (0, 0).
+    Only runs the infinite topology: patterns that leave the window keep
+    evolving and may come back.
+    The window is materialized into the numpy engine's arrays, so cells,
+    display and stats work as with the numpy engine.
+    """
+    SUPPORTS_MULTI_STATE_RULES = False
+    TOPOLOGIES = ('infinite',)
+    DEFAULT_TOPOLOGY = 'infinite'
+
+    def __init__(self, board, live_cell_coords, max_cache_size=None):
+        if max_cache_size is None:
+            max_cache_size = GameOfLifeHashLife.DEFAULT_MAX_CACHE_SIZE
+        self.max_cache_size = max_cache_size
+        super().__init__(board, live_cell_coords)
+        self._materialized = self.alive.copy()
+
+    def init_universe(self):
+        """
+        Make the GameOfLifeHashLife universe the board is a window onto.
+        """
+        self.universe = GameOfLifeHashLife(
+            map(tuple, np.argwhere(self.alive).tolist()),
+            max_cache_size=self.max_cache_size, rule=self.board.rule)
+
+    def get_outside_num_live_neighbors(self, row, col):
+        rows, cols = self.alive.shape
+        return sum(
+            self.universe.get_cell(row+d_row, col+d_col)
+            for d_row, d_col in NEIGHBOR_OFFSETS
+            if not (0 <= row+d_row < rows and 0 <= col+d_col < cols))
+
+    def get_num_live_neighbors_grid(self):
+        # the universe is not an array, so count as engines without one do
+        return GameOfLifeEngine.get_num_live_neighbors_grid(self)
+
+    def sync_universe(self):
+        """
+        Copy cells changed through the board (e.g. by clicks in the GUI) into
+        the universe.
+        """
+        for row, col in np.argwhere(self.alive != self._materialized).tolist():
+            self.universe.set_cell(row, col, bool(self.alive[row, col]))
+
+    def materialize_window(self):
+        """
+        Return the board's window of the universe as a bool array.
+        """
+        window = np.zeros(self.alive.shape, dtype=bool)
+        live_cell_coords = self.universe.get_live_cell_coords(
+            0, 0, *self.alive.shape)
+        if live_cell_coords:
+            window[tuple(np.array(live_cell_coords).T)] = True
+        return window
+
+    def advance_one_generation(self):
+        self.sync_universe()
+        self.universe.advance(0)
+        cells_to_flip = self.set_next_generation(self.materialize_window())
+        self._materialized[...] = self.alive
+        return cells_to_flip
+
+    def advance_power_of_two_generations(self, k):
+        """
+        Advance the universe 2^k generations in one step.
+        Cell stat counters are not updated for the skipped generations.
+        Return an (n, 2) array of (row, col) coords of window cells that
+        flipped.
+        """
+        self.sync_universe()
+        self.universe.advance(k)
+        window = self.materialize_window()
+        cells_to_flip = np.argwhere(window != self.alive)
+        self.alive[...] = window
+        self._materialized[...] = self.alive
+        return cells_to_flip
+
+
+ENGINES = {
+    'python': GameOfLifePythonEngine,
+    'active': GameOfLifeActiveEngine,
+    'numpy': GameOfLifeNumpyEngine,
+    'hashlife': GameOfLifeHashLifeEngine,
+    'parallel': GameOfLifeParallelEngine
+}
@@ -0,0 +1,475 @@
+#!/usr/bin/env python
+"""
+Run ensembles of random soups and aggregate their outcomes.
+
+Each member of an ensemble is a board of random cells at a given density,
+seeded from the ensemble's seed and the member's index alone, so member i
+is the same board however many workers or batches the ensemble is split
+into. Members run until they stop changing (or enter a cycle, for
+two-state rules) or reach max_generations, and their lifetimes, final
+populations and game stats (see GameOfLifeBoard.calculate_game_stats) are
+summed up in streaming histograms.
+
+Members are split into batches run across a process pool. With the numpy
+engine, small finite boards of a batch are stacked into one
+(members, rows, cols) array and stepped together; members drop out of the
+stack as they finish. Example:
+    python -m game_of_life_ensemble --rows 32 --cols 32 --density 0.3 \
+        --members 1000 --max-generations 2000
+"""
+import argparse
+import collections
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from game_of_life_board import GameOfLifeBoard
+from game_of_life_cell import GameOfLifeCell
+from game_of_life_cycle import GameOfLifeCycleDetector
+from game_of_life_driver import (GameOfLifeSimulationDriver,
+                                 get_stop_reason)
+from game_of_life_engine import ENGINES, get_live, step_cells
+from game_of_life_rules import get_rule
+from game_of_life_topology import get_topology
+
+# stats of each board's stat categories that are aggregated
+SUMMARY_STATS = ['max', 'min', 'median', 'mean', 'stdev']
+# histogram bin widths of per-board values; others are binned by 1
+BIN_WIDTHS = {'median': 0.5, 'mean': 0.01, 'stdev': 0.01}
+# boards up to this many cells are stepped in stacks
+MAX_BATCH_BOARD_CELLS = 128*128
+# cells stepped at once in a stack of boards
+BATCH_CELLS = 2**20
+
+
+class GameOfLifeHistogram(object):
+    """
+    Streaming summary of a sequence of numbers: counts of values in bins of
+    'bin_width', plus their exact count, min, max, sum and sum of squares.
+    Histograms of parts of a sequence can be merged.
+    """
+
+    def __init__(self, bin_width=1):
+        self.bin_width = bin_width
+        # bin index -> number of values, bin i holds values nearest
+        # i*bin_width
+        self.bins = collections.Counter()
+        self.count = 0
+        self.total = 0
+        self.total_of_squares = 0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        """
+        Add a value to the histogram.
+        """
+        self.bins[round(value / self.bin_width)] += 1
+        self.count += 1
+        self.total += value
+        self.total_of_squares += value*value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        """
+        Add the values of another histogram with the same bin width.
+        """
+        if other.bin_width != self.bin_width:
+            raise ValueError('cannot merge histograms of different bin widths')
+        self.bins.update(other.bins)
+        self.count += other.count
+        self.total += other.total
+        self.total_of_squares += other.total_of_squares
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def get_stats(self):
+        """
+        Return a JSON-serializable dict of the count, min, max, mean and
+        stdev of the values, their median (to the nearest bin) and the bins
+        as a dict of bin value -> count.
+        """
+        stats = {'count': self.count, 'min': self.min, 'max': self.max,
+                 'mean': None, 'stdev': None, 'median': None, 'bins': {}}
+        if not self.count:
+            return stats
+        mean = self.total / self.count
+        stats['mean'] = mean
+        stats['stdev'] = math.sqrt(max(
+            self.total_of_squares / self.count - mean*mean, 0))
+        bin_indexes = sorted(self.bins)
+        middle = [(self.count-1) // 2, self.count // 2]
+        medians = []
+        seen = 0
+        for bin_index in bin_indexes:
+            seen += self.bins[bin_index]
+            while middle and middle[0] < seen:
+                middle.pop(0)
+                medians.append(bin_index*self.bin_width)
+        stats['median'] = sum(medians) / 2
+        stats['bins'] = {
+            self.format_bin(bin_index): self.bins[bin_index]
+            for bin_index in bin_indexes}
+        return stats
+
+    def format_bin(self, bin_index):
+        """
+        Return the string key of a bin: its value, without float noise.
+        """
+        value = bin_index*self.bin_width
+        if isinstance(value, float):
+            value = round(value, 10)
+        return str(value)
+
+
+class GameOfLifeEnsemble(object):
+    """
+    An ensemble of seeded random soups on rows x cols boards.
+    See the module docstring.
+    """
+
+    def __init__(self, rows, cols, density, members, max_generations=1000,
+                 seed=0, engine='numpy', rule='B3/S23', topology=None,
+                 workers=None, batch_size=None):
+        """
+        :param density: chance of each cell being alive at first.
+        :param members: number of boards in the ensemble.
+        :param max_generations: generation limit of each board.
+        :param seed: seed the members' boards are derived from.
+        :param engine: engine that steps boards that are not stacked (see
+        ENGINES in game_of_life_engine); with 'numpy', small boards on
+        finite topologies are stacked.
+        :param rule: the rule cells follow (see game_of_life_rules). Cycles
+        are detected for two-state rules.
+        :param topology: how the boards' edges connect; None is the engine's
+        default (see game_of_life_topology).
+        :param workers: number of worker processes; None is one per CPU, and
+        1 runs every batch in this process.
+        :param batch_size: members per batch; None picks it from the board
+        size and number of workers.
+        """
+        if engine not in ENGINES:
+            raise ValueError('unknown engine: {}'.format(engine))
+        if not 0 <= density <= 1:
+            raise ValueError('density must be between 0 and 1')
+        self.rows = rows
+        self.cols = cols
+        self.density = density
+        self.members = members
+        self.max_generations = max_generations
+        self.seed = seed
+        self.engine = engine
+        self.rule = get_rule(rule)
+        self.topology = topology or ENGINES[engine].DEFAULT_TOPOLOGY
+        is_infinite = get_topology(self.topology, rows, cols).IS_INFINITE
+        self.workers = workers or os.cpu_count() or 1
+        self.stacks_boards = (engine == 'numpy' and not is_infinite and
+                              rows*cols <= MAX_BATCH_BOARD_CELLS)
+        if batch_size is None:
+            batch_size = math.ceil(members / self.workers)
+            if self.stacks_boards:
+                batch_size = min(batch_size, BATCH_CELLS // (rows*cols))
+        self.batch_size = max(batch_size, 1)
+
+    def get_settings(self):
+        """
+        Return the dict of settings batches are run with.
+        """
+        return {
+            'rows': self.rows,
+            'cols': self.cols,
+            'density': self.density,
+            'max_generations': self.max_generations,
+            'seed': self.seed,
+            'engine': self.engine,
+            'rule': self.rule,
+            'topology': self.topology,
+            'stacks_boards': self.stacks_boards
+        }
+
+    def get_batches(self):
+        """
+        Return a list of ranges of member indexes, one per batch.
+        """
+        return [range(start, min(start+self.batch_size, self.members))
+                for start in range(0, self.members, self.batch_size)]
+
+    def iter_results(self):
+        """
+        Run the ensemble and yield each member's result (see
+        'get_member_result') in member order.
+        """
+        settings = self.get_settings()
+        batches = self.get_batches()
+        if self.workers == 1 or len(batches) == 1:
+            for batch in batches:
+                yield from run_batch(settings, batch)
+            return
+        with ProcessPoolExecutor(
+                max_workers=min(self.workers, len(batches))) as pool:
+            for results in pool.map(run_batch, [settings]*len(batches),
+                                    batches):
+                yield from results
+
+    def run(self):
+        """
+        Run the ensemble.
+        Return a JSON-serializable dict with the settings, the number of
+        members that stopped for each reason, and the stats (see
+        GameOfLifeHistogram.get_stats) of each member value: 'lifetime',
+        'population', 'period' (of members that entered a cycle) and
+        '<stat category> <summary stat>', e.g. 'births mean'.
+        """
+        histograms = {}
+        stop_reasons = collections.Counter()
+        for result in self.iter_results():
+            add_member_result(histograms, result)
+            stop_reasons[result['stop_reason']] += 1
+        return {
+            'rows': self.rows,
+            'cols': self.cols,
+            'density': self.density,
+            'members': self.members,
+            'max_generations': self.max_generations,
+            'seed': self.seed,
+            'engine': self.engine,
+            'rule': self.rule.rulestring,
+            'topology': self.topology,
+            'stop_reasons': dict(stop_reasons),
+            'histograms': {
+                name: histograms[name].get_stats()
+                for name in sorted(histograms)}
+        }
+
+
+def add_member_result(histograms, result):
+    """
+    Add a member's values to a dict of value name -> GameOfLifeHistogram,
+    adding histograms for new names.
+    """
+    values = [('lifetime', result['lifetime']),
+              ('population', result['population'])]
+    if result['period'] is not None:
+        values.append(('period', result['period']))
+    for category, stats in result['stats'].items():
+        for stat in SUMMARY_STATS:
+            values.append(('{} {}'.format(category, stat), stats[stat]))
+    for name, value in values:
+        if name not in histograms:
+            histograms[name] = GameOfLifeHistogram(
+                BIN_WIDTHS.get(name.rpartition(' ')[2], 1))
+        histograms[name].add(value)
+
+
+def get_soup(rows, cols, density, seed, member):
+    """
+    Return a (rows, cols) uint8 array of the member's random cells, 1 where
+    alive. Depends only on the seed and member index.
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(
+        seed, spawn_key=(member,)))
+    return (rng.random((rows, cols)) < density).astype(np.uint8)
+
+
+def get_member_result(member, board, stop_reason):
+    """
+    Return a member's result as a JSON-serializable dict: its index, the
+    generation it stopped at and why (see GameOfLifeSimulationDriver), its
+    cycle's period and onset (None if not detected), its lifetime (the
+    generation it reached its final state or cycle), final population and
+    game stats.
+    """
+    period = onset = None
+    if board.cycle_detector is not None and board.cycle_detector.period:
+        period = board.cycle_detector.period
+        onset = board.cycle_detector.onset
+    if onset is not None:
+        lifetime = onset
+    elif stop_reason in ('stable', 'cycle'):
+        lifetime = board.generation - 1
+    else:
+        lifetime = board.generation
+    board.calculate_game_stats()
+    return {
+        'member': member,
+        'generations': board.generation,
+        'stop_reason': stop_reason,
+        'period': period,
+        'onset': onset,
+        'lifetime': lifetime,
+        'population': len(board.get_live_cell_coords()),
+        'stats': {
+            category: {stat: board.stats[category].stats[stat]
+                       for stat in SUMMARY_STATS}
+            for category in GameOfLifeBoard.STAT_CATEGORIES.values()
+        }
+    }
+
+
+def run_batch(settings, members):
+    """
+    Run a batch of members of an ensemble with the given settings (see
+    GameOfLifeEnsemble.get_settings).
+    Return a list of the members' results, in order.
+    """
+    if settings['stacks_boards']:
+        return run_stacked_batch(settings, members)
+    results = []
+    for member in members:
+        board = GameOfLifeBoard(
+            settings['rows'], settings['cols'],
+            np.argwhere(get_soup(settings['rows'], settings['cols'],
+                                 settings['density'], settings['seed'],
+                                 member)),
+            engine=settings['engine'],
+            detect_cycles=settings['rule'].num_states == 2,
+            rule=settings['rule'], topology=settings['topology'])
+        stop_reason = GameOfLifeSimulationDriver(
+            board, max_generations=settings['max_generations']).run()[
+            'stop_reason']
+        results.append(get_member_result(member, board, stop_reason))
+        close = getattr(board.engine, 'close', None)
+        if close is not None:
+            close()
+    return results
+
+
+def run_stacked_batch(settings, members):
+    """
+    Run a batch of members stacked into one (members, rows, cols) array,
+    stepped together like the numpy engine steps one board. Finished
+    members are taken out of the stack.
+    Return a list of the members' results, in order.
+    """
+    rows, cols = settings['rows'], settings['cols']
+    rule = settings['rule']
+    topology = get_topology(settings['topology'], rows, cols)
+    members = np.array(members, dtype=np.intp)
+    states = np.stack([
+        get_soup(rows, cols, settings['density'], settings['seed'], member)
+        for member in members])
+    stats = {key: np.zeros(states.shape, dtype=np.int64)
+             for key in GameOfLifeCell.STAT_KEYS}
+    padded = np.zeros((len(members), rows+2, cols+2), dtype=np.uint8)
+    detectors = None
+    if rule.num_states == 2:
+        detectors = []
+        for member_states in states:
+            detector = GameOfLifeCycleDetector(rows, cols)
+            detector.reset(np.argwhere(member_states), 0)
+            detectors.append(detector)
+        cell_keys = detectors[0].get_cell_keys(
+            np.argwhere(np.ones((rows, cols), dtype=bool))).reshape(rows, cols)
+
+    results = {}
+    generation = 0
+    while len(members):
+        if generation >= settings['max_generations']:
+            for index in range(len(members)):
+                results[int(members[index])] = get_stacked_member_result(
+                    settings, members[index], states[index],
+                    {key: stat[index] for key, stat in stats.items()},
+                    generation, 'max_generations',
+                    None if detectors is None else detectors[index])
+            break
+        next_states, changed = step_cells(
+            states, get_live(topology.pad(states, padded), rule), stats, rule)
+        states = next_states.view(np.uint8)
+        generation += 1
+
+        is_finished = ~changed.any(axis=(1, 2))
+        if detectors is not None:
+            flipped_hashes = np.bitwise_xor.reduce(
+                np.where(changed, cell_keys, np.uint64(0)), axis=(1, 2))
+            for index, detector in enumerate(detectors):
+                if detector.update_hash(int(flipped_hashes[index]),
+                                        generation):
+                    is_finished[index] = True
+        if not is_finished.any():
+            continue
+        for index in np.flatnonzero(is_finished):
+            results[int(members[index])] = get_stacked_member_result(
+                settings, members[index], states[index],
+                {key: stat[index] for key, stat in stats.items()},
+                generation, None,
+                None if detectors is None else detectors[index])
+        is_running = ~is_finished
+        members = members[is_running]
+        states = states[is_running]
+        stats = {key: stat[is_running] for key, stat in stats.items()}
+        padded = padded[is_running]
+        if detectors is not None:
+            detectors = [detector for detector, running
+                         in zip(detectors, is_running) if running]
+    return [results[member] for member in sorted(results)]
+
+
+def get_stacked_member_result(settings, member, states, stats, generation,
+                              stop_reason, detector):
+    """
+    Return the result of a member of a stack (see 'get_member_result'),
+    from its cell states and stat arrays. A stop_reason of None means the
+    member stopped changing, as a still life or in a cycle.
+    """
+    board = GameOfLifeBoard(
+        settings['rows'], settings['cols'], engine='numpy',
+        rule=settings['rule'], topology=settings['topology'])
+    board.engine.alive[...] = states
+    for key, values in stats.items():
+        board.engine.set_stat_array(key, values)
+    board.generation = generation
+    board.cycle_detector = detector
+    if stop_reason is None:
+        stop_reason = get_stop_reason(board)
+    return get_member_result(int(member), board, stop_reason)
+
+
+def get_arg_parser():
+    """
+    Return the argument parser for the ensemble CLI.
+    """
+    parser = argparse.ArgumentParser(
+        description='Run an ensemble of random Game of Life soups and print '
+                    'aggregated stats as JSON.')
+    parser.add_argument('--rows', type=int, required=True)
+    parser.add_argument('--cols', type=int, required=True)
+    parser.add_argument('--density', type=float, default=0.3)
+    parser.add_argument('--members', type=int, default=100)
+    parser.add_argument('--max-generations', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--engine', choices=list(ENGINES), default='numpy')
+    parser.add_argument('--rule', default='B3/S23')
+    parser.add_argument('--topology')
+    parser.add_argument('--workers', type=int,
+                        help='worker processes (default: one per CPU)')
+    parser.add_argument('--batch-size', type=int)
+    return parser
+
+
+def main(argv=None):
+    """
+    Run the ensemble CLI and print the aggregated stats as JSON.
+    """
+    parser = get_arg_parser()
+    args = parser.parse_args(argv)
+    try:
+        ensemble = GameOfLifeEnsemble(
+            args.rows, args.cols, args.density, args.members,
+            max_generations=args.max_generations, seed=args.seed,
+            engine=args.engine, rule=args.rule, topology=args.topology,
+            workers=args.workers, batch_size=args.batch_size)
+    except ValueError as error:
+        parser.error(str(error))
+    json.dump(ensemble.run(), sys.stdout, indent=2)
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
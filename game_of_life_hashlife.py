@@ -0,0 +1,348 @@
+from collections import OrderedDict
+
+from game_of_life_rules import CONWAY
+
+
+class GameOfLifeHashLifeNode(object):
+    """
+    A square block of 2^level by 2^level cells in a HashLife universe.
+    Nodes are hash-consed by GameOfLifeHashLife, so equal blocks are the same
+    object and can be compared and hashed by identity.
+    Level 0 nodes are single cells.
+    """
+    __slots__ = ('level', 'nw', 'ne', 'sw', 'se', 'population')
+
+    def __init__(self, level, nw, ne, sw, se, population):
+        self.level = level
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.population = population
+
+
+class GameOfLifeHashLife(object):
+    """
+    Represent an unbounded Game of Life universe with the HashLife algorithm.
+
+    The universe is a quadtree of hash-consed GameOfLifeHashLifeNodes whose
+    future centers are memoized, so repetitive patterns can be advanced 2^k
+    generations in one call. The root is always centered on (0, 0); coords
+    are (row, col) and may be negative.
+
+    Both the node table and the result cache are bounded by max_cache_size
+    between calls to 'advance'. Either may grow past it during one call, so
+    results needed again later in the same step are never evicted; after
+    the call, if either overflows, the least recently used results are
+    dropped and the node table is rebuilt (see '_collect_garbage').
+
+    Any two-state GameOfLifeRule can be used, except rules with birth on 0
+    neighbors, which would fill the unbounded universe in one generation.
+    """
+    DEFAULT_MAX_CACHE_SIZE = 2**20
+
+    def __init__(self, live_cell_coords=None,
+                 max_cache_size=DEFAULT_MAX_CACHE_SIZE, rule=CONWAY):
+        """
+        Init a universe with the given live cells.
+        Raise ValueError if the rule is not supported.
+        """
+        if rule.num_states > 2 or 0 in rule.birth_counts:
+            raise ValueError('HashLife does not support rule {}'.format(rule))
+        if live_cell_coords is None:
+            live_cell_coords = set([])
+        self.rule = rule
+        self.max_cache_size = max_cache_size
+        self.generation = 0
+        self.dead_cell = GameOfLifeHashLifeNode(0, None, None, None, None, 0)
+        self.live_cell = GameOfLifeHashLifeNode(0, None, None, None, None, 1)
+        self._nodes = {}
+        self._results = OrderedDict()
+        self._empty = [self.dead_cell]
+
+        live_cell_coords = set(live_cell_coords)
+        level = 3
+        while any(not -self._get_half_size(level) <= coord <
+                  self._get_half_size(level)
+                  for cell in live_cell_coords for coord in cell):
+            level += 1
+        self.root = self._build(
+            level, -self._get_half_size(level), -self._get_half_size(level),
+            live_cell_coords)
+
+    @property
+    def population(self):
+        """
+        Return the number of live cells in the universe.
+        """
+        return self.root.population
+
+    @staticmethod
+    def _get_half_size(level):
+        """
+        Return half the side length of a node of the given level, which is
+        also the distance from the root's center to its edges.
+        """
+        return 1 << (level-1)
+
+    def _join(self, nw, ne, sw, se):
+        """
+        Return the canonical node with the given quadrants.
+        """
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            node = GameOfLifeHashLifeNode(
+                nw.level+1, nw, ne, sw, se,
+                nw.population + ne.population + sw.population + se.population)
+            self._nodes[key] = node
+        return node
+
+    def _get_empty(self, level):
+        """
+        Return the canonical empty node of the given level.
+        """
+        while len(self._empty) <= level:
+            empty = self._empty[-1]
+            self._empty.append(self._join(empty, empty, empty, empty))
+        return self._empty[level]
+
+    def _build(self, level, top, left, live_cell_coords):
+        """
+        Return a node of the given level whose top left cell is at
+        (top, left), with the given live cells.
+        """
+        if not live_cell_coords:
+            return self._get_empty(level)
+        if level == 0:
+            return self.live_cell
+        half = 1 << (level-1)
+        quadrants = [set([]), set([]), set([]), set([])]
+        for row, col in live_cell_coords:
+            quadrants[2*(row >= top+half) + (col >= left+half)].add((row, col))
+        return self._join(
+            self._build(level-1, top, left, quadrants[0]),
+            self._build(level-1, top, left+half, quadrants[1]),
+            self._build(level-1, top+half, left, quadrants[2]),
+            self._build(level-1, top+half, left+half, quadrants[3]))
+
+    def _expand(self, node):
+        """
+        Return a node one level up with the given node at its center.
+        """
+        empty = self._get_empty(node.level-1)
+        return self._join(
+            self._join(empty, empty, empty, node.nw),
+            self._join(empty, empty, node.ne, empty),
+            self._join(empty, node.sw, empty, empty),
+            self._join(node.se, empty, empty, empty))
+
+    def _is_padded(self, node):
+        """
+        Return True if all of the node's live cells are in its center
+        eighth, so it can be expanded once and stepped without losing cells.
+        """
+        return (node.level >= 3 and
+                node.nw.population == node.nw.se.se.population and
+                node.ne.population == node.ne.sw.sw.population and
+                node.sw.population == node.sw.ne.ne.population and
+                node.se.population == node.se.nw.nw.population)
+
+    def _get_center(self, node):
+        """
+        Return the node one level down at the center of the given node.
+        """
+        return self._join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def _step_level_2(self, node):
+        """
+        Return the center 2x2 node of a 4x4 node after one generation.
+        Each center cell's next state is looked up in the rule's
+        neighborhood table by the bitmask of its 3x3 neighborhood.
+        """
+        grid = [
+            [node.nw.nw, node.nw.ne, node.ne.nw, node.ne.ne],
+            [node.nw.sw, node.nw.se, node.ne.sw, node.ne.se],
+            [node.sw.nw, node.sw.ne, node.se.nw, node.se.ne],
+            [node.sw.sw, node.sw.se, node.se.sw, node.se.se]
+        ]
+        neighborhood_table = self.rule.neighborhood_table
+        next_cells = []
+        for row in (1, 2):
+            for col in (1, 2):
+                mask = 0
+                for d_row in (-1, 0, 1):
+                    for d_col in (-1, 0, 1):
+                        if grid[row+d_row][col+d_col].population:
+                            mask |= 1 << ((d_row+1)*3 + d_col+1)
+                next_cells.append(self.live_cell if neighborhood_table[mask]
+                                  else self.dead_cell)
+        return self._join(*next_cells)
+
+    def _step(self, node, j):
+        """
+        Return the node one level down at the center of the given node,
+        2^j generations in the future. Requires j <= node.level - 2.
+        """
+        if node.population == 0:
+            return self._get_empty(node.level-1)
+        key = (node, j)
+        result = self._results.get(key)
+        if result is not None:
+            self._results.move_to_end(key)
+            return result
+
+        if node.level == 2:
+            result = self._step_level_2(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            sub_nodes = [
+                nw,
+                self._join(nw.ne, ne.nw, nw.se, ne.sw),
+                ne,
+                self._join(nw.sw, nw.se, sw.nw, sw.ne),
+                self._join(nw.se, ne.sw, sw.ne, se.nw),
+                self._join(ne.sw, ne.se, se.nw, se.ne),
+                sw,
+                self._join(sw.ne, se.nw, sw.se, se.sw),
+                se
+            ]
+            if j == node.level - 2:
+                # full speed: two half steps of 2^(j-1) generations each
+                c = [self._step(sub_node, j-1) for sub_node in sub_nodes]
+                step_quadrant = lambda *quadrant: self._step(
+                    self._join(*quadrant), j-1)
+            else:
+                c = [self._get_center(sub_node) for sub_node in sub_nodes]
+                step_quadrant = lambda *quadrant: self._step(
+                    self._join(*quadrant), j)
+            result = self._join(
+                step_quadrant(c[0], c[1], c[3], c[4]),
+                step_quadrant(c[1], c[2], c[4], c[5]),
+                step_quadrant(c[3], c[4], c[6], c[7]),
+                step_quadrant(c[4], c[5], c[7], c[8]))
+
+        self._results[key] = result
+        return result
+
+    def advance(self, j=0):
+        """
+        Advance the universe 2^j generations.
+        """
+        root = self.root
+        while root.level < j + 2 or not self._is_padded(root):
+            root = self._expand(root)
+        self.root = self._step(self._expand(root), j)
+        self.generation += 1 << j
+        if (len(self._nodes) > self.max_cache_size or
+                len(self._results) > self.max_cache_size):
+            self._collect_garbage()
+
+    def _collect_garbage(self):
+        """
+        Rebuild the node table from the nodes reachable from the root and
+        from memoized results, most recently used first, until the table or
+        the kept results are a quarter of max_cache_size; older results are
+        dropped. Recent results are kept, so a small cache does not lose all
+        memoized work each time it fills up, and both have room to grow
+        before the next collection.
+        """
+        nodes = {}
+        stack = [self.root] + self._empty
+        results = reversed(self._results.items())
+        kept_results = []
+        while True:
+            while stack:
+                node = stack.pop()
+                if node.level == 0:
+                    continue
+                key = (node.nw, node.ne, node.sw, node.se)
+                if key not in nodes:
+                    nodes[key] = node
+                    stack.extend(key)
+            if (len(nodes) > self.max_cache_size // 4 or
+                    len(kept_results) >= self.max_cache_size // 4):
+                break
+            item = next(results, None)
+            if item is None:
+                break
+            kept_results.append(item)
+            stack.append(item[0][0])
+            stack.append(item[1])
+        self._results = OrderedDict(reversed(kept_results))
+        self._nodes = nodes
+
+    def get_cell(self, row, col):
+        """
+        Return True if the cell at (row, col) is alive, False otherwise.
+        """
+        node = self.root
+        half = self._get_half_size(node.level)
+        if not -half <= row < half or not -half <= col < half:
+            return False
+        top = left = -half
+        while node.level > 0 and node.population:
+            half = 1 << (node.level-1)
+            south, east = row >= top+half, col >= left+half
+            node = ((node.se if east else node.sw) if south
+                    else (node.ne if east else node.nw))
+            top += half*south
+            left += half*east
+        return node.population == 1
+
+    def set_cell(self, row, col, is_alive):
+        """
+        Set the cell at (row, col) alive or dead.
+        """
+        while not (-self._get_half_size(self.root.level) <= min(row, col) and
+                   max(row, col) < self._get_half_size(self.root.level)):
+            self.root = self._expand(self.root)
+        half = self._get_half_size(self.root.level)
+        self.root = self._set_cell(
+            self.root, -half, -half, row, col, is_alive)
+
+    def _set_cell(self, node, top, left, row, col, is_alive):
+        """
+        Return a copy of node (with top left cell at (top, left)) with the
+        cell at (row, col) set.
+        """
+        if node.level == 0:
+            return self.live_cell if is_alive else self.dead_cell
+        half = 1 << (node.level-1)
+        quadrants = [node.nw, node.ne, node.sw, node.se]
+        south, east = row >= top+half, col >= left+half
+        index = 2*south + east
+        quadrants[index] = self._set_cell(
+            quadrants[index], top+half*south, left+half*east,
+            row, col, is_alive)
+        return self._join(*quadrants)
+
+    def get_live_cell_coords(self, top=None, left=None, rows=None, cols=None):
+        """
+        Return a list of (row, col) coords of live cells.
+        If a window is given, only return live cells inside it, with coords
+        relative to the window's top left cell.
+        """
+        half = self._get_half_size(self.root.level)
+        origin_top, origin_left = top or 0, left or 0
+        if top is None:
+            top, left, rows, cols = -half, -half, 2*half, 2*half
+        live_cell_coords = []
+        stack = [(self.root, -half, -half)]
+        while stack:
+            node, node_top, node_left = stack.pop()
+            size = 1 << node.level
+            if (node.population == 0 or node_top >= top+rows or
+                    node_top+size <= top or node_left >= left+cols or
+                    node_left+size <= left):
+                continue
+            if node.level == 0:
+                live_cell_coords.append(
+                    (node_top-origin_top, node_left-origin_left))
+                continue
+            half = size >> 1
+            stack.append((node.nw, node_top, node_left))
+            stack.append((node.ne, node_top, node_left+half))
+            stack.append((node.sw, node_top+half, node_left))
+            stack.append((node.se, node_top+half, node_left+half))
+        return live_cell_coords
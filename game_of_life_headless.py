@@ -0,0 +1,378 @@
+#!/usr/bin/env python
+"""
+Run Game of Life simulations without a GUI.
+
+Never imports pygame, so it runs on machines without a display.
+Example:
+    python -m game_of_life_headless --rows 10 --cols 10 \
+        --live '0,1 1,2 2,0 2,1 2,2' --max-generations 50 --stats births
+"""
+import argparse
+import json
+import sys
+
+from game_of_life_bitboard import GameOfLifeBitBoard
+from game_of_life_board import GameOfLifeBoard
+from game_of_life_driver import GameOfLifeSimulationDriver
+from game_of_life_engine import ENGINES
+from game_of_life_patterns import place_coords, read_pattern
+from game_of_life_profiler import GameOfLifeProfiler
+from game_of_life_rules import get_rule
+from game_of_life_topology import TOPOLOGIES, split_rule_suffix
+
+
+def parse_live_cell_coords(live_cell_string, rows, cols):
+    """
+    Parse a string of live cell coords like '0,3 3,2' into a set of
+    (row, col) tuples. Raise ValueError for malformed or out of bounds
+    coords.
+    """
+    live_cell_coords = set([])
+    for live_cell in live_cell_string.split():
+        coords = live_cell.split(',')
+        if len(coords) != 2:
+            raise ValueError('bad live cell coords: {}'.format(live_cell))
+        row, col = int(coords[0]), int(coords[1])
+        if not 0 <= row < rows or not 0 <= col < cols:
+            raise ValueError('live cell out of bounds: {}'.format(live_cell))
+        live_cell_coords.add((row, col))
+    return live_cell_coords
+
+
+def run_simulation(rows, cols, live_cell_coords=None, max_generations=None,
+                   stat_categories=None, engine='python',
+                   streaming_stats=False, detect_cycles=False,
+                   fast_forward_cycles=False, max_seconds=None,
+                   snapshot_path=None, checkpoint_path=None,
+                   checkpoint_every=None, save_pattern_path=None,
+                   rule='B3/S23', topology=None, trace_path=None,
+                   time_series_path=None, bit_board=False):
+    """
+    Simulate a board until it stops changing, reaches max_generations or
+    runs for max_seconds of wall-clock time.
+    Cells follow the given rule (see game_of_life_rules) on a board of the
+    given topology (see game_of_life_topology; None is the engine's
+    default).
+    With snapshot_path, resume from that snapshot file instead (rows, cols,
+    live_cell_coords and rule are ignored, and topology defaults to the
+    snapshot's). With checkpoint_path, save snapshots
+    there every checkpoint_every generations and at the end; see
+    GameOfLifeSimulationDriver. With save_pattern_path, save the final
+    board there as an RLE pattern. With trace_path, profile the run and
+    write each generation's phase times and counters there as JSON lines
+    (see GameOfLifeProfiler). With time_series_path, record population
+    metrics every generation and save them there as CSV, or as NPY if the
+    path ends with '.npy' (see GameOfLifeTimeSeries).
+    With detect_cycles, also stop once the board repeats itself; with
+    fast_forward_cycles too, instead skip ahead to max_generations with
+    stats counted as if every generation was run.
+    With bit_board, simulate a GameOfLifeBitBoard instead of a
+    GameOfLifeBoard: a fast path for two-state rules that keeps no stats,
+    so the result's stats are None, engine is ignored, and streaming_stats,
+    detect_cycles, fast_forward_cycles, snapshot_path, checkpoint_path,
+    trace_path, time_series_path and the infinite topology raise
+    ValueError.
+
+    Return a JSON-serializable dict with the number of generations run,
+    why the simulation stopped, the final board, the detected cycle (if
+    any), the game stats for the selected stat categories (all
+    categories if stat_categories is None) and, with trace_path, the
+    profile summary.
+    """
+    if stat_categories is None:
+        stat_categories = list(GameOfLifeBoard.STAT_CATEGORIES.values())
+    for category in stat_categories:
+        if category not in GameOfLifeBoard.STAT_CATEGORIES.values():
+            raise ValueError('unknown stat category: {}'.format(category))
+
+    if bit_board:
+        unsupported = [
+            option for option, value in (
+                ('streaming_stats', streaming_stats),
+                ('detect_cycles', detect_cycles),
+                ('fast_forward_cycles', fast_forward_cycles),
+                ('snapshot_path', snapshot_path),
+                ('checkpoint_path', checkpoint_path),
+                ('trace_path', trace_path),
+                ('time_series_path', time_series_path))
+            if value]
+        if unsupported:
+            raise ValueError('bit boards do not support {}'.format(
+                ', '.join(unsupported)))
+        return run_bit_board_simulation(
+            rows, cols, live_cell_coords, max_generations=max_generations,
+            max_seconds=max_seconds, save_pattern_path=save_pattern_path,
+            rule=rule, topology=topology)
+
+    board_options = {
+        'engine': engine,
+        'streaming_stats': streaming_stats,
+        'detect_cycles': detect_cycles or fast_forward_cycles,
+        'topology': topology,
+        'record_time_series': time_series_path is not None
+    }
+    if snapshot_path is not None:
+        board = GameOfLifeBoard.load_snapshot(snapshot_path, **board_options)
+        rows, cols = board.rows, board.cols
+    else:
+        board = GameOfLifeBoard(rows, cols, live_cell_coords, rule=rule,
+                                **board_options)
+    profiler = None
+    if trace_path is not None:
+        profiler = GameOfLifeProfiler(trace_path=trace_path)
+    driver = GameOfLifeSimulationDriver(
+        board, max_generations=max_generations, max_seconds=max_seconds,
+        checkpoint_path=checkpoint_path, checkpoint_every=checkpoint_every,
+        profiler=profiler)
+    stop_reason = driver.run()['stop_reason']
+    if profiler is not None:
+        profiler.close()
+    cycle = None
+    if board.cycle_detector is not None and board.cycle_detector.period:
+        cycle = {'period': board.cycle_detector.period,
+                 'onset': board.cycle_detector.onset}
+        if fast_forward_cycles and max_generations is not None:
+            board.fast_forward_cycle(max_generations)
+
+    if save_pattern_path is not None:
+        board.save_pattern(save_pattern_path)
+    if time_series_path is not None:
+        board.time_series.save(time_series_path)
+    board.calculate_game_stats()
+    result = {
+        'rows': rows,
+        'cols': cols,
+        'rule': board.rule.rulestring,
+        'topology': board.topology.NAME,
+        'generations': board.generation,
+        'stop_reason': stop_reason,
+        'cycle': cycle,
+        'board': board_to_strings(board),
+        'live_cell_coords': sorted(
+            [row, col] for row in range(rows) for col in range(cols)
+            if board.board[row][col].is_alive),
+        'stats': {
+            category: {
+                stat: val for stat, val in board.stats[category].stats.items()
+                if stat != 'list'
+            }
+            for category in stat_categories
+        }
+    }
+    if profiler is not None:
+        result['profile'] = profiler.get_summary()
+    return result
+
+
+def run_bit_board_simulation(rows, cols, live_cell_coords=None,
+                             max_generations=None, max_seconds=None,
+                             save_pattern_path=None, rule='B3/S23',
+                             topology=None):
+    """
+    Simulate a GameOfLifeBitBoard until it stops changing, reaches
+    max_generations or runs for max_seconds of wall-clock time.
+    See 'run_simulation' with bit_board=True.
+    """
+    board = GameOfLifeBitBoard(rows, cols, live_cell_coords,
+                               rule=get_rule(rule),
+                               topology=topology or 'bounded')
+    driver = GameOfLifeSimulationDriver(
+        board, max_generations=max_generations, max_seconds=max_seconds)
+    stop_reason = driver.run()['stop_reason']
+    if save_pattern_path is not None:
+        board.save_pattern(save_pattern_path)
+    return {
+        'rows': rows,
+        'cols': cols,
+        'rule': board.rule.rulestring,
+        'topology': board.topology.NAME,
+        'generations': board.generation,
+        'stop_reason': stop_reason,
+        'cycle': None,
+        'board': board_to_strings(board),
+        'live_cell_coords': sorted(
+            [row, col] for row, col in board.get_live_cell_coords()),
+        'stats': None
+    }
+
+
+def board_to_strings(board, alive_char='O', dead_char='.'):
+    """
+    Return the board as a list of strings, one per row.
+    """
+    return [
+        ''.join(alive_char if cell.is_alive else dead_char
+                for cell in board.board[row])
+        for row in range(board.rows)
+    ]
+
+
+def get_arg_parser():
+    """
+    Return the argument parser for the headless CLI.
+    """
+    parser = argparse.ArgumentParser(
+        description='Run a Game of Life simulation without a GUI and print '
+                    'the result as JSON.')
+    parser.add_argument(
+        '--file',
+        help='JSON file with any of the keys rows, cols, live_cell_coords '
+             '(list of [row, col]), max_generations, max_seconds, stats, '
+             'engine, rule, topology, streaming_stats, detect_cycles, '
+             'fast_forward_cycles, snapshot, pattern, checkpoint, '
+             'checkpoint_every, save_pattern, trace, time_series and '
+             'bit_board. '
+             'Command line args override the file.')
+    parser.add_argument('--rows', type=int)
+    parser.add_argument('--cols', type=int)
+    parser.add_argument(
+        '--live', help='live cell coords, e.g. \'0,3 3,2\'')
+    parser.add_argument(
+        '--pattern', metavar='PATH',
+        help='RLE, Life 1.06 or plaintext pattern file of live cells, '
+             'centered on the board; rows and cols default to its size')
+    parser.add_argument('--max-generations', type=int)
+    parser.add_argument(
+        '--max-seconds', type=float,
+        help='wall-clock time budget for the simulation')
+    parser.add_argument(
+        '--snapshot', help='snapshot file to resume from, instead of '
+                           '--rows, --cols and --live')
+    parser.add_argument(
+        '--checkpoint', metavar='PATH',
+        help='snapshot file to save the board to at the end (and every '
+             '--checkpoint-every generations); may contain \'{generation}\'')
+    parser.add_argument('--checkpoint-every', type=int, metavar='N')
+    parser.add_argument(
+        '--save-pattern', metavar='PATH',
+        help='RLE pattern file to save the final board to')
+    parser.add_argument(
+        '--trace', metavar='PATH',
+        help='JSON-lines file to write each generation\'s phase times and '
+             'counters to; adds a profile summary to the result')
+    parser.add_argument(
+        '--time-series', metavar='PATH',
+        help='CSV file (or NPY file, if PATH ends with .npy) to save each '
+             'generation\'s population, births, deaths, bounding box and '
+             'center of mass to')
+    parser.add_argument(
+        '--stats', nargs='+', metavar='CATEGORY',
+        choices=list(GameOfLifeBoard.STAT_CATEGORIES.values()),
+        help='stat categories to report (default: all)')
+    parser.add_argument('--engine', choices=list(ENGINES))
+    parser.add_argument(
+        '--rule',
+        help='rulestring like B36/S23 or B2/S/C3, or a rule name like '
+             'highlife (default: the pattern\'s rule, or B3/S23)')
+    parser.add_argument(
+        '--topology', choices=list(TOPOLOGIES),
+        help='how the board\'s edges connect (default: the pattern\'s '
+             'topology, or the engine\'s default)')
+    parser.add_argument(
+        '--streaming-stats', action='store_true',
+        help='keep stats up to date every generation instead of '
+             'calculating them from every cell at the end')
+    parser.add_argument(
+        '--bit-board', action='store_true',
+        help='simulate a bit-packed board, which is faster but keeps no '
+             'stats; only two-state rules on bounded, torus and Klein '
+             'bottle boards, without --streaming-stats, --detect-cycles, '
+             '--fast-forward-cycles, --snapshot, --checkpoint, --trace or '
+             '--time-series')
+    parser.add_argument(
+        '--detect-cycles', action='store_true',
+        help='stop once the board repeats a recent state')
+    parser.add_argument(
+        '--fast-forward-cycles', action='store_true',
+        help='once the board repeats a recent state, skip ahead to '
+             '--max-generations, counting stats for the skipped cycles')
+    return parser
+
+
+def main(argv=None):
+    """
+    Run the headless CLI and print the simulation result as JSON.
+    """
+    parser = get_arg_parser()
+    args = parser.parse_args(argv)
+
+    settings = {}
+    if args.file:
+        with open(args.file) as settings_file:
+            settings = json.load(settings_file)
+    snapshot_path = args.snapshot or settings.get('snapshot')
+    pattern_path = args.pattern or settings.get('pattern')
+    rows = args.rows if args.rows is not None else settings.get('rows')
+    cols = args.cols if args.cols is not None else settings.get('cols')
+    rule = args.rule or settings.get('rule')
+    topology = args.topology or settings.get('topology')
+    pattern = None
+    if pattern_path is not None:
+        try:
+            pattern = read_pattern(pattern_path)
+            (pattern_rule, pattern_topology, pattern_rows,
+             pattern_cols) = split_rule_suffix(pattern[1]['rule'] or '')
+        except (OSError, ValueError) as error:
+            parser.error(str(error))
+        rule = rule or pattern_rule
+        topology = topology or pattern_topology
+        rows = rows if rows is not None else (
+            pattern_rows or max(pattern[1]['y'], 1))
+        cols = cols if cols is not None else (
+            pattern_cols or max(pattern[1]['x'], 1))
+    if snapshot_path is None and (
+            rows is None or cols is None or rows < 1 or cols < 1):
+        parser.error('rows and cols must be given and positive')
+
+    try:
+        if snapshot_path is not None:
+            live_cell_coords = None
+        elif pattern is not None:
+            live_cell_coords = place_coords(pattern[0], rows, cols,
+                                            center=True)
+        elif args.live is not None:
+            live_cell_coords = parse_live_cell_coords(args.live, rows, cols)
+        else:
+            live_cell_coords = parse_live_cell_coords(
+                ' '.join('{},{}'.format(row, col) for row, col in
+                         settings.get('live_cell_coords', [])),
+                rows, cols)
+    except ValueError as error:
+        parser.error(str(error))
+
+    try:
+        result = run_simulation(
+            rows, cols, live_cell_coords,
+            max_generations=(args.max_generations
+                             if args.max_generations is not None
+                             else settings.get('max_generations')),
+            max_seconds=(args.max_seconds if args.max_seconds is not None
+                         else settings.get('max_seconds')),
+            stat_categories=args.stats or settings.get('stats'),
+            engine=args.engine or settings.get('engine', 'python'),
+            streaming_stats=(args.streaming_stats or
+                             settings.get('streaming_stats', False)),
+            detect_cycles=(args.detect_cycles or
+                           settings.get('detect_cycles', False)),
+            fast_forward_cycles=(args.fast_forward_cycles or
+                                 settings.get('fast_forward_cycles', False)),
+            snapshot_path=snapshot_path,
+            checkpoint_path=args.checkpoint or settings.get('checkpoint'),
+            checkpoint_every=(args.checkpoint_every
+                              if args.checkpoint_every is not None
+                              else settings.get('checkpoint_every')),
+            save_pattern_path=(args.save_pattern or
+                               settings.get('save_pattern')),
+            rule=rule or 'B3/S23', topology=topology,
+            trace_path=args.trace or settings.get('trace'),
+            time_series_path=(args.time_series or
+                              settings.get('time_series')),
+            bit_board=args.bit_board or settings.get('bit_board', False))
+    except ValueError as error:
+        parser.error(str(error))
+    json.dump(result, sys.stdout)
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
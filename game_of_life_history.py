@@ -0,0 +1,233 @@
+import bisect
+
+try:
+    import numpy as np
+except ImportError:  # only needed when history is recorded
+    np = None
+
+
+class GameOfLifeHistory(object):
+    """
+    Record a board's generations so any recent one can be looked up again.
+
+    Generations are kept in groups: a keyframe of the whole board followed
+    by one delta per generation, the flat indexes of the cells that changed
+    state (plus their new states for rules with more than two states),
+    packed into the smallest unsigned int type that fits the board.
+    Keyframes of two-state boards are packed 8 cells to a byte.
+    A new group starts every 'keyframe_interval' generations, or sooner
+    when the group's deltas would take more space than a keyframe, so
+    looking up a generation applies at most 'keyframe_interval' deltas to a
+    keyframe and history never takes more space than keyframes alone.
+
+    Groups form a ring buffer of at most 'max_bytes' of arrays: the oldest
+    groups are dropped to make room, except for the newest one.
+    """
+    DEFAULT_MAX_BYTES = 64 * 2**20
+    DEFAULT_KEYFRAME_INTERVAL = 64
+
+    def __init__(self, rows, cols, num_states=2, max_bytes=DEFAULT_MAX_BYTES,
+                 keyframe_interval=DEFAULT_KEYFRAME_INTERVAL):
+        """
+        Init an empty history of a rows x cols board whose cells take the
+        given number of states.
+        """
+        if np is None:
+            raise ImportError('recording history requires numpy')
+        self.rows = rows
+        self.cols = cols
+        self.num_states = num_states
+        self.max_bytes = max_bytes
+        self.keyframe_interval = keyframe_interval
+        self.index_dtype = np.min_scalar_type(max(rows*cols-1, 0))
+        # groups of [first generation, keyframe, deltas, bytes], oldest
+        # first, and the first generation of each group
+        self.groups = []
+        self.group_generations = []
+        self.nbytes = 0
+
+    def __len__(self):
+        return sum(len(group[2])+1 for group in self.groups)
+
+    def __contains__(self, generation):
+        return self.find_group(generation) is not None
+
+    def __str__(self):
+        if not self.groups:
+            return 'no generations recorded'
+        return ('{} generations from {} to {} in {} keyframes, {:.1f} '
+                'KiB'.format(len(self), self.first_generation,
+                             self.last_generation, len(self.groups),
+                             self.nbytes / 1024))
+
+    @property
+    def first_generation(self):
+        """
+        The oldest generation recorded, or None.
+        """
+        return self.group_generations[0] if self.groups else None
+
+    @property
+    def last_generation(self):
+        """
+        The newest generation recorded, or None.
+        """
+        if not self.groups:
+            return None
+        first_generation, _, deltas, _ = self.groups[-1]
+        return first_generation + len(deltas)
+
+    def find_group(self, generation):
+        """
+        Return the group holding the given generation, or None if it is
+        not recorded.
+        """
+        position = bisect.bisect_right(self.group_generations, generation)-1
+        if position < 0:
+            return None
+        group = self.groups[position]
+        if generation - group[0] > len(group[2]):
+            return None
+        return group
+
+    def record_keyframe(self, states, generation):
+        """
+        Start a new group with the board's (rows, cols) array of cell
+        states at the given generation, first forgetting that generation
+        and any later ones.
+        """
+        self.truncate(generation)
+        if self.num_states > 2:
+            keyframe = np.array(states, dtype=np.uint8)
+        else:
+            keyframe = np.packbits(np.asarray(states).ravel() == 1)
+        self.groups.append([generation, keyframe, [], keyframe.nbytes])
+        self.group_generations.append(generation)
+        self.nbytes += keyframe.nbytes
+        self.evict()
+
+    def record(self, board):
+        """
+        Record the generation the board just advanced to from the cells
+        that changed state. Records a keyframe instead if one is due, if
+        the group's deltas would take more space than one, or if the board
+        did not advance from the last generation recorded.
+        """
+        generation = board.generation
+        group = self.groups[-1] if self.groups else None
+        if (self.last_generation != generation-1 or
+                len(group[2]) >= self.keyframe_interval):
+            self.record_keyframe(board.engine.get_alive_array(), generation)
+            return
+        coords = np.asarray(board.cells_to_flip, dtype=np.intp)
+        coords = coords.reshape(-1, 2)
+        indexes = (coords[:, 0]*self.cols + coords[:, 1]).astype(
+            self.index_dtype)
+        values = None
+        if self.num_states > 2:
+            values = board.engine.get_alive_array().ravel()[indexes]
+        delta_bytes = indexes.nbytes + (
+            0 if values is None else values.nbytes)
+        keyframe_bytes = group[1].nbytes
+        if group[3] - keyframe_bytes + delta_bytes > keyframe_bytes:
+            self.record_keyframe(board.engine.get_alive_array(), generation)
+            return
+        group[2].append((indexes, values))
+        group[3] += delta_bytes
+        self.nbytes += delta_bytes
+        self.evict()
+
+    def truncate(self, generation):
+        """
+        Forget the given generation and any later ones.
+        """
+        while self.groups and self.group_generations[-1] >= generation:
+            self.nbytes -= self.groups.pop()[3]
+            self.group_generations.pop()
+        if self.groups:
+            group = self.groups[-1]
+            # the delta at position i is of generation first_generation+i+1
+            position = generation - group[0] - 1
+            for indexes, values in group[2][position:]:
+                delta_bytes = indexes.nbytes + (
+                    0 if values is None else values.nbytes)
+                group[3] -= delta_bytes
+                self.nbytes -= delta_bytes
+            del group[2][position:]
+
+    def evict(self):
+        """
+        Drop the oldest groups until the history fits in max_bytes, keeping
+        at least the newest group.
+        """
+        while self.nbytes > self.max_bytes and len(self.groups) > 1:
+            self.nbytes -= self.groups.pop(0)[3]
+            self.group_generations.pop(0)
+
+    def get_states(self, generation):
+        """
+        Return a (rows, cols) uint8 array of the cell states at the given
+        generation.
+        Raise KeyError if the generation is not recorded.
+        """
+        group = self.find_group(generation)
+        if group is None:
+            raise KeyError(generation)
+        first_generation, keyframe, deltas, _ = group
+        if self.num_states > 2:
+            states = keyframe.ravel().copy()
+        else:
+            states = np.unpackbits(keyframe, count=self.rows*self.cols)
+        for indexes, values in deltas[:generation-first_generation]:
+            self.apply_delta(states, indexes, values)
+        return states.reshape(self.rows, self.cols)
+
+    def iter_states(self, start=None, stop=None):
+        """
+        Yield (generation, states) for each recorded generation from start
+        (by default the first) up to but not including stop (by default
+        past the last), where states is a (rows, cols) uint8 array that is
+        updated in place between generations; copy it to keep it.
+        Generations missing from the history are skipped.
+        """
+        if start is None:
+            start = self.first_generation
+        if stop is None:
+            stop = (self.last_generation or 0) + 1
+        for first_generation, _, deltas, _ in list(self.groups):
+            last_generation = first_generation + len(deltas)
+            if last_generation < start or first_generation >= stop:
+                continue
+            generation = max(start, first_generation)
+            states = self.get_states(generation)
+            flat_states = states.ravel()
+            yield generation, states
+            for indexes, values in deltas[generation-first_generation:
+                                          stop-first_generation-1]:
+                self.apply_delta(flat_states, indexes, values)
+                generation += 1
+                yield generation, states
+
+    def get_cells_changed(self, generation):
+        """
+        Return an (n, 2) array of the (row, col) coords of the cells that
+        changed state from the previous generation to the given one, or
+        None if the given one is a keyframe.
+        Raise KeyError if the generation is not recorded.
+        """
+        group = self.find_group(generation)
+        if group is None:
+            raise KeyError(generation)
+        if generation == group[0]:
+            return None
+        indexes = group[2][generation-group[0]-1][0]
+        return np.column_stack(np.divmod(indexes.astype(np.intp), self.cols))
+
+    def apply_delta(self, flat_states, indexes, values):
+        """
+        Change the cells at the delta's flat indexes to their next states.
+        """
+        if values is None:
+            flat_states[indexes] ^= 1
+        else:
+            flat_states[indexes] = values
@@ -0,0 +1,396 @@
+"""
+Canonical Game of Life patterns, and reading and writing pattern files.
+
+Supported formats:
+    RLE (.rle)          run-length encoded rows, with an 'x = , y = ' header
+                        that may give a 'rule ='
+    Life 1.06 (.lif)    one 'x y' coordinate pair per live cell
+    plaintext (.cells)  one line per row, 'O' for live and '.' for dead cells
+Parsers return live cell coords as an (n, 2) int array of (row, col) pairs,
+relative to the pattern's top left corner. Boards take these arrays as
+live_cell_coords directly. RLE and plaintext bodies are decoded with NumPy
+array operations rather than character by character, so pattern files of
+several megabytes load in a fraction of a second.
+"""
+import os
+import re
+
+try:
+    import numpy as np
+except ImportError:  # only needed for pattern files
+    np = None
+
+# plaintext drawings: 'O' is a live cell, '.' a dead one
+PATTERNS = {
+    'glider': '''
+.O.
+..O
+OOO
+''',
+    'r-pentomino': '''
+.OO
+OO.
+.O.
+''',
+    'acorn': '''
+.O.....
+...O...
+OO..OOO
+''',
+    'gosper glider gun': '''
+........................O...........
+......................O.O...........
+............OO......OO............OO
+...........O...O....OO............OO
+OO........O.....O...OO..............
+OO........O...O.OO....O.O...........
+..........O.....O.......O...........
+...........O...O....................
+............OO......................
+'''
+}
+
+PATTERN_FORMATS = {
+    '.rle': 'rle',
+    '.lif': 'life 1.06',
+    '.life': 'life 1.06',
+    '.cells': 'plaintext',
+    '.txt': 'plaintext'
+}
+RLE_HEADER_REGEX = re.compile(r'\s*x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)'
+                              r'(?:\s*,\s*rule\s*=\s*(\S+))?', re.IGNORECASE)
+# longest run of cells written on one line of an RLE file
+RLE_LINE_LENGTH = 70
+
+
+def get_pattern_coords(name):
+    """
+    Return the set of (row, col) coords of the named pattern's live cells,
+    with its top left corner at (0, 0).
+    """
+    lines = PATTERNS[name].strip('\n').split('\n')
+    return {(row, col) for row, line in enumerate(lines)
+            for col, char in enumerate(line) if char == 'O'}
+
+
+def center_coords(live_cell_coords, rows, cols):
+    """
+    Return the live cell coords shifted so their bounding box is centered in
+    a rows x cols board. Raise ValueError if they do not fit.
+    Coords can be a set of (row, col) tuples, which returns a set, or an
+    (n, 2) int array, which returns an array.
+    """
+    if np is not None and isinstance(live_cell_coords, np.ndarray):
+        if not len(live_cell_coords):
+            return live_cell_coords
+        min_row, min_col = live_cell_coords.min(axis=0)
+        max_row, max_col = live_cell_coords.max(axis=0)
+    else:
+        if not live_cell_coords:
+            return set([])
+        min_row = min(row for row, col in live_cell_coords)
+        max_row = max(row for row, col in live_cell_coords)
+        min_col = min(col for row, col in live_cell_coords)
+        max_col = max(col for row, col in live_cell_coords)
+    height, width = max_row-min_row+1, max_col-min_col+1
+    if height > rows or width > cols:
+        raise ValueError('pattern of size {}x{} does not fit in {}x{} board'
+                         .format(height, width, rows, cols))
+    row_offset = (rows-height)//2 - min_row
+    col_offset = (cols-width)//2 - min_col
+    if np is not None and isinstance(live_cell_coords, np.ndarray):
+        return live_cell_coords + (row_offset, col_offset)
+    return {(row+row_offset, col+col_offset)
+            for row, col in live_cell_coords}
+
+
+def get_pattern_size(live_cell_coords):
+    """
+    Return the (height, width) of an (n, 2) array of live cell coords,
+    counting from (0, 0).
+    """
+    if not len(live_cell_coords):
+        return 0, 0
+    height, width = live_cell_coords.max(axis=0) + 1
+    return int(height), int(width)
+
+
+def split_header_lines(text, is_header_line):
+    """
+    Return (header lines, rest of text) where header lines are the leading
+    lines for which is_header_line is True, skipping blank lines.
+    Only the header is split into lines.
+    """
+    header_lines = []
+    position = 0
+    while position < len(text):
+        end = text.find('\n', position)
+        if end == -1:
+            end = len(text)
+        line = text[position:end].strip()
+        if line and not is_header_line(line):
+            break
+        if line:
+            header_lines.append(line)
+        position = end+1
+    return header_lines, text[position:]
+
+
+def parse_rle(text):
+    """
+    Parse an RLE pattern.
+    Return (live cell coords, header) where header is a dict with the
+    pattern's 'x' (width), 'y' (height), 'rule' (None if not given), 'name'
+    (from a '#N' line, or None) and 'comments' (other '#' lines).
+    Cell states other than 'b' and '.' are read as alive, except the
+    multi-state letters 'B' to 'X' of Generations rules, whose dying states
+    are read as dead.
+    """
+    if np is None:
+        raise ImportError('pattern files require numpy')
+    comment_lines, body = split_header_lines(
+        text, lambda line: line.startswith('#'))
+    header = {'x': None, 'y': None, 'rule': None, 'name': None,
+              'comments': []}
+    for line in comment_lines:
+        if line.startswith('#N'):
+            header['name'] = line[2:].strip()
+        else:
+            header['comments'].append(line)
+
+    header_end = body.find('\n')
+    if header_end == -1:
+        header_end = len(body)
+    match = RLE_HEADER_REGEX.match(body[:header_end])
+    if match is None:
+        raise ValueError('RLE pattern has no \'x = , y = \' header')
+    header['x'], header['y'] = int(match.group(1)), int(match.group(2))
+    header['rule'] = match.group(3)
+    body = body[header_end+1:]
+    end = body.find('!')
+    if end != -1:
+        body = body[:end]
+
+    chars = np.frombuffer(
+        body.encode('ascii').translate(None, b' \t\r\n'), dtype=np.uint8)
+    is_digit = (chars >= ord('0')) & (chars <= ord('9'))
+    tag_positions = np.flatnonzero(~is_digit)
+    tags = chars[tag_positions]
+    is_newline = tags == ord('$')
+    is_cell = ((tags == ord('.')) | ((tags >= ord('a')) & (tags <= ord('z')))
+               | ((tags >= ord('A')) & (tags <= ord('Z'))))
+    if not (is_newline | is_cell).all():
+        bad_char = chr(tags[~(is_newline | is_cell)][0])
+        raise ValueError('bad character in RLE pattern: {!r}'.format(bad_char))
+
+    # each tag's run count is the number spelled by the digits before it
+    digit_positions = np.flatnonzero(is_digit)
+    owners = np.cumsum(~is_digit)[digit_positions]
+    is_owned = owners < len(tags)  # digits after the last tag are ignored
+    digit_positions, owners = digit_positions[is_owned], owners[is_owned]
+    place_values = np.power(
+        10, tag_positions[owners]-1-digit_positions, dtype=np.int64)
+    counts = np.ones(len(tags), dtype=np.int64)
+    counts[owners] = 0
+    np.add.at(counts, owners,
+              (chars[digit_positions]-ord('0')).astype(np.int64) *
+              place_values)
+
+    # row and starting col of each run; '$' ends 'count' rows
+    widths = np.where(is_cell, counts, 0)
+    run_ends = np.cumsum(widths)
+    row_starts = np.maximum.accumulate(np.where(is_newline, run_ends, 0))
+    run_cols = run_ends - widths - row_starts
+    row_advances = np.where(is_newline, counts, 0)
+    run_rows = np.cumsum(row_advances) - row_advances
+
+    is_alive = (is_cell & (tags != ord('b')) & (tags != ord('.')) &
+                ((tags < ord('B')) | (tags > ord('X'))))
+    run_rows, run_cols, run_lengths = (
+        run_rows[is_alive], run_cols[is_alive], counts[is_alive])
+    run_offsets = np.cumsum(run_lengths) - run_lengths
+    num_cells = int(run_lengths.sum())
+    cols = (np.repeat(run_cols, run_lengths) + np.arange(num_cells) -
+            np.repeat(run_offsets, run_lengths))
+    return (np.column_stack((np.repeat(run_rows, run_lengths), cols)),
+            header)
+
+
+def parse_life_106(text):
+    """
+    Parse a Life 1.06 pattern of 'x y' lines. Coords may be negative; the
+    result is shifted so the bounding box is at (0, 0).
+    Return (live cell coords, header) like parse_rle, with no rule.
+    """
+    if np is None:
+        raise ImportError('pattern files require numpy')
+    comment_lines, body = split_header_lines(
+        text, lambda line: line.startswith('#'))
+    values = np.array(body.split(), dtype=np.int64)
+    if len(values) % 2:
+        raise ValueError('Life 1.06 pattern has an unpaired coordinate')
+    live_cell_coords = values.reshape(-1, 2)[:, ::-1]
+    if len(live_cell_coords):
+        live_cell_coords = live_cell_coords - live_cell_coords.min(axis=0)
+    return live_cell_coords, get_header(live_cell_coords, comment_lines)
+
+
+def parse_plaintext(text):
+    """
+    Parse a plaintext pattern, where '!' lines are comments and 'O' (or
+    '*') is a live cell.
+    Return (live cell coords, header) like parse_rle, with no rule.
+    """
+    if np is None:
+        raise ImportError('pattern files require numpy')
+    comment_lines, body = split_header_lines(
+        text, lambda line: line.startswith('!'))
+    lines = body.rstrip().split('\n')
+    width = max(len(line.rstrip()) for line in lines)
+    cells = np.frombuffer(
+        ''.join(line.rstrip().ljust(width, '.') for line in lines)
+        .encode('ascii'), dtype=np.uint8).reshape(len(lines), width)
+    live_cell_coords = np.argwhere((cells == ord('O')) | (cells == ord('*')))
+    header = get_header(live_cell_coords, comment_lines)
+    for line in comment_lines:
+        if line.startswith('!Name:'):
+            header['name'] = line[len('!Name:'):].strip()
+    return live_cell_coords, header
+
+
+def get_header(live_cell_coords, comment_lines):
+    """
+    Return a pattern header like parse_rle's for formats without one.
+    """
+    height, width = get_pattern_size(live_cell_coords)
+    return {'x': width, 'y': height, 'rule': None, 'name': None,
+            'comments': comment_lines}
+
+
+PATTERN_PARSERS = {
+    'rle': parse_rle,
+    'life 1.06': parse_life_106,
+    'plaintext': parse_plaintext
+}
+
+
+def get_pattern_format(path, text):
+    """
+    Return the format of a pattern file from its extension, or else its
+    contents.
+    """
+    pattern_format = PATTERN_FORMATS.get(os.path.splitext(path)[1].lower())
+    if pattern_format is not None:
+        return pattern_format
+    if text.startswith('#Life 1.06'):
+        return 'life 1.06'
+    _, body = split_header_lines(text, lambda line: line.startswith('#'))
+    if RLE_HEADER_REGEX.match(body):
+        return 'rle'
+    return 'plaintext'
+
+
+def read_pattern(path, rows=None, cols=None, center=False):
+    """
+    Read the pattern file at path (see PATTERN_FORMATS).
+    Return (live cell coords, header); see parse_rle.
+
+    If rows and cols are given, coords are checked to fit in a rows x cols
+    board, or centered in it if center is True. Raise ValueError if they do
+    not fit.
+    """
+    with open(path) as pattern_file:
+        text = pattern_file.read()
+    live_cell_coords, header = PATTERN_PARSERS[
+        get_pattern_format(path, text)](text)
+    if rows is not None and cols is not None:
+        live_cell_coords = place_coords(live_cell_coords, rows, cols, center)
+    return live_cell_coords, header
+
+
+def place_coords(live_cell_coords, rows, cols, center=False):
+    """
+    Return an (n, 2) array of live cell coords checked to fit in a
+    rows x cols board, or centered in it if center is True. Raise
+    ValueError if they do not fit.
+    """
+    if center:
+        return center_coords(live_cell_coords, rows, cols)
+    height, width = get_pattern_size(live_cell_coords)
+    if height > rows or width > cols:
+        raise ValueError('pattern of size {}x{} does not fit in {}x{} board'
+                         .format(height, width, rows, cols))
+    return live_cell_coords
+
+
+def to_rle(alive, rule='B3/S23', name=None):
+    """
+    Return a (rows, cols) array of cells, truthy where alive, as RLE text.
+    Runs are found and encoded with array operations; lines are broken
+    between tokens at RLE_LINE_LENGTH characters.
+    """
+    alive = np.asarray(alive, dtype=bool)
+    rows, cols = alive.shape
+    header_lines = []
+    if name:
+        header_lines.append('#N {}'.format(name))
+    header_lines.append('x = {}, y = {}, rule = {}'.format(cols, rows, rule))
+
+    # runs of equal cells; a dead cell after each row ends every row's runs
+    cells = np.zeros((rows, cols+1), dtype=bool)
+    cells[:, :cols] = alive
+    cells = cells.ravel()
+    is_run_start = np.ones(cells.size, dtype=bool)
+    is_run_start[1:] = cells[1:] != cells[:-1]
+    is_run_start[::cols+1] = True
+    run_starts = np.flatnonzero(is_run_start)
+    run_lengths = np.diff(run_starts, append=cells.size)
+    run_rows = run_starts // (cols+1)
+    # drop each row's trailing dead run
+    is_kept = np.append(run_rows[1:] != run_rows[:-1], True)
+    is_kept = ~is_kept
+    run_starts, run_lengths, run_rows = (
+        run_starts[is_kept], run_lengths[is_kept], run_rows[is_kept])
+
+    # tokens: each run, with a 'count$' before the first run of each row
+    num_runs = len(run_starts)
+    counts = np.zeros(2*num_runs+1, dtype=np.int64)
+    tags = np.zeros(2*num_runs+1, dtype=np.uint8)
+    counts[1::2] = run_lengths
+    tags[1::2] = np.where(cells[run_starts], ord('o'), ord('b'))
+    first_runs = np.flatnonzero(
+        np.append(True, run_rows[1:] != run_rows[:-1])) if num_runs else []
+    counts[2*first_runs] = np.diff(run_rows[first_runs], prepend=0)
+    tags[2*first_runs] = ord('$')
+    counts[-1], tags[-1] = 1, ord('!')
+    is_token = counts > 0
+    counts, tags = counts[is_token], tags[is_token]
+
+    # write counts above 1 as digits in front of each tag
+    num_digits = len(str(int(counts.max())))
+    token_chars = np.zeros((len(counts), num_digits+1), dtype=np.uint8)
+    token_chars[:, -1] = tags
+    for place in range(num_digits):
+        has_digit = counts >= max(10**place, 2)
+        token_chars[has_digit, num_digits-1-place] = (
+            counts[has_digit] // 10**place % 10 + ord('0'))
+    body = token_chars[token_chars != 0].tobytes().decode('ascii')
+
+    # break after the last token ending before each multiple of 'step'
+    # chars, so no line is longer than RLE_LINE_LENGTH
+    token_ends = np.cumsum((token_chars != 0).sum(axis=1))
+    step = RLE_LINE_LENGTH - num_digits
+    line_ends = np.unique(token_ends[np.searchsorted(
+        token_ends, np.arange(step, len(body)+step, step), side='right')-1])
+    line_starts = np.append(0, line_ends[:-1])
+    lines = [body[start:end] for start, end in zip(line_starts.tolist(),
+                                                   line_ends.tolist())]
+    return '\n'.join(header_lines + lines) + '\n'
+
+
+def write_rle(path, alive, rule='B3/S23', name=None):
+    """
+    Write a (rows, cols) array of cells to an RLE file at path.
+    """
+    with open(path, 'w') as pattern_file:
+        pattern_file.write(to_rle(alive, rule=rule, name=name))
@@ -0,0 +1,281 @@
+import itertools
+import queue
+import threading
+import time
+
+from game_of_life_driver import get_stop_reason
+
+
+class GameOfLifePipeline(object):
+    """
+    Run a GameOfLifeBoard's simulation on a worker thread while the calling
+    thread draws it and stays responsive.
+
+    The worker advances the board and puts each generation's flipped cell
+    coords into a frame queue of at most 'max_queued_frames' frames. The
+    calling thread ('run') takes every queued frame 'frames_per_second'
+    times a second, draws their cells together, presents them and calls
+    the event function, so input is handled at the frame rate however slow
+    a generation is. Under backpressure frames are coalesced, never waited
+    on: while the queue is full the worker merges the generations it runs
+    into its next frame, and the drawing thread merges every frame it finds
+    queued. Once more cells are pending than the board has, the frame
+    becomes a redraw of the whole board, so memory stays bounded too.
+
+    A lock keeps drawing from reading the board mid-generation: the worker
+    holds it while advancing the board and the drawing thread while
+    drawing cells and handling events, but not while presenting or waiting.
+    The numpy engines step without holding the GIL, so stepping overlaps
+    with presenting frames.
+
+    The simulation can be paused, resumed, sped up or stopped from the
+    event function (see 'pause', 'resume', 'set_generations_per_second' and
+    'stop').
+
+    With a GameOfLifeProfiler, the board's generations are profiled on the
+    worker thread, along with the time it spends waiting to run them.
+    """
+    STOP_REASONS = {'stable', 'cycle', 'max_generations', 'max_seconds',
+                    'quit'}
+
+    def __init__(self, board, max_generations=None, max_seconds=None,
+                 frames_per_second=30, generations_per_second=None,
+                 display_func=None, event_func=None, max_queued_frames=2,
+                 clock=time.perf_counter, sleep=time.sleep, profiler=None):
+        """
+        :param max_generations: stop once the board reaches this generation.
+        :param max_seconds: stop once this much wall-clock time has passed.
+        :param frames_per_second: draw the board this often.
+        :param generations_per_second: run at most this many generations a
+        second; None is unlimited.
+        :param display_func: function called with no args after each frame
+        is drawn, e.g. to push the drawn cells to the display.
+        :param event_func: function called with no args before each frame
+        is drawn, e.g. to handle input events.
+        :param max_queued_frames: most frames waiting to be drawn before the
+        worker coalesces generations.
+        :param clock: function returning the time in seconds.
+        :param sleep: function that waits the given number of seconds.
+        :param profiler: optional GameOfLifeProfiler to profile the worker.
+        """
+        self.board = board
+        self.max_generations = max_generations
+        self.max_seconds = max_seconds
+        self.frame_interval = 1 / frames_per_second
+        self.generation_interval = (None if generations_per_second is None
+                                    else 1 / generations_per_second)
+        self.display_func = display_func or (lambda: None)
+        self.event_func = event_func or (lambda: None)
+        self.clock = clock
+        self.sleep = sleep
+        self.profiler = profiler
+        self.lock = threading.Lock()
+        # frames are lists of each generation's flipped cell coords, or
+        # None to redraw the whole board
+        self.frames = queue.Queue(maxsize=max_queued_frames)
+        # set to wake the worker early from waiting
+        self.wake = threading.Event()
+        self.is_paused = False
+        self.stop_reason = None
+        self.worker = None
+        self.worker_error = None
+        self.num_frames = 0
+        # generations drawn in a later generation's frame, counted by the
+        # drawing thread and by the worker
+        self.num_coalesced_frames = 0
+        self.num_worker_coalesced_frames = 0
+
+    def pause(self):
+        """
+        Stop advancing the board until 'resume' is called.
+        """
+        self.is_paused = True
+        self.wake.set()
+
+    def resume(self):
+        """
+        Resume advancing a paused board.
+        """
+        self.is_paused = False
+        self.wake.set()
+
+    def set_generations_per_second(self, generations_per_second):
+        """
+        Run at most this many generations a second from now on; None is
+        unlimited.
+        """
+        self.generation_interval = (
+            None if generations_per_second is None
+            else 1 / generations_per_second)
+        self.wake.set()
+
+    def stop(self, stop_reason='quit'):
+        """
+        Stop the simulation for the given reason (one of STOP_REASONS) once
+        its current generation is done.
+        """
+        if self.stop_reason is None:
+            self.stop_reason = stop_reason
+        self.wake.set()
+
+    def run(self):
+        """
+        Advance the board on a worker thread, drawing it on this one, until
+        it stops changing (see GameOfLifeBoard.advance_board_one_generation),
+        a limit is reached or 'stop' is called.
+
+        Return a dict with the reason the simulation stopped (one of
+        STOP_REASONS, see game_of_life_driver.get_stop_reason for boards
+        that stopped changing), the board's generation, the seconds taken,
+        the number of frames drawn and the number of generations coalesced
+        into a later generation's frame.
+        """
+        board = self.board
+        draw_on_advance = board.draw_on_advance
+        board.draw_on_advance = False
+        start_time = self.clock()
+        self.worker = threading.Thread(
+            target=self.produce, args=(start_time,), daemon=True)
+        self.worker.start()
+        next_frame_time = start_time
+        try:
+            while True:
+                is_done = not self.worker.is_alive()
+                with self.lock:
+                    self.event_func()
+                    self.draw_frame()
+                self.display_func()
+                self.num_frames += 1
+                if is_done:
+                    break
+                now = self.clock()
+                # after a slow frame, wait a whole interval again
+                next_frame_time = max(next_frame_time+self.frame_interval,
+                                      now)
+                self.sleep(next_frame_time-now)
+        finally:
+            self.stop()
+            while self.worker.is_alive():
+                # make room for the worker's last frame
+                self.get_queued_frames()
+                self.worker.join(self.frame_interval)
+            board.draw_on_advance = draw_on_advance
+        if self.worker_error is not None:
+            raise self.worker_error
+        return {
+            'stop_reason': self.stop_reason,
+            'generations': board.generation,
+            'seconds': self.clock() - start_time,
+            'frames': self.num_frames,
+            'coalesced_frames': (self.num_coalesced_frames +
+                                 self.num_worker_coalesced_frames)
+        }
+
+    def get_queued_frames(self):
+        """
+        Take and return a list of every queued frame.
+        """
+        frames = []
+        while True:
+            try:
+                frames.append(self.frames.get_nowait())
+            except queue.Empty:
+                return frames
+
+    def draw_frame(self):
+        """
+        Draw the cells of every queued frame together. Redraws the whole
+        board if a frame asks to or if that is less work.
+        """
+        board = self.board
+        frames = self.get_queued_frames()
+        if not frames:
+            return
+        self.num_coalesced_frames += len(frames) - 1
+        if any(frame is None for frame in frames):
+            board.display_self()
+            return
+        cells_to_flip = list(itertools.chain.from_iterable(
+            itertools.chain.from_iterable(frames)))
+        if len(cells_to_flip) > board.rows*board.cols:
+            board.display_self()
+        elif cells_to_flip:
+            board.draw_cells(cells_to_flip)
+
+    def produce(self, start_time):
+        """
+        Advance the board and queue its flipped cells until the simulation
+        stops. Runs on the worker thread.
+        """
+        board = self.board
+        board_profiler = board.profiler
+        if self.profiler is not None:
+            board.profiler = self.profiler
+        # flipped cell coords of each generation not queued yet, or None
+        # to redraw the whole board
+        frame = []
+        num_frame_cells = 0
+        next_generation_time = start_time
+        try:
+            while self.stop_reason is None:
+                now = self.clock()
+                if (self.max_generations is not None and
+                        board.generation >= self.max_generations):
+                    self.stop('max_generations')
+                    break
+                if (self.max_seconds is not None and
+                        now - start_time >= self.max_seconds):
+                    self.stop('max_seconds')
+                    break
+                generation_interval = self.generation_interval
+                if self.is_paused or (generation_interval is not None and
+                                      now < next_generation_time):
+                    wake_time = (now+self.frame_interval if self.is_paused
+                                 else next_generation_time)
+                    if self.max_seconds is not None:
+                        wake_time = min(wake_time,
+                                        start_time+self.max_seconds)
+                    self.wait(wake_time-now)
+                    continue
+
+                with self.lock:
+                    is_changing = board.advance_board_one_generation()
+                if frame is not None:
+                    frame.append(board.cells_to_flip)
+                    num_frame_cells += len(board.cells_to_flip)
+                    if num_frame_cells > board.rows*board.cols:
+                        frame = None
+                try:
+                    self.frames.put_nowait(frame)
+                    frame = []
+                    num_frame_cells = 0
+                except queue.Full:
+                    self.num_worker_coalesced_frames += 1
+                if not is_changing:
+                    self.stop(get_stop_reason(board))
+                    break
+                if generation_interval is not None:
+                    next_generation_time = max(
+                        next_generation_time+generation_interval, now)
+        except Exception as error:
+            self.worker_error = error
+            self.stop('quit')
+        finally:
+            board.profiler = board_profiler
+            # the last frame is drawn once the drawing thread sees the
+            # worker is done, so it can wait for room in the queue
+            if frame != []:
+                self.frames.put(frame)
+
+    def wait(self, seconds):
+        """
+        Wait on the worker thread for the given number of seconds, waking
+        early if the simulation is paused, resumed, sped up or stopped.
+        """
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.start_phase()
+        self.wake.wait(max(seconds, 0))
+        self.wake.clear()
+        if profiler is not None:
+            profiler.end_phase('idle')
@@ -0,0 +1,154 @@
+import array
+import collections
+import json
+import math
+import time
+
+
+class GameOfLifeProfiler(object):
+    """
+    Time the phases of a simulation and record per-generation counters.
+
+    Phases (see PHASES) are timed by whatever runs them, e.g. a
+    GameOfLifeBoard times stepping, stat updates and drawing flipped cells
+    in 'advance_board_one_generation', and a GameOfLifeSimulationDriver
+    times frames, waiting and checkpoints. Each phase's time since the
+    last generation is recorded with the generation's counters: population,
+    cells flipped and cells evaluated by the engine.
+
+    Records go to any of an 'on_generation' callback, a ring buffer of the
+    last 'history_size' records ('history') and a JSON-lines trace file,
+    one JSON object per line. Boards and drivers without a profiler only
+    test that it is None, so profiling costs nothing when disabled.
+    """
+    PHASES = ('step', 'stats', 'render', 'present', 'idle', 'checkpoint')
+
+    def __init__(self, on_generation=None, history_size=None,
+                 trace_path=None, clock=time.perf_counter):
+        """
+        :param on_generation: function called with each generation's record
+        (see 'end_generation').
+        :param history_size: keep the last this many records in 'history';
+        None keeps none.
+        :param trace_path: JSON-lines file to write records to. Call 'close'
+        to write the summary line and close it.
+        :param clock: function returning the time in seconds.
+        """
+        self.on_generation = on_generation
+        self.history = (None if history_size is None
+                        else collections.deque(maxlen=history_size))
+        self.trace_file = None
+        if trace_path is not None:
+            self.trace_file = open(trace_path, 'w')
+        self.clock = clock
+        # seconds spent in each phase over the whole run, and since the
+        # last generation's record
+        self.total_seconds = dict.fromkeys(self.PHASES, 0.0)
+        self.generation_seconds = dict.fromkeys(self.PHASES, 0.0)
+        # seconds spent advancing each generation
+        self.latencies = array.array('d')
+        self.phase_start = None
+        self.generation_start = None
+
+    def start_phase(self):
+        """
+        Start timing a phase.
+        """
+        self.phase_start = self.clock()
+
+    def end_phase(self, phase):
+        """
+        Add the time since the phase started to the named phase, and start
+        timing the next phase.
+        """
+        now = self.clock()
+        seconds = now - self.phase_start
+        self.total_seconds[phase] += seconds
+        self.generation_seconds[phase] += seconds
+        self.phase_start = now
+
+    def start_generation(self):
+        """
+        Start timing a generation and its first phase.
+        """
+        self.start_phase()
+        self.generation_start = self.phase_start
+
+    def end_generation(self, board):
+        """
+        Record the generation the board just advanced to, after its last
+        phase ended.
+        Return the record: a dict with the generation, the board's
+        population, the number of cells flipped and evaluated, the seconds
+        taken to advance and the seconds spent in each phase since the last
+        record.
+        """
+        latency = self.phase_start - self.generation_start
+        self.latencies.append(latency)
+        record = {
+            'generation': board.generation,
+            'population': board.engine.get_population(),
+            'flips': len(board.cells_to_flip),
+            'cells_evaluated': board.engine.get_num_cells_evaluated(),
+            'latency': latency,
+            'seconds': self.generation_seconds
+        }
+        self.generation_seconds = dict.fromkeys(self.PHASES, 0.0)
+        if self.history is not None:
+            self.history.append(record)
+        if self.trace_file is not None:
+            self.trace_file.write(json.dumps(record) + '\n')
+        if self.on_generation is not None:
+            self.on_generation(record)
+        return record
+
+    def get_percentile(self, sorted_values, percent):
+        """
+        Return the nearest-rank percentile of a sorted sequence.
+        """
+        rank = max(math.ceil(percent / 100 * len(sorted_values)), 1)
+        return sorted_values[rank-1]
+
+    def get_summary(self):
+        """
+        Return a JSON-serializable dict with the number of generations, the
+        total seconds spent in each phase and the p50, p99, mean and max
+        seconds taken to advance a generation (None before any).
+        """
+        latencies = sorted(self.latencies)
+        summary = {
+            'generations': len(latencies),
+            'seconds': dict(self.total_seconds),
+            'latency': dict.fromkeys(('p50', 'p99', 'mean', 'max'))
+        }
+        if latencies:
+            summary['latency'] = {
+                'p50': self.get_percentile(latencies, 50),
+                'p99': self.get_percentile(latencies, 99),
+                'mean': sum(latencies) / len(latencies),
+                'max': latencies[-1]
+            }
+        return summary
+
+    def close(self):
+        """
+        Write the summary as the last line of the trace and close it.
+        """
+        if self.trace_file is not None:
+            self.trace_file.write(
+                json.dumps({'summary': self.get_summary()}) + '\n')
+            self.trace_file.close()
+            self.trace_file = None
+
+    def __str__(self):
+        summary = self.get_summary()
+        if not summary['generations']:
+            return 'no generations profiled'
+        latency = summary['latency']
+        self_str = ('{} generations, latency p50 {:.3f} ms, p99 {:.3f} ms, '
+                    'max {:.3f} ms'.format(
+                        summary['generations'], latency['p50']*1000,
+                        latency['p99']*1000, latency['max']*1000))
+        for phase, seconds in summary['seconds'].items():
+            self_str += '\n<{}>: {:.3f} s'.format(phase, seconds)
+        return self_str
@@ -0,0 +1,268 @@
+import numpy as np
+import pygame
+
+from game_of_life_viewport import GameOfLifeViewport
+
+
+class GameOfLifeRenderer(object):
+    """
+    Draw a GameOfLifeBoard to a pygame surface by blitting cached sprites.
+    Also draws post-game stat heatmaps in one vectorized pass per category.
+
+    The board is drawn through a GameOfLifeViewport, which the GUI pans and
+    zooms; only cells in view are drawn. Alive and dead cell sprites are
+    rendered once per cell size with the board's cell draw function, and
+    the outline grid of the cells in view (with every cell dead) is
+    rendered once per view to a background surface. After that, drawing a
+    cell is a single blit and only the screen rects of drawn cells are
+    pushed to the display, so frame cost depends on the number of changed
+    cells, not on board area.
+
+    Zoomed out until cells are too small to draw one by one (see
+    GameOfLifeViewport.is_detailed), the board is drawn as a density view
+    instead: each frame, the viewport's live sample counts are pushed with
+    pygame.surfarray.blit_array to an 8-bit surface whose palette fades
+    from the dead to the alive color, so frame cost depends on the window's
+    size, not on the board's.
+    """
+    def __init__(self, board, surface, background_color, viewport=None):
+        """
+        Init a renderer for the board's GUI components.
+
+        :param viewport: GameOfLifeViewport to draw through; by default, a
+        view of the whole board with the GUI components' cell sizes.
+        """
+        GUI_components = board.GUI_components
+        self.board = board
+        self.surface = surface
+        self.background_color = background_color
+        if viewport is None:
+            viewport = GameOfLifeViewport(
+                board.rows, board.cols, *surface.get_size(),
+                cell_width=GUI_components['cell_width'],
+                cell_height=GUI_components['cell_height'])
+        self.viewport = viewport
+        self.dirty_rects = []
+        self.draw_func = GUI_components['cell_draw_func']
+        self.outline_color = GUI_components['cell_outline_color']
+        self.alive_color = GUI_components['alive_color']
+        self.dead_color = GUI_components['dead_color']
+        # stat category -> (GameOfLifeStat drawn, heatmap surface)
+        self.heatmaps = {}
+        self.sprite_size = None
+        self.density_surface = None
+        # viewport state the view was last set up for (see 'update_view')
+        self.view_state = None
+        self.update_view()
+
+    @staticmethod
+    def render_sprite(size, draw_func, color):
+        """
+        Return a surface of a single filled cell shape.
+        Pixels the shape does not cover (e.g. an ellipse's corners) are
+        transparent, so blitting never paints over neighboring outlines;
+        fully covered sprites skip per-pixel alpha.
+        """
+        sprite = pygame.Surface(size, pygame.SRCALPHA)
+        draw_func(sprite, color, sprite.get_rect(), 0)
+        if pygame.mask.from_surface(sprite).count() == size[0]*size[1]:
+            opaque_sprite = pygame.Surface(size)
+            opaque_sprite.blit(sprite, (0, 0))
+            return opaque_sprite
+        return sprite
+
+    @staticmethod
+    def get_cell_index_of_pixels(cell_starts, cell_size, num_pixels,
+                                 first_index=0):
+        """
+        Return an array mapping each pixel along one axis to the index of
+        the cell covering it, or -1 for outlines and gaps. Cells are
+        numbered from first_index.
+        """
+        cell_index_of_pixels = np.full(num_pixels, -1, dtype=np.intp)
+        for index, start in enumerate(cell_starts, first_index):
+            cell_index_of_pixels[max(start, 0):max(start+cell_size, 0)] = \
+                index
+        return cell_index_of_pixels
+
+    def update_view(self):
+        """
+        Set up drawing for the viewport's pan and zoom, if they changed
+        since the last call.
+        Return True if they did.
+        """
+        viewport = self.viewport
+        view_state = viewport.get_state()
+        if view_state == self.view_state:
+            return False
+        self.view_state = view_state
+        self.heatmaps.clear()
+        self.is_detailed = viewport.is_detailed()
+        (self.first_row, self.stop_row,
+         self.first_col, self.stop_col) = viewport.get_visible_cells()
+        if self.is_detailed:
+            self.set_up_cells()
+        else:
+            self.set_up_density_view()
+        return True
+
+    def set_up_cells(self):
+        """
+        Set up the cell geometry, sprites and background for drawing the
+        cells in view one by one.
+        """
+        viewport = self.viewport
+        width, height = self.surface.get_size()
+        # same geometry as the cell shapes made by GameOfLifeBoard, shifted
+        # by the viewport, for each row/col in view from the first one
+        self.cell_xs = [viewport.get_screen_coords(0, col)[0]+1
+                        for col in range(self.first_col, self.stop_col)]
+        self.cell_ys = [viewport.get_screen_coords(row, 0)[1]+1
+                        for row in range(self.first_row, self.stop_row)]
+        sprite_size = (max(int(viewport.cell_width-2), 0),
+                       max(int(viewport.cell_height-2), 0))
+        if sprite_size != self.sprite_size:
+            self.sprite_size = sprite_size
+            self.alive_sprite = self.render_sprite(
+                sprite_size, self.draw_func, self.alive_color)
+            self.dead_sprite = self.render_sprite(
+                sprite_size, self.draw_func, self.dead_color)
+
+        # row/col of the cell covering each pixel, or -1
+        self.col_of_x = self.get_cell_index_of_pixels(
+            self.cell_xs, sprite_size[0], width, self.first_col)
+        self.row_of_y = self.get_cell_index_of_pixels(
+            self.cell_ys, sprite_size[1], height, self.first_row)
+
+        self.outlines = pygame.Surface((width, height))
+        self.outlines.fill(self.background_color)
+        sprite_width, sprite_height = sprite_size
+        for y in self.cell_ys:
+            for x in self.cell_xs:
+                self.draw_func(self.outlines, self.outline_color,
+                               [x-1, y-1, sprite_width+2, sprite_height+2], 1)
+        self.background = self.outlines.copy()
+        self.background.blits(
+            [(self.dead_sprite, (x, y))
+             for y in self.cell_ys for x in self.cell_xs],
+            doreturn=False)
+
+    def set_up_density_view(self):
+        """
+        Set up the density palette and the cell shown by each pixel for
+        drawing the view as densities of live cells.
+        """
+        viewport = self.viewport
+        width, height = self.surface.get_size()
+        num_samples = viewport.DENSITY_SAMPLES**2
+        self.density_palette = [
+            pygame.Color(self.dead_color).lerp(self.alive_color,
+                                               count / num_samples)
+            for count in range(num_samples+1)]
+        self.density_surface = None
+
+        # row/col of the cell at the center of each pixel, or -1
+        self.col_of_x = np.full(width, -1, dtype=np.intp)
+        cols = viewport.get_pixel_samples(viewport.col, viewport.cell_width,
+                                          viewport.cols, width, samples=1)
+        self.col_of_x[:len(cols)] = cols
+        self.row_of_y = np.full(height, -1, dtype=np.intp)
+        rows = viewport.get_pixel_samples(viewport.row, viewport.cell_height,
+                                          viewport.rows, height, samples=1)
+        self.row_of_y[:len(rows)] = rows
+
+        self.outlines = pygame.Surface((width, height))
+        self.outlines.fill(self.background_color)
+
+    def draw_board(self):
+        """
+        Draw the whole board and mark the whole surface dirty.
+        """
+        self.update_view()
+        if not self.is_detailed:
+            self.draw_density_view()
+            return
+        self.surface.blit(self.background, (0, 0))
+        alive = self.board.engine.get_alive_array()
+        in_view = alive[self.first_row:self.stop_row,
+                        self.first_col:self.stop_col]
+        self.surface.blits(
+            [(self.alive_sprite, (self.cell_xs[col], self.cell_ys[row]))
+             for row, col in np.argwhere(in_view == 1).tolist()],
+            doreturn=False)
+        self.dirty_rects = [self.surface.get_rect()]
+
+    def draw_density_view(self):
+        """
+        Draw the view as densities of live cells and mark the whole surface
+        dirty.
+        """
+        counts = self.viewport.get_live_sample_counts(
+            self.board.engine.get_alive_array())
+        height, width = counts.shape
+        if (self.density_surface is None or
+                self.density_surface.get_size() != (width, height)):
+            self.density_surface = pygame.Surface((width, height), depth=8)
+            self.density_surface.set_palette(self.density_palette)
+        pygame.surfarray.blit_array(self.density_surface, counts.T)
+        if (width, height) != self.surface.get_size():
+            self.surface.blit(self.outlines, (0, 0))
+        self.surface.blit(self.density_surface, (0, 0))
+        self.dirty_rects = [self.surface.get_rect()]
+
+    def draw_cells(self, cell_coords):
+        """
+        Draw the cells at the given (row, col) coords in their current state.
+        Redraws the whole view if the viewport changed, or if it shows
+        densities.
+        """
+        if self.update_view() or not self.is_detailed:
+            self.draw_board()
+            return
+        is_cell_alive = self.board.engine.is_cell_alive
+        first_row, stop_row = self.first_row, self.stop_row
+        first_col, stop_col = self.first_col, self.stop_col
+        self.dirty_rects.extend(self.surface.blits(
+            [(self.alive_sprite if is_cell_alive(row, col)
+              else self.dead_sprite,
+              (self.cell_xs[col-first_col], self.cell_ys[row-first_row]))
+             for row, col in cell_coords
+             if first_row <= row < stop_row and first_col <= col < stop_col]))
+
+    def draw_stat_heatmap(self, category):
+        """
+        Draw the outline grid with each cell filled in the alive color at
+        the cell's stat alpha for the given category (see
+        GameOfLifeBoard.get_stat_alphas). Requires the board's game stats.
+        Heatmaps are cached per category until the board's stats are
+        recalculated or the viewport changes.
+        """
+        self.update_view()
+        stat = self.board.stats[category]
+        cached_stat, heatmap = self.heatmaps.get(category, (None, None))
+        if cached_stat is not stat:
+            alphas = self.board.get_stat_alphas(category)
+            rows = self.row_of_y[np.newaxis, :]
+            cols = self.col_of_x[:, np.newaxis]
+            overlay = pygame.Surface(self.surface.get_size(), pygame.SRCALPHA)
+            overlay.fill(pygame.Color(self.alive_color.r, self.alive_color.g,
+                                      self.alive_color.b, 0))
+            overlay_alphas = pygame.surfarray.pixels_alpha(overlay)
+            overlay_alphas[...] = np.where(
+                (rows >= 0) & (cols >= 0), alphas[rows, cols], 0)
+            del overlay_alphas  # unlocks the overlay
+            heatmap = self.outlines.copy()
+            heatmap.blit(overlay, (0, 0))
+            self.heatmaps[category] = (stat, heatmap)
+
+        self.surface.blit(heatmap, (0, 0))
+        self.dirty_rects = [self.surface.get_rect()]
+
+    def present(self):
+        """
+        Push the parts of the surface drawn since the last call to the
+        display.
+        """
+        if self.dirty_rects:
+            pygame.display.update(self.dirty_rects)
+            self.dirty_rects = []
@@ -0,0 +1,170 @@
+"""
+Life-like cellular automaton rules, parsed from rulestrings.
+
+Supported notations (case insensitive):
+    B3/S23          birth and survival neighbor counts ('S23/B3' works too)
+    23/3            the older survival/birth form
+    B2/S/C3         Generations: cells that do not survive go through
+                    dying states 2 .. C-1 before they are dead; '/3' and
+                    '345/2/4' (survival/birth/states) work too
+Common rules can also be given by name, see RULE_NAMES.
+
+Each rule is compiled into lookup tables once, so engines never test
+rulestring digits while stepping: 'next_states' gives the next state by
+(state, number of live neighbors) and 'neighborhood_table' gives the next
+state of a two-state rule's cell by the bitmask of its 3x3 neighborhood.
+Only cells in state 1 are alive; dying cells count as dead neighbors.
+"""
+import re
+
+try:
+    import numpy as np
+except ImportError:  # only needed for array engines
+    np = None
+
+RULE_NAMES = {
+    'life': 'B3/S23',
+    'conway': 'B3/S23',
+    'highlife': 'B36/S23',
+    'day & night': 'B3678/S34678',
+    'seeds': 'B2/S',
+    'life without death': 'B3/S012345678',
+    "brian's brain": 'B2/S/C3',
+    'star wars': 'B2/S345/C4'
+}
+BIRTH_SURVIVAL_REGEX = re.compile(r'B([0-8]*)/S([0-8]*)(?:/[CG]?(\d+))?')
+SURVIVAL_BIRTH_REGEX = re.compile(r'S([0-8]*)/B([0-8]*)(?:/[CG]?(\d+))?')
+CLASSIC_REGEX = re.compile(r'([0-8]*)/([0-8]*)(?:/(\d+))?')
+# states are stored in uint8 arrays
+MAX_STATES = 256
+# bit of the center cell in a 3x3 neighborhood bitmask
+CENTER_BIT = 4
+
+
+class GameOfLifeRule(object):
+    """
+    A life-like rule: which numbers of live neighbors bring a dead cell to
+    life (birth) and keep a live cell alive (survival), plus the number of
+    cell states for Generations rules (2 for ordinary rules).
+    Rules are equal if they behave the same, whatever their rulestring.
+    """
+    def __init__(self, rulestring='B3/S23'):
+        """
+        Parse and compile the given rulestring or rule name.
+        Raise ValueError if it is not a supported rule.
+        """
+        birth_counts, survival_counts, num_states = parse_rulestring(
+            rulestring)
+        self.birth_counts = frozenset(birth_counts)
+        self.survival_counts = frozenset(survival_counts)
+        self.num_states = num_states
+        self.rulestring = 'B{}/S{}'.format(
+            ''.join(map(str, sorted(self.birth_counts))),
+            ''.join(map(str, sorted(self.survival_counts))))
+        if num_states > 2:
+            self.rulestring += '/C{}'.format(num_states)
+
+        # next state by [state][number of live neighbors]
+        next_states = [
+            [1 if count in self.birth_counts else 0 for count in range(9)],
+            [1 if count in self.survival_counts else 2 % num_states
+             for count in range(9)]
+        ]
+        for state in range(2, num_states):
+            next_states.append([(state+1) % num_states]*9)
+        self.next_states = tuple(tuple(row) for row in next_states)
+        self.table = None
+        if np is not None:
+            self.table = np.array(self.next_states, dtype=np.uint8)
+
+        # next state of a two-state rule's cell by its 3x3 neighborhood,
+        # bit row*3+col set where the cell at (row, col) of it is alive
+        self.neighborhood_table = None
+        if num_states == 2:
+            self.neighborhood_table = tuple(
+                self.next_states[mask >> CENTER_BIT & 1][
+                    bin(mask & ~(1 << CENTER_BIT)).count('1')]
+                for mask in range(512))
+
+    def __str__(self):
+        return self.rulestring
+
+    def __repr__(self):
+        return 'GameOfLifeRule({!r})'.format(self.rulestring)
+
+    def __eq__(self, other):
+        if not isinstance(other, GameOfLifeRule):
+            return NotImplemented
+        return self.rulestring == other.rulestring
+
+    def __hash__(self):
+        return hash(self.rulestring)
+
+    @property
+    def always_counts(self):
+        """
+        Neighbor counts for which a cell is alive next generation whether or
+        not it is alive now.
+        """
+        return self.birth_counts & self.survival_counts
+
+    @property
+    def survival_only_counts(self):
+        """
+        Neighbor counts that keep a live cell alive but do not bring a dead
+        one to life.
+        """
+        return self.survival_counts - self.birth_counts
+
+    @property
+    def birth_only_counts(self):
+        """
+        Neighbor counts that bring a dead cell to life but kill a live one.
+        """
+        return self.birth_counts - self.survival_counts
+
+    def get_next_state(self, state, num_live_neighbors):
+        """
+        Return the next state of a cell in the given state.
+        """
+        return self.next_states[state][num_live_neighbors]
+
+
+def parse_rulestring(rulestring):
+    """
+    Parse a rulestring or rule name.
+    Return (birth counts, survival counts, number of states).
+    Raise ValueError if it is not a supported rule, e.g. a Larger than Life
+    or non-totalistic rule.
+    """
+    rule = RULE_NAMES.get(rulestring.strip().lower(), rulestring)
+    rule = rule.replace(' ', '').upper()
+    match = BIRTH_SURVIVAL_REGEX.fullmatch(rule)
+    if match is not None:
+        birth, survival, num_states = match.groups()
+    else:
+        match = (SURVIVAL_BIRTH_REGEX.fullmatch(rule) or
+                 CLASSIC_REGEX.fullmatch(rule))
+        if match is None:
+            raise ValueError('unsupported rule: {}'.format(rulestring))
+        survival, birth, num_states = match.groups()
+    num_states = 2 if num_states is None else int(num_states)
+    if not 2 <= num_states <= MAX_STATES:
+        raise ValueError('rule must have 2 to {} states: {}'.format(
+            MAX_STATES, rulestring))
+    return ({int(count) for count in birth},
+            {int(count) for count in survival},
+            num_states)
+
+
+def get_rule(rule):
+    """
+    Return rule as a GameOfLifeRule; it may be one already, a rulestring or
+    a rule name.
+    """
+    if isinstance(rule, GameOfLifeRule):
+        return rule
+    return GameOfLifeRule(rule)
+
+
+CONWAY = GameOfLifeRule('B3/S23')
@@ -0,0 +1,228 @@
+"""
+Save and load Game of Life boards as compact, versioned binary snapshots.
+
+Layout (little endian):
+    header        magic, version, number of stat columns, rows, cols,
+                  generation (see HEADER_FORMAT)
+    rule          RULE_SIZE byte, NUL padded rulestring (version 2 and up;
+                  version 1 snapshots are of B3/S23 boards)
+    topology      TOPOLOGY_SIZE byte, NUL padded topology name (version 3
+                  and up; older snapshots use the engine's default)
+    stat keys     one STAT_KEY_SIZE byte, NUL padded name per stat column
+    alive         rows x ceil(cols/8) bytes, each row's cells bit-packed
+                  with column 0 in the high bit of the first byte
+    states        rows x cols uint8 cell states, only for rules with more
+                  than two states (see game_of_life_rules)
+    stat columns  one rows x cols int64 array per stat key, row-major
+Every section after the header starts at a multiple of ALIGNMENT bytes, so
+each one can be memory-mapped directly. Loading maps the file instead of
+reading it, so even a huge snapshot opens instantly and only the parts that
+are used are read from disk.
+"""
+import math
+import os
+import struct
+
+try:
+    import numpy as np
+except ImportError:  # only needed for snapshots
+    np = None
+
+from game_of_life_rules import GameOfLifeRule
+
+MAGIC = b'GOLSNAP\x00'
+VERSION = 3
+SUPPORTED_VERSIONS = (1, 2, 3)
+HEADER_FORMAT = '<8sIIQQQ'
+RULE_SIZE = 64
+TOPOLOGY_SIZE = 16
+STAT_KEY_SIZE = 32
+ALIGNMENT = 64
+STAT_DTYPE = '<i8'
+
+
+class GameOfLifeSnapshot(object):
+    """
+    A snapshot file opened as memory-mapped arrays.
+    'packed_alive' is the bit-packed alive state, 'states' the cell states
+    of a multi-state rule (None for two-state rules) and 'stats' maps each
+    stat key to a (rows, cols) array; none is read until it is used.
+    'topology' is the board's topology name, or None if not saved.
+    """
+    def __init__(self, path, mode='r'):
+        """
+        Open the snapshot at path. Mode is a numpy.memmap mode: 'r' for read
+        only, 'c' for copy-on-write arrays or 'r+' to write through to the
+        file. Raise ValueError if the file is not a snapshot of a supported
+        version.
+        """
+        if np is None:
+            raise ImportError('snapshots require numpy')
+        with open(path, 'rb') as snapshot_file:
+            header = snapshot_file.read(struct.calcsize(HEADER_FORMAT))
+            if len(header) < struct.calcsize(HEADER_FORMAT):
+                raise ValueError('not a snapshot: {}'.format(path))
+            magic, version, num_stats, rows, cols, generation = \
+                struct.unpack(HEADER_FORMAT, header)
+            if magic != MAGIC:
+                raise ValueError('not a snapshot: {}'.format(path))
+            if version not in SUPPORTED_VERSIONS:
+                raise ValueError('unsupported snapshot version {}: {}'.format(
+                    version, path))
+            rule = 'B3/S23'
+            if version >= 2:
+                rule = snapshot_file.read(RULE_SIZE).rstrip(b'\x00').decode()
+            topology = None
+            if version >= 3:
+                topology = snapshot_file.read(TOPOLOGY_SIZE).rstrip(
+                    b'\x00').decode()
+            stat_keys = [
+                snapshot_file.read(STAT_KEY_SIZE).rstrip(b'\x00').decode()
+                for _ in range(num_stats)]
+
+        self.path = path
+        self.rows = rows
+        self.cols = cols
+        self.generation = generation
+        self.rule = GameOfLifeRule(rule)
+        self.topology = topology
+        layout = get_layout(rows, cols, stat_keys, version=version,
+                            num_states=self.rule.num_states)
+        self.packed_alive = np.memmap(
+            path, dtype=np.uint8, mode=mode, offset=layout['alive'],
+            shape=(rows, get_packed_row_size(cols)))
+        self.states = None
+        if 'states' in layout:
+            self.states = np.memmap(
+                path, dtype=np.uint8, mode=mode, offset=layout['states'],
+                shape=(rows, cols))
+        self.stats = {
+            key: np.memmap(path, dtype=STAT_DTYPE, mode=mode,
+                           offset=layout[key], shape=(rows, cols))
+            for key in stat_keys
+        }
+
+    def get_alive(self, rows=slice(None)):
+        """
+        Return a bool array of which cells are alive, for all rows or the
+        given slice of rows.
+        """
+        return np.unpackbits(self.packed_alive[rows], axis=1,
+                             count=self.cols).astype(bool)
+
+    def get_live_cell_coords(self):
+        """
+        Return an (n, 2) array of (row, col) coords of live cells.
+        """
+        return np.argwhere(self.get_alive())
+
+
+def get_packed_row_size(cols):
+    """
+    Return the number of bytes in one bit-packed row.
+    """
+    return math.ceil(cols / 8)
+
+
+def align(offset):
+    """
+    Return the first multiple of ALIGNMENT at or after offset.
+    """
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def get_layout(rows, cols, stat_keys, version=VERSION, num_states=2):
+    """
+    Return a dict mapping 'alive', 'states' (if the rule has more than two
+    states), each stat key and 'end' to their byte offsets in a snapshot.
+    """
+    header_size = struct.calcsize(HEADER_FORMAT)
+    if version >= 2:
+        header_size += RULE_SIZE
+    if version >= 3:
+        header_size += TOPOLOGY_SIZE
+    offset = align(header_size + STAT_KEY_SIZE*len(stat_keys))
+    layout = {'alive': offset}
+    offset = align(offset + rows*get_packed_row_size(cols))
+    if num_states > 2:
+        layout['states'] = offset
+        offset = align(offset + rows*cols)
+    for key in stat_keys:
+        layout[key] = offset
+        offset = align(offset + rows*cols*np.dtype(STAT_DTYPE).itemsize)
+    layout['end'] = offset
+    return layout
+
+
+def save_snapshot(path, alive, stats, generation=0, rule='B3/S23',
+                  topology='bounded', states=None):
+    """
+    Save a board as a snapshot at path.
+
+    :param alive: (rows, cols) array, truthy where cells are alive.
+    :param stats: dict mapping stat keys to (rows, cols) int arrays, in the
+    order to store them (usually GameOfLifeCell.STAT_KEYS).
+    :param generation: the board's generation number.
+    :param rule: the board's rulestring.
+    :param topology: the board's topology name.
+    :param states: (rows, cols) array of cell states, required for rules
+    with more than two states and ignored otherwise.
+
+    Writes to a temporary file first and then replaces path, so an
+    interrupted save never leaves a broken snapshot behind.
+    """
+    if np is None:
+        raise ImportError('snapshots require numpy')
+    rows, cols = alive.shape
+    stat_keys = list(stats)
+    for key in stat_keys:
+        if len(key.encode()) > STAT_KEY_SIZE:
+            raise ValueError('stat key too long: {}'.format(key))
+    if len(rule.encode()) > RULE_SIZE:
+        raise ValueError('rule too long: {}'.format(rule))
+    if len(topology.encode()) > TOPOLOGY_SIZE:
+        raise ValueError('topology name too long: {}'.format(topology))
+    num_states = GameOfLifeRule(rule).num_states
+    if num_states > 2 and states is None:
+        raise ValueError('rule {} needs cell states'.format(rule))
+    layout = get_layout(rows, cols, stat_keys, num_states=num_states)
+
+    temp_path = '{}.tmp{}'.format(path, os.getpid())
+    with open(temp_path, 'wb') as snapshot_file:
+        snapshot_file.write(struct.pack(
+            HEADER_FORMAT, MAGIC, VERSION, len(stat_keys), rows, cols,
+            generation))
+        snapshot_file.write(rule.encode().ljust(RULE_SIZE, b'\x00'))
+        snapshot_file.write(topology.encode().ljust(TOPOLOGY_SIZE, b'\x00'))
+        for key in stat_keys:
+            snapshot_file.write(key.encode().ljust(STAT_KEY_SIZE, b'\x00'))
+        snapshot_file.truncate(layout['end'])
+
+    packed_alive = np.memmap(
+        temp_path, dtype=np.uint8, mode='r+', offset=layout['alive'],
+        shape=(rows, get_packed_row_size(cols)))
+    packed_alive[...] = np.packbits(np.asarray(alive, dtype=bool), axis=1)
+    packed_alive.flush()
+    del packed_alive
+    if 'states' in layout:
+        state_array = np.memmap(
+            temp_path, dtype=np.uint8, mode='r+', offset=layout['states'],
+            shape=(rows, cols))
+        state_array[...] = states
+        state_array.flush()
+        del state_array
+    for key in stat_keys:
+        stat_array = np.memmap(
+            temp_path, dtype=STAT_DTYPE, mode='r+', offset=layout[key],
+            shape=(rows, cols))
+        stat_array[...] = stats[key]
+        stat_array.flush()
+        del stat_array
+    os.replace(temp_path, path)
+
+
+def load_snapshot(path, mode='r'):
+    """
+    Open the snapshot at path; see GameOfLifeSnapshot.
+    """
+    return GameOfLifeSnapshot(path, mode=mode)
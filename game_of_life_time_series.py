@@ -0,0 +1,248 @@
+import csv
+
+try:
+    import numpy as np
+except ImportError:  # only needed when time series are recorded
+    np = None
+
+
+class GameOfLifeTimeSeries(object):
+    """
+    Record a board's population metrics (see METRICS) every generation.
+
+    Metrics are kept up to date from each generation's flipped cells: the
+    series tracks which cells are alive, how many live cells each row and
+    col has and the sums of their coords, so a generation costs
+    O(flipped cells + rows + cols) and never a pass over the board.
+    The empty board's bounding box and center are -1.
+
+    Values are kept in buckets of 'bucket_size' consecutive generations,
+    each with the min, max and sum of every metric, in preallocated numpy
+    columns that double when full. With 'max_buckets', once every bucket is
+    used, pairs of buckets are merged and the bucket size doubles, so a run
+    of any length takes at most max_buckets buckets and keeps at least half
+    of them.
+    """
+    METRICS = ('population', 'births', 'deaths', 'min_row', 'max_row',
+               'min_col', 'max_col', 'center_row', 'center_col')
+    DEFAULT_MAX_BUCKETS = 2**16
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, rows, cols, num_states=2,
+                 max_buckets=DEFAULT_MAX_BUCKETS):
+        """
+        Init an empty time series of a rows x cols board whose cells take
+        the given number of states.
+
+        :param max_buckets: most buckets to keep before downsampling; None
+        keeps every generation in its own bucket.
+        """
+        if np is None:
+            raise ImportError('recording time series requires numpy')
+        if max_buckets is not None and max_buckets < 2:
+            raise ValueError('max_buckets must be at least 2')
+        self.rows = rows
+        self.cols = cols
+        self.num_states = num_states
+        self.max_buckets = max_buckets
+        self.bucket_size = 1
+        capacity = self.INITIAL_CAPACITY
+        if max_buckets is not None:
+            capacity = min(capacity, max_buckets)
+        # per bucket: first generation, number of generations, and the
+        # min, max and sum of each metric
+        self.generations = np.zeros(capacity, dtype=np.int64)
+        self.counts = np.zeros(capacity, dtype=np.int64)
+        self.mins = np.zeros((capacity, len(self.METRICS)))
+        self.maxes = np.zeros((capacity, len(self.METRICS)))
+        self.sums = np.zeros((capacity, len(self.METRICS)))
+        self.num_buckets = 0
+        # tracked board state, set by 'reset'
+        self.alive = None
+        self.row_counts = None
+        self.col_counts = None
+        self.population = 0
+        self.row_sum = 0
+        self.col_sum = 0
+        self.min_row = self.max_row = self.min_col = self.max_col = -1
+        self.last_generation = None
+
+    def __len__(self):
+        return self.num_buckets
+
+    def reset(self, board):
+        """
+        Start tracking the board from its current cells, and record its
+        current generation if nothing is recorded yet.
+        """
+        self.alive = board.engine.get_alive_array() == 1
+        self.row_counts = np.count_nonzero(self.alive, axis=1)
+        self.col_counts = np.count_nonzero(self.alive, axis=0)
+        self.population = int(self.row_counts.sum())
+        self.row_sum = int(self.row_counts @ np.arange(self.rows))
+        self.col_sum = int(self.col_counts @ np.arange(self.cols))
+        self.min_row, self.max_row = get_bounds(self.row_counts)
+        self.min_col, self.max_col = get_bounds(self.col_counts)
+        if not self.num_buckets:
+            self.append(board.generation, 0, 0)
+        self.last_generation = board.generation
+
+    def record(self, board):
+        """
+        Record the generation the board just advanced to from the cells
+        that flipped. Call 'reset' first, and again whenever the board
+        changes other than by advancing one generation.
+        """
+        coords = np.asarray(board.cells_to_flip, dtype=np.intp)
+        coords = coords.reshape(-1, 2)
+        rows, cols = coords[:, 0], coords[:, 1]
+        # flat indexing is much faster than indexing by (rows, cols)
+        indexes = rows*self.cols + cols
+        alive = self.alive.ravel()
+        was_alive = alive[indexes]
+        if self.num_states > 2:
+            is_alive = board.engine.get_alive_array().ravel()[indexes] == 1
+        else:
+            is_alive = ~was_alive
+        alive[indexes] = is_alive
+        # +1 for each cell born, -1 for each that died, and 0 for cells of
+        # rules with more than two states that went from dying to dead
+        changes = is_alive.astype(np.intp) - was_alive
+        births = int(np.count_nonzero(changes > 0))
+        deaths = int(np.count_nonzero(changes < 0))
+        if births or deaths:
+            np.add.at(self.row_counts, rows, changes)
+            np.add.at(self.col_counts, cols, changes)
+            self.population += births - deaths
+            self.row_sum += int(rows @ changes)
+            self.col_sum += int(cols @ changes)
+            self.min_row, self.max_row = get_bounds(self.row_counts)
+            self.min_col, self.max_col = get_bounds(self.col_counts)
+        self.append(board.generation, births, deaths)
+        self.last_generation = board.generation
+
+    def append(self, generation, births, deaths):
+        """
+        Add a generation's metrics to the last bucket, or to a new one if
+        the last is full.
+        """
+        population = self.population
+        if population:
+            center_row = self.row_sum / population
+            center_col = self.col_sum / population
+        else:
+            center_row = center_col = -1
+        values = (population, births, deaths, self.min_row, self.max_row,
+                  self.min_col, self.max_col, center_row, center_col)
+        index = self.num_buckets-1
+        if (self.num_buckets == self.max_buckets and
+                self.counts[index] >= self.bucket_size):
+            self.downsample()
+            index = self.num_buckets-1
+        if index < 0 or self.counts[index] >= self.bucket_size:
+            if self.num_buckets == len(self.counts):
+                self.grow()
+            index = self.num_buckets
+            self.num_buckets += 1
+            self.generations[index] = generation
+            self.counts[index] = 1
+            self.mins[index] = self.maxes[index] = self.sums[index] = values
+            return
+        self.counts[index] += 1
+        np.minimum(self.mins[index], values, out=self.mins[index])
+        np.maximum(self.maxes[index], values, out=self.maxes[index])
+        self.sums[index] += values
+
+    def grow(self):
+        """
+        Double the capacity of the columns, up to max_buckets.
+        """
+        capacity = 2*len(self.counts)
+        if self.max_buckets is not None:
+            capacity = min(capacity, self.max_buckets)
+        for name in ('generations', 'counts', 'mins', 'maxes', 'sums'):
+            column = getattr(self, name)
+            grown = np.zeros((capacity,) + column.shape[1:], column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+
+    def downsample(self):
+        """
+        Merge each pair of buckets into one and double the bucket size.
+        """
+        num_buckets = self.num_buckets
+        pairs = num_buckets // 2
+        odd = num_buckets % 2
+        self.generations[:pairs] = self.generations[:2*pairs:2]
+        self.counts[:pairs] = (self.counts[:2*pairs:2] +
+                               self.counts[1:2*pairs:2])
+        self.mins[:pairs] = np.minimum(self.mins[:2*pairs:2],
+                                       self.mins[1:2*pairs:2])
+        self.maxes[:pairs] = np.maximum(self.maxes[:2*pairs:2],
+                                        self.maxes[1:2*pairs:2])
+        self.sums[:pairs] = self.sums[:2*pairs:2] + self.sums[1:2*pairs:2]
+        if odd:
+            for column in (self.generations, self.counts, self.mins,
+                           self.maxes, self.sums):
+                column[pairs] = column[num_buckets-1]
+        self.num_buckets = pairs + odd
+        self.bucket_size *= 2
+
+    def get_columns(self):
+        """
+        Return a dict of equal-length numpy arrays, one row per bucket:
+        'generation' (the bucket's first generation), 'generations' (how
+        many it holds), and for each metric its mean and, as
+        '<metric>_min' and '<metric>_max', its min and max over the bucket.
+        Without downsampling, each bucket is one generation and all three
+        are its value.
+        """
+        num_buckets = self.num_buckets
+        counts = self.counts[:num_buckets]
+        columns = {
+            'generation': self.generations[:num_buckets].copy(),
+            'generations': counts.copy()
+        }
+        means = self.sums[:num_buckets] / np.maximum(counts, 1)[:, np.newaxis]
+        for index, metric in enumerate(self.METRICS):
+            columns[metric] = means[:, index]
+            columns[metric + '_min'] = self.mins[:num_buckets, index].copy()
+            columns[metric + '_max'] = self.maxes[:num_buckets, index].copy()
+        return columns
+
+    def to_array(self):
+        """
+        Return the columns (see 'get_columns') as a numpy structured array.
+        """
+        columns = self.get_columns()
+        array = np.zeros(self.num_buckets, dtype=[
+            (name, column.dtype) for name, column in columns.items()])
+        for name, column in columns.items():
+            array[name] = column
+        return array
+
+    def save(self, path):
+        """
+        Save the columns (see 'get_columns') to path: as a numpy structured
+        array if path ends with '.npy', and as CSV otherwise.
+        """
+        if path.endswith('.npy'):
+            np.save(path, self.to_array())
+            return
+        columns = self.get_columns()
+        with open(path, 'w', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(columns)
+            writer.writerows(zip(*(column.tolist()
+                                   for column in columns.values())))
+
+
+def get_bounds(counts):
+    """
+    Return the (first, last) indexes of the nonzero counts, or (-1, -1) if
+    there are none.
+    """
+    nonzero = np.flatnonzero(counts)
+    if not len(nonzero):
+        return -1, -1
+    return int(nonzero[0]), int(nonzero[-1])
@@ -0,0 +1,216 @@
+"""
+Board topologies: how the edges of a board connect.
+
+    bounded       cells beyond the edges are always dead
+    torus         leaving one edge re-enters at the opposite one
+    klein bottle  like a torus, but leaving the top or bottom edge
+                  re-enters at the opposite one mirrored left to right
+    infinite      the board is a window onto an unbounded universe that
+                  grows as patterns spread; cells beyond the edges keep
+                  evolving and may come back
+
+Edges are resolved once, into tables, so engines never test coords while
+stepping: 'neighbor_coords' lists every cell's neighbors for code that
+reads cells one at a time, and 'pad' fills the border of the padded arrays
+that array engines count neighbors in from precomputed indexes (the python
+engine fills its padded bytearray's border from 'wrap' the same way).
+
+In RLE rules the finite topologies are written as Golly's suffixes, e.g.
+'B3/S23:T40,30' for a 40 wide, 30 high torus (see 'split_rule_suffix').
+"""
+import re
+
+try:
+    import numpy as np
+except ImportError:  # only needed for array engines
+    np = None
+
+NEIGHBOR_OFFSETS = tuple((d_row, d_col) for d_row in (-1, 0, 1)
+                         for d_col in (-1, 0, 1) if d_row or d_col)
+RULE_SUFFIX_REGEX = re.compile(r'([PTK])(\d+)(\*?),(\d+)', re.IGNORECASE)
+
+
+class GameOfLifeTopology(object):
+    """
+    A bounded rows x cols board: cells beyond the edges are always dead.
+    Other topologies override 'wrap'.
+    """
+    NAME = 'bounded'
+    # letter of the Golly rule suffix, None if it has none
+    RULE_SUFFIX = 'P'
+    # if True, engines keep evolving cells beyond the edges
+    IS_INFINITE = False
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self._neighbor_coords = None
+        # (start, stop) -> indexes of padded border cells, see 'pad'
+        self._border_indexes = {}
+
+    def __str__(self):
+        return self.NAME
+
+    def wrap(self, row, col):
+        """
+        Return the board coords of the cell at (row, col), which is on the
+        board or one cell beyond an edge, or None if there is no such cell
+        on the board.
+        """
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row, col
+        return None
+
+    @property
+    def neighbor_coords(self):
+        """
+        Nested lists of a tuple of the coords of each cell's neighbors on the
+        board, indexed [row][col]. Built on first use.
+        """
+        if self._neighbor_coords is None:
+            self._neighbor_coords = [
+                [tuple(coords for coords in (
+                    self.wrap(row+d_row, col+d_col)
+                    for d_row, d_col in NEIGHBOR_OFFSETS)
+                    if coords is not None)
+                 for col in range(self.cols)]
+                for row in range(self.rows)
+            ]
+        return self._neighbor_coords
+
+    def get_border_indexes(self, start, stop):
+        """
+        Return (padded rows, padded cols, board rows, board cols) int arrays
+        with, for each border cell of the padded array of board rows
+        [start, stop) that shows a board cell, its position in the padded
+        array and the coords of the board cell (see 'pad').
+        """
+        key = (start, stop)
+        if key not in self._border_indexes:
+            height, width = stop-start+2, self.cols+2
+            border = ([(0, col) for col in range(width)] +
+                      [(height-1, col) for col in range(width)] +
+                      [(row, 0) for row in range(1, height-1)] +
+                      [(row, width-1) for row in range(1, height-1)])
+            indexes = [
+                padded_coords + board_coords
+                for padded_coords, board_coords in (
+                    ((row, col), self.wrap(start+row-1, col-1))
+                    for row, col in border)
+                if board_coords is not None]
+            self._border_indexes[key] = tuple(
+                np.array(column, dtype=np.intp)
+                for column in zip(*indexes)) if indexes else (
+                np.zeros(0, dtype=np.intp),)*4
+        return self._border_indexes[key]
+
+    def pad(self, cells, padded, start=0, stop=None):
+        """
+        Copy rows [start, stop) of a (rows, cols) array of cells into the
+        middle of padded, a (stop-start+2, cols+2) array, and fill its
+        border with the cells beyond them: rows of the board above and
+        below, or cells wrapped around the edges. Border cells with no
+        board cell are left as they are (zero for a zeroed array).
+        Leading axes pad a stack of boards at once, e.g. an (n, rows, cols)
+        array into an (n, stop-start+2, cols+2) one.
+        Return padded.
+        """
+        if stop is None:
+            stop = self.rows
+        padded[..., 1:-1, 1:-1] = cells[..., start:stop, :]
+        padded_rows, padded_cols, board_rows, board_cols = \
+            self.get_border_indexes(start, stop)
+        padded[..., padded_rows, padded_cols] = \
+            cells[..., board_rows, board_cols]
+        return padded
+
+
+class GameOfLifeTorus(GameOfLifeTopology):
+    """
+    A board whose opposite edges are joined.
+    """
+    NAME = 'torus'
+    RULE_SUFFIX = 'T'
+
+    def wrap(self, row, col):
+        return row % self.rows, col % self.cols
+
+
+class GameOfLifeKleinBottle(GameOfLifeTopology):
+    """
+    A board whose left and right edges are joined, and whose top and bottom
+    edges are joined with a twist: column c meets column cols-1-c.
+    """
+    NAME = 'klein bottle'
+    RULE_SUFFIX = 'K'
+
+    def wrap(self, row, col):
+        col %= self.cols
+        if not 0 <= row < self.rows:
+            row %= self.rows
+            col = self.cols-1 - col
+        return row, col
+
+
+class GameOfLifeInfinitePlane(GameOfLifeTopology):
+    """
+    A board that is a window onto an unbounded universe.
+    'neighbor_coords' and 'pad' only cover the board's own cells; engines
+    keep track of the cells beyond its edges.
+    """
+    NAME = 'infinite'
+    RULE_SUFFIX = None
+    IS_INFINITE = True
+
+
+TOPOLOGIES = {
+    topology.NAME: topology
+    for topology in (GameOfLifeTopology, GameOfLifeTorus,
+                     GameOfLifeKleinBottle, GameOfLifeInfinitePlane)
+}
+
+
+def get_topology(name, rows, cols):
+    """
+    Return the named topology for a rows x cols board.
+    Raise ValueError for unknown names.
+    """
+    if name not in TOPOLOGIES:
+        raise ValueError('unknown topology: {}'.format(name))
+    return TOPOLOGIES[name](rows, cols)
+
+
+def get_rule_suffix(topology):
+    """
+    Return the Golly rule suffix for a topology, e.g. ':T40,30', or '' for
+    the infinite one.
+    """
+    if topology.RULE_SUFFIX is None:
+        return ''
+    return ':{}{}{},{}'.format(
+        topology.RULE_SUFFIX, topology.cols,
+        '*' if topology.RULE_SUFFIX == 'K' else '', topology.rows)
+
+
+def split_rule_suffix(rulestring):
+    """
+    Split a rulestring that may have a Golly topology suffix.
+    Return (rulestring without suffix, topology name, rows, cols); the last
+    three are None without a suffix.
+    Raise ValueError for suffixes of unsupported topologies, such as Klein
+    bottles twisted on their left and right edges or unbounded strips.
+    """
+    rulestring, _, suffix = rulestring.partition(':')
+    if not suffix:
+        return rulestring, None, None, None
+    match = RULE_SUFFIX_REGEX.fullmatch(suffix.strip())
+    if match is None:
+        raise ValueError('unsupported topology: {}'.format(suffix))
+    letter, cols, twist, rows = match.groups()
+    letter = letter.upper()
+    rows, cols = int(rows), int(cols)
+    if not rows or not cols or bool(twist) != (letter == 'K'):
+        raise ValueError('unsupported topology: {}'.format(suffix))
+    name = next(topology.NAME for topology in TOPOLOGIES.values()
+                if topology.RULE_SUFFIX == letter)
+    return rulestring, name, rows, cols
@@ -0,0 +1,185 @@
+import math
+
+try:
+    import numpy as np
+except ImportError:  # only needed for density views
+    np = None
+
+
+class GameOfLifeViewport(object):
+    """
+    A camera onto a board: which part of the board a width x height pixel
+    window shows, and how big its cells are drawn.
+
+    The viewport's position is the board coords of the window's top left
+    corner, in (fractional) cells, and its zoom is the size of a cell in
+    pixels. Zoomed all the way out the whole board fits the window; zoomed
+    in, the window pans over part of it and never past its edges.
+
+    Cells of at least DETAIL_CELL_SIZE pixels are drawn one by one (see
+    'is_detailed'). Smaller cells are drawn as a density view instead, in
+    which each pixel shows the fraction of live cells under it (see
+    'get_live_sample_counts'), so drawing a frame costs about the same
+    however big the board is.
+    """
+    # smallest cell size in pixels whose shape is still visible inside its
+    # outline
+    DETAIL_CELL_SIZE = 3
+    # largest cell size in pixels to zoom in to
+    MAX_CELL_SIZE = 64
+    # cells a density view samples per pixel along each axis
+    DENSITY_SAMPLES = 2
+
+    def __init__(self, rows, cols, width, height, cell_width=None,
+                 cell_height=None):
+        """
+        Init a viewport of a rows x cols board in a width x height window.
+        Cell sizes default to fitting the whole board in the window, which
+        is also the furthest the viewport zooms out.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.width = width
+        self.height = height
+        self.fit_cell_width = width / cols
+        self.fit_cell_height = height / rows
+        self.cell_width = cell_width or self.fit_cell_width
+        self.cell_height = cell_height or self.fit_cell_height
+        # board coords of the window's top left corner
+        self.row = 0.0
+        self.col = 0.0
+
+    def get_state(self):
+        """
+        Return a tuple that changes whenever the viewport pans or zooms.
+        """
+        return (self.row, self.col, self.cell_width, self.cell_height)
+
+    def is_detailed(self):
+        """
+        Return True if cells are big enough to draw one by one, False if
+        the viewport shows a density view.
+        """
+        return min(self.cell_width, self.cell_height) >= self.DETAIL_CELL_SIZE
+
+    def fit(self):
+        """
+        Zoom out to show the whole board.
+        """
+        self.cell_width = self.fit_cell_width
+        self.cell_height = self.fit_cell_height
+        self.row = self.col = 0.0
+
+    def pan(self, dx, dy):
+        """
+        Move the view dx pixels right and dy pixels down, up to the board's
+        edges.
+        """
+        self.col += dx / self.cell_width
+        self.row += dy / self.cell_height
+        self.clamp()
+
+    def zoom(self, factor, x=None, y=None):
+        """
+        Multiply the cell size by factor, between fitting the whole board
+        and MAX_CELL_SIZE, keeping the board point under the pixel (x, y)
+        (by default the window's center) in place.
+        """
+        if x is None:
+            x, y = self.width / 2, self.height / 2
+        row, col = self.get_board_coords(x, y)
+        max_factor = self.MAX_CELL_SIZE / min(self.cell_width,
+                                              self.cell_height)
+        min_factor = max(self.fit_cell_width / self.cell_width,
+                         self.fit_cell_height / self.cell_height)
+        factor = min(max(factor, min_factor), max(max_factor, min_factor))
+        self.cell_width *= factor
+        self.cell_height *= factor
+        self.col = col - x / self.cell_width
+        self.row = row - y / self.cell_height
+        self.clamp()
+
+    def clamp(self):
+        """
+        Keep the view within the board's edges.
+        """
+        self.col = min(max(self.col, 0.0),
+                       max(self.cols - self.width / self.cell_width, 0.0))
+        self.row = min(max(self.row, 0.0),
+                       max(self.rows - self.height / self.cell_height, 0.0))
+
+    def get_board_coords(self, x, y):
+        """
+        Return the fractional (row, col) board coords under the pixel
+        (x, y).
+        """
+        return self.row + y / self.cell_height, self.col + x / self.cell_width
+
+    def get_cell_at(self, x, y):
+        """
+        Return the (row, col) coords of the cell under the pixel (x, y), or
+        None if there is no cell there.
+        """
+        row, col = self.get_board_coords(x, y)
+        row, col = math.floor(row), math.floor(col)
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row, col
+        return None
+
+    def get_screen_coords(self, row, col):
+        """
+        Return the (x, y) pixel of the top left corner of the cell at
+        (row, col).
+        """
+        return (math.floor((col - self.col) * self.cell_width),
+                math.floor((row - self.row) * self.cell_height))
+
+    def get_visible_cells(self):
+        """
+        Return (first row, stop row, first col, stop col) of the cells at
+        least partly in the window.
+        """
+        return (math.floor(self.row),
+                min(math.ceil(self.row + self.height / self.cell_height),
+                    self.rows),
+                math.floor(self.col),
+                min(math.ceil(self.col + self.width / self.cell_width),
+                    self.cols))
+
+    def get_pixel_samples(self, start, cell_size, num_cells, num_pixels,
+                          samples=None):
+        """
+        Return an int array of the cells sampled along one axis, from the
+        cell at start, for 'get_live_sample_counts': the given number of
+        evenly spaced cells (by default DENSITY_SAMPLES) under each pixel
+        that shows the board. One sample is the cell at the pixel's center.
+        """
+        num_pixels = min(num_pixels,
+                         math.ceil((num_cells - start) * cell_size))
+        samples = samples or self.DENSITY_SAMPLES
+        offsets = (np.arange(num_pixels*samples) + 0.5) / samples
+        return np.minimum(np.floor(start + offsets / cell_size),
+                          num_cells-1).astype(np.intp)
+
+    def get_live_sample_counts(self, states):
+        """
+        Return a (pixels high, pixels wide) uint8 array of how many of the
+        DENSITY_SAMPLES**2 cells sampled under each pixel of the window are
+        alive, from the window's top left corner to the board's edges, given
+        the board's (rows, cols) array of cell states (1 for live cells).
+        A pixel's count over DENSITY_SAMPLES**2 is the density of live cells
+        under it. Samples are taken on a grid, so the cost depends on the
+        window's size and not on the board's.
+        """
+        samples = self.DENSITY_SAMPLES
+        rows = self.get_pixel_samples(self.row, self.cell_height, self.rows,
+                                      self.height)
+        cols = self.get_pixel_samples(self.col, self.cell_width, self.cols,
+                                      self.width)
+        live = states.take(rows, axis=0).take(cols, axis=1) == 1
+        counts = np.zeros((len(rows) // samples, len(cols) // samples),
+                          dtype=np.uint8)
+        for row_offset in range(samples):
+            for col_offset in range(samples):
+                counts += live[row_offset::samples, col_offset::samples]
+        return counts
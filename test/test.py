@@ -7,11 +7,38 @@ import unittest
 from .test_game_of_life_cell import TestGameOfLifeCell
 from .test_game_of_life_board import TestGameOfLifeBoard
 from .test_game_of_life import TestGameOfLife
+from .test_game_of_life_engine import TestGameOfLifeEngine
+from .test_game_of_life_headless import TestGameOfLifeHeadless
+from .test_game_of_life_hashlife import TestGameOfLifeHashLife
+from .test_game_of_life_bitboard import TestGameOfLifeBitBoard
+from .test_game_of_life_renderer import TestGameOfLifeRenderer
+from .test_game_of_life_benchmark import TestGameOfLifeBenchmark
+from .test_game_of_life_cycle import TestGameOfLifeCycle
+from .test_game_of_life_driver import TestGameOfLifeDriver
+from .test_game_of_life_snapshot import TestGameOfLifeSnapshot
+from .test_game_of_life_patterns import TestGameOfLifePatterns
+from .test_game_of_life_rules import TestGameOfLifeRules
+from .test_game_of_life_topology import TestGameOfLifeTopology
+from .test_game_of_life_ensemble import TestGameOfLifeEnsemble
+from .test_game_of_life_profiler import TestGameOfLifeProfiler
+from .test_game_of_life_viewport import TestGameOfLifeViewport
+from .test_game_of_life_pipeline import TestGameOfLifePipeline
+from .test_game_of_life_history import TestGameOfLifeHistory
+from .test_game_of_life_time_series import TestGameOfLifeTimeSeries
 
 
 def main():
     test_classes_to_run = [TestGameOfLifeCell, TestGameOfLifeBoard,
-                           TestGameOfLife]
+                           TestGameOfLife, TestGameOfLifeEngine,
+                           TestGameOfLifeHeadless, TestGameOfLifeHashLife,
+                           TestGameOfLifeBitBoard, TestGameOfLifeRenderer,
+                           TestGameOfLifeBenchmark, TestGameOfLifeCycle,
+                           TestGameOfLifeDriver, TestGameOfLifeSnapshot,
+                           TestGameOfLifePatterns, TestGameOfLifeRules,
+                           TestGameOfLifeTopology, TestGameOfLifeEnsemble,
+                           TestGameOfLifeProfiler, TestGameOfLifeViewport,
+                           TestGameOfLifePipeline, TestGameOfLifeHistory,
+                           TestGameOfLifeTimeSeries]
 
     loader = unittest.TestLoader()
 
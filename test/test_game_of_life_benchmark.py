@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+import unittest
+
+from game_of_life_benchmark import (check_import_budget, compare_results,
+                                    run_benchmarks, run_import_benchmarks)
+from game_of_life_patterns import center_coords, get_pattern_coords
+
+
+class TestGameOfLifeBenchmark(unittest.TestCase):
+    """
+    Test the benchmark suite and the patterns it runs.
+    """
+
+    def setUp(self):
+        """
+        Called before each test method.
+        """
+        pass
+
+    def tearDown(self):
+        """
+        Called after each test method.
+        """
+        pass
+
+    def test_center_coords(self):
+        """
+        Test centering a pattern on a board.
+        """
+        glider = get_pattern_coords('glider')
+        self.assertEqual(glider, {(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)})
+        self.assertEqual(center_coords(glider, 5, 5),
+                         {(1, 2), (2, 3), (3, 1), (3, 2), (3, 3)})
+        self.assertRaises(ValueError, center_coords, glider, 2, 5)
+
+    def test_run_benchmarks(self):
+        """
+        Test a tiny benchmark run reports every runnable case.
+        """
+        results = run_benchmarks(
+            benchmarks=['step', 'stats', 'stat_alphas'],
+            engines=['python', 'numpy'], sizes=[16], densities=[0.3],
+            patterns=['glider'], min_time=0)
+        cases = {(result['benchmark'], result['engine'], result['workload'])
+                 for result in results['results']}
+        # the vectorized stat alphas are only run on array engines
+        self.assertEqual(len(cases), 10)
+        self.assertNotIn(('stat_alphas', 'python', 'glider'), cases)
+        for result in results['results']:
+            self.assertGreater(result['cells_per_second'], 0)
+
+    def test_compare_results(self):
+        """
+        Test regressions are reported only beyond the tolerance.
+        """
+        def make_results(cells_per_second):
+            return {'results': [
+                {'benchmark': 'step', 'engine': 'numpy', 'rows': 8, 'cols': 8,
+                 'workload': 'glider', 'cells_per_second': cells_per_second}]}
+
+        baseline = make_results(100.0)
+        self.assertEqual(compare_results(make_results(90.0), baseline, 0.2),
+                         [])
+        regressions = compare_results(make_results(50.0), baseline, 0.2)
+        self.assertEqual(len(regressions), 1)
+        self.assertEqual(regressions[0]['ratio'], 0.5)
+
+    def test_import_benchmarks(self):
+        """
+        Test that the headless modules import without slow modules, and
+        that imports over budget are reported.
+        """
+        results = run_import_benchmarks(repeat=1)
+        self.assertEqual([result['module'] for result in results],
+                         ['game_of_life_board', 'game_of_life_headless'])
+        for result in results:
+            self.assertEqual(result['slow_modules'], [], result['module'])
+        self.assertEqual(check_import_budget(results, 60), [])
+        self.assertEqual(check_import_budget(results, 0), results)
+        slow_result = dict(results[0], slow_modules=['scipy'])
+        self.assertEqual(check_import_budget([slow_result], 60),
+                         [slow_result])
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+import unittest
+
+import numpy as np
+
+from game_of_life_bitboard import GameOfLifeBitBoard
+from game_of_life_board import GameOfLifeBoard
+from .test_game_of_life_engine import random_live_cell_coords
+
+
+class TestGameOfLifeBitBoard(unittest.TestCase):
+    """
+    Test the GameOfLifeBitBoard class.
+    """
+
+    def setUp(self):
+        """
+        Called before each test method.
+        """
+        pass
+
+    def tearDown(self):
+        """
+        Called after each test method.
+        """
+        pass
+
+    def test_init(self):
+        """
+        Test creating a new GameOfLifeBitBoard.
+        """
+        bit_board = GameOfLifeBitBoard(3, 70, {(0, 0), (2, 69)})
+        self.assertEqual((bit_board.rows, bit_board.cols), (3, 70))
+        self.assertEqual(len(bit_board.board), 3)
+        self.assertEqual(len(bit_board.board[0]), 70)
+        self.assertTrue(bit_board.board[2][69].is_alive)
+        self.assertFalse(bit_board.board[2][68].is_alive)
+        self.assertEqual(sorted(bit_board.get_live_cell_coords()),
+                         [(0, 0), (2, 69)])
+
+    def test_advance_board_one_generation(self):
+        """
+        Test that GameOfLifeBitBoard's 'advance_board_one_generation' method
+        matches GameOfLifeBoard.
+        """
+        live_cell_coords = random_live_cell_coords(37, 75, 0.4, seed=3)
+        board = GameOfLifeBoard(37, 75, live_cell_coords)
+        bit_board = GameOfLifeBitBoard(37, 75, live_cell_coords)
+        for _ in range(50):
+            self.assertEqual(board.advance_board_one_generation(),
+                             bit_board.advance_board_one_generation())
+            self.assertEqual(
+                [[cell.is_alive for cell in row] for row in board.board],
+                [[cell.is_alive for cell in row] for row in bit_board.board])
+
+    def test_topologies(self):
+        """
+        Test that GameOfLifeBitBoard matches GameOfLifeBoard on each
+        topology it supports, including boards one cell wide or high, and
+        rejects the infinite topology.
+        """
+        for rows, cols, density in [(23, 70, 0.4), (1, 9, 0.6),
+                                    (7, 1, 0.6), (2, 3, 0.5)]:
+            live_cell_coords = random_live_cell_coords(rows, cols, density,
+                                                       seed=rows)
+            for topology in ('bounded', 'torus', 'klein bottle'):
+                for rule in ('B3/S23', 'B36/S23'):
+                    board = GameOfLifeBoard(rows, cols, live_cell_coords,
+                                            engine='numpy', rule=rule,
+                                            topology=topology)
+                    bit_board = GameOfLifeBitBoard(
+                        rows, cols, live_cell_coords, rule=board.rule,
+                        topology=topology)
+                    for _ in range(20):
+                        board.advance_board_one_generation()
+                        bit_board.advance_board_one_generation()
+                        self.assertEqual(
+                            sorted(map(tuple, board.get_live_cell_coords())),
+                            sorted(bit_board.get_live_cell_coords()),
+                            (rows, cols, topology, rule))
+        with self.assertRaises(ValueError):
+            GameOfLifeBitBoard(3, 3, topology='infinite')
+
+    def test_init_from_array(self):
+        """
+        Test creating a GameOfLifeBitBoard from an (n, 2) int array, as
+        pattern files are parsed, with columns past 64.
+        """
+        bit_board = GameOfLifeBitBoard(2, 100, np.array([[1, 99], [0, 64]]))
+        self.assertEqual(sorted(bit_board.get_live_cell_coords()),
+                         [(0, 64), (1, 99)])
+
+    def test_set_cell_state(self):
+        """
+        Test setting cells through cell views.
+        """
+        bit_board = GameOfLifeBitBoard(2, 2)
+        bit_board.board[1][0].is_alive = True
+        self.assertEqual(bit_board.population, 1)
+        bit_board.board[1][0].is_alive = False
+        self.assertEqual(bit_board.population, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
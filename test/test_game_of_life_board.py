@@ -1,6 +1,12 @@
 #!/usr/bin/env python
+import random
 import unittest
 
+import numpy as np
+
+import game_of_life_board
+from game_of_life_board import GameOfLifeBoard
+
 
 class TestGameOfLifeBoard(unittest.TestCase):
     """
@@ -29,19 +35,209 @@ class TestGameOfLifeBoard(unittest.TestCase):
         """
         Test GameOfLifeBoard's 'advance_board_one_generation' method.
         """
-        pass
+        board = GameOfLifeBoard(5, 5, {(2, 1), (2, 2), (2, 3)})
+        self.assertTrue(board.advance_board_one_generation())
+        self.assertEqual(
+            {(row, col) for row in range(5) for col in range(5)
+             if board.board[row][col].is_alive},
+            {(1, 2), (2, 2), (3, 2)})
+        self.assertEqual(board.board[1][2].stats['births'], 1)
+        self.assertEqual(board.board[2][1].stats['deaths'], 1)
+        self.assertEqual(board.board[2][2].stats['gens_alive'], 1)
+
+        still_life = GameOfLifeBoard(4, 4, {(1, 1), (1, 2), (2, 1), (2, 2)})
+        self.assertFalse(still_life.advance_board_one_generation())
 
     def test_get_next_cell_state(self):
         """
         Test GameOfLifeBoard's 'get_next_cell_state' method.
         """
-        pass
+        board = GameOfLifeBoard(5, 5, {(2, 1), (2, 2), (2, 3)})
+        self.assertTrue(board.get_next_cell_state(board.board[2][2]))
+        self.assertTrue(board.get_next_cell_state(board.board[1][2]))
+        self.assertFalse(board.get_next_cell_state(board.board[2][1]))
 
     def test_get_num_live_neighbors(self):
         """
         Test GameOfLifeBoard's 'get_num_live_neighbors' method.
         """
-        pass
+        board = GameOfLifeBoard(3, 3, {(0, 0), (0, 1), (1, 1), (2, 2)})
+        self.assertEqual(board.get_num_live_neighbors(board.board[1][1]), 3)
+        self.assertEqual(board.get_num_live_neighbors(board.board[0][0]), 2)
+        self.assertEqual(board.get_num_live_neighbors(board.board[2][0]), 1)
+
+    def test_get_nums_live_neighbors(self):
+        """
+        Test that GameOfLifeBoard's 'get_nums_live_neighbors' and
+        'get_next_cell_states' methods match 'get_num_live_neighbors' and
+        'get_next_cell_state' for every cell, and their cache is updated.
+        """
+        rng = random.Random(5)
+        live_cell_coords = {(rng.randrange(9), rng.randrange(11))
+                            for _ in range(40)}
+        for engine, topology in [('python', 'bounded'), ('active', 'torus'),
+                                 ('python', 'infinite'),
+                                 ('numpy', 'klein bottle'),
+                                 ('numpy', 'infinite'),
+                                 ('hashlife', 'infinite')]:
+            board = GameOfLifeBoard(9, 11, live_cell_coords, engine=engine,
+                                    topology=topology)
+            for _ in range(3):
+                num_live_neighbors = board.get_nums_live_neighbors()
+                next_states = board.get_next_cell_states()
+                self.assertEqual(num_live_neighbors.shape, (9, 11))
+                for row in range(9):
+                    for col in range(11):
+                        cell = board.board[row][col]
+                        self.assertEqual(num_live_neighbors[row, col],
+                                         board.get_num_live_neighbors(cell))
+                        self.assertEqual(next_states[row, col],
+                                         board.get_next_cell_state(cell))
+                board.advance_board_one_generation()
+
+        board = GameOfLifeBoard(5, 5, {(2, 1), (2, 2), (2, 3)},
+                                engine='numpy')
+        self.assertEqual(
+            board.get_nums_live_neighbors([(2, 2), (1, 2), (0, 0)]).tolist(),
+            [2, 3, 0])
+        self.assertEqual(
+            board.get_next_cell_states(np.array([[2, 1], [1, 2]])).tolist(),
+            [False, True])
+        mask = np.zeros((5, 5), dtype=bool)
+        mask[2] = True
+        self.assertEqual(board.get_nums_live_neighbors(mask).tolist(),
+                         [1, 1, 2, 1, 1])
+        self.assertEqual(board.get_nums_live_neighbors([]).tolist(), [])
+        self.assertIs(board.get_num_live_neighbors_grid(),
+                      board.get_num_live_neighbors_grid())
+        board.advance_board_one_generation()
+        self.assertEqual(board.get_nums_live_neighbors([(2, 2)]).tolist(),
+                         [2])
+        self.assertEqual(board.get_nums_live_neighbors([(2, 1)]).tolist(),
+                         [3])
+        board.board[0][0].is_alive = True
+        self.assertEqual(board.get_nums_live_neighbors([(1, 1)]).tolist(),
+                         [3])
+        with self.assertRaises(IndexError):
+            board.get_nums_live_neighbors([(5, 0)])
+        with self.assertRaises(IndexError):
+            board.get_next_cell_states([(0, -1)])
+        with self.assertRaises(IndexError):
+            board.get_nums_live_neighbors(np.ones((4, 5), dtype=bool))
+
+        # Generations rules give the next state of dying cells too
+        board = GameOfLifeBoard(5, 5, {(2, 1), (2, 2), (2, 3)},
+                                engine='numpy', rule='B2/S/C3')
+        board.advance_board_one_generation()
+        self.assertEqual(
+            board.get_next_cell_states([(2, 2), (1, 1), (0, 0)]).tolist(),
+            [0, 2, 0])
+
+    def test_get_stat_alphas(self):
+        """
+        Test that GameOfLifeBoard's 'get_stat_alphas' method matches
+        'get_stat_alpha' for every cell.
+        """
+        for engine in ['python', 'numpy']:
+            board = GameOfLifeBoard(
+                12, 12, {(5, 4), (5, 5), (5, 6), (6, 5), (2, 2), (2, 3)},
+                engine=engine)
+            for _ in range(10):
+                board.advance_board_one_generation()
+            board.calculate_game_stats()
+            for category in GameOfLifeBoard.STAT_CATEGORIES.values():
+                alphas = board.get_stat_alphas(category)
+                self.assertEqual(
+                    alphas.tolist(),
+                    [[board.get_stat_alpha(cell, category)
+                      for cell in board.board[row]]
+                     for row in range(board.rows)])
+
+    def test_normal_cdf(self):
+        """
+        Test that the math.erf normal CDF used without scipy matches
+        scipy's.
+        """
+        z_scores = np.linspace(-4, 4, 81)
+        expected = game_of_life_board.normal_cdf(z_scores)
+        self.assertEqual(game_of_life_board.normal_cdf(0.0), 0.5)
+        ndtr = game_of_life_board._ndtr
+        game_of_life_board._ndtr = False
+        try:
+            np.testing.assert_allclose(
+                game_of_life_board.normal_cdf(z_scores), expected,
+                rtol=1e-12)
+            self.assertEqual(game_of_life_board.normal_cdf(0.0), 0.5)
+        finally:
+            game_of_life_board._ndtr = ndtr
+
+    def assert_stats_equal(self, board, streaming):
+        """
+        Assert the stats of a board match a streaming board's.
+        """
+        board.calculate_game_stats()
+        streaming.calculate_game_stats()
+        for category in GameOfLifeBoard.STAT_CATEGORIES.values():
+            expected = board.stats[category].stats
+            actual = streaming.stats[category].stats
+            for stat in ['max', 'max_coords', 'min', 'min_coords', 'median']:
+                self.assertEqual(expected[stat], actual[stat])
+            for stat in ['mean', 'stdev']:
+                self.assertAlmostEqual(expected[stat], actual[stat])
+
+    def test_calculate_game_stats(self):
+        """
+        Test GameOfLifeBoard's 'calculate_game_stats' method, with and
+        without streaming stats, for each engine, for a Generations rule,
+        and after cells are set, the board seeks and a cycle is fast
+        forwarded.
+        """
+        rng = random.Random(5)
+        live_cell_coords = {(row, col) for row in range(15)
+                            for col in range(17) if rng.random() < 0.4}
+        for engine, topology, rule in [
+                ('numpy', 'bounded', 'B3/S23'), ('python', 'torus', 'B3/S23'),
+                ('active', 'bounded', 'B3/S23'),
+                ('numpy', 'klein bottle', 'B2/S/C3'),
+                ('python', 'infinite', 'B3/S23'),
+                ('hashlife', 'infinite', 'B3/S23')]:
+            kwargs = dict(engine=engine, topology=topology, rule=rule,
+                          record_history=True)
+            board = GameOfLifeBoard(15, 17, live_cell_coords, **kwargs)
+            streaming = GameOfLifeBoard(15, 17, live_cell_coords,
+                                        streaming_stats=True, **kwargs)
+            for generation in range(40):
+                if generation % 3 == 0:
+                    self.assert_stats_equal(board, streaming)
+                if generation % 11 == 10:
+                    for other in (board, streaming):
+                        other.board[3][4].is_alive = True
+                        other.board[7][7].is_alive = False
+                board.advance_board_one_generation()
+                streaming.advance_board_one_generation()
+            if topology != 'infinite':
+                board.seek(25)
+                streaming.seek(25)
+                self.assert_stats_equal(board, streaming)
+            for _ in range(5):
+                board.advance_board_one_generation()
+                streaming.advance_board_one_generation()
+            self.assert_stats_equal(board, streaming)
+
+        blinkers = {(2, 1), (2, 2), (2, 3), (8, 8), (9, 8), (10, 8)}
+        board = GameOfLifeBoard(14, 16, blinkers, engine='numpy',
+                                detect_cycles=True)
+        streaming = GameOfLifeBoard(14, 16, blinkers, engine='numpy',
+                                    detect_cycles=True, streaming_stats=True)
+        while board.advance_board_one_generation():
+            streaming.advance_board_one_generation()
+        streaming.advance_board_one_generation()
+        board.fast_forward_cycle(1001)
+        streaming.fast_forward_cycle(1001)
+        self.assert_stats_equal(board, streaming)
+        board.advance_board_one_generation()
+        streaming.advance_board_one_generation()
+        self.assert_stats_equal(board, streaming)
 
     def test_display_self(self):
         """
@@ -1,6 +1,18 @@
 #!/usr/bin/env python
+import collections
 import unittest
 
+from game_of_life_board import GameOfLifeBoard
+from game_of_life_cell import GameOfLifeCell
+
+Rect = collections.namedtuple('Rect', ['x', 'y', 'width', 'height'])
+
+
+class Color(object):
+    def __init__(self, name, a=255):
+        self.name = name
+        self.a = a
+
 
 class TestGameOfLifeCell(unittest.TestCase):
     """
@@ -11,7 +23,18 @@ class TestGameOfLifeCell(unittest.TestCase):
         """
         Called before each test method.
         """
-        pass
+        self.draw_calls = []
+        self.alive_color = Color('alive')
+        self.board = GameOfLifeBoard(3, 4, {(1, 1), (1, 2)}, GUI_components={
+            'cell_width': 10,
+            'cell_height': 8,
+            'draw_surface': 'surface',
+            'cell_shape_generator': Rect,
+            'cell_draw_func': lambda *args: self.draw_calls.append(args),
+            'cell_outline_color': 'outline',
+            'alive_color': self.alive_color,
+            'dead_color': 'dead'
+        })
 
     def tearDown(self):
         """
@@ -23,19 +46,57 @@ class TestGameOfLifeCell(unittest.TestCase):
         """
         Test creating a new GameOfLifeCell.
         """
-        pass
+        cell = self.board.board[1][2]
+        self.assertIsInstance(cell, GameOfLifeCell)
+        self.assertFalse(hasattr(cell, '__dict__'))
+        self.assertEqual((cell.row, cell.col), (1, 2))
+        self.assertTrue(cell.is_alive)
+        self.assertEqual(cell.GUI_components['shape'], Rect(21, 9, 8, 6))
+        self.assertEqual(self.board.get_cell_GUI_components(1, 2),
+                         cell.GUI_components)
+
+        # cells are views of the engine's arrays, for every engine
+        for engine in ('python', 'active', 'numpy'):
+            board = GameOfLifeBoard(3, 4, {(1, 1), (1, 2)}, engine=engine)
+            board.advance_board_one_generation()
+            cell = board.board[1][1]
+            self.assertEqual(cell.stats['gens_alive'], 1)
+            self.assertEqual(dict(cell.stats.items())['deaths'], 1)
+            cell.stats['births'] += 2
+            self.assertEqual(board.board[1][1].stats['births'], 2)
+            self.assertEqual(
+                board.engine.get_stat_array('births')[1, 1], 2)
+            board.board[0][0].is_alive = True
+            self.assertTrue(board.board[0][0].is_alive)
+            self.assertEqual(board.get_num_live_neighbors(board.board[1][0]),
+                             1)
+            self.assertEqual(board.board[0][0].GUI_components, {})
 
     def test_draw_outline(self):
         """
         Test GameOfLifeCell's 'draw_outline' method.
         """
-        pass
+        self.board.board[0][0].draw_outline()
+        self.assertEqual(self.draw_calls,
+                         [('surface', 'outline', [0, 0, 10, 8], 1)])
+        GameOfLifeBoard(3, 4).board[0][0].draw_outline()
+        self.assertEqual(len(self.draw_calls), 1)
 
     def test_draw_self(self):
         """
         Test GameOfLifeCell's 'draw_self' method.
         """
-        pass
+        self.board.board[1][1].draw_self()
+        self.board.board[2][3].draw_self()
+        self.assertEqual(self.draw_calls, [
+            ('surface', self.alive_color, Rect(11, 9, 8, 6), 0),
+            ('surface', 'dead', Rect(31, 17, 8, 6), 0)
+        ])
+        # stat modifiers draw in the alive color and restore its alpha
+        self.board.board[2][3].draw_self({'alpha': 100})
+        self.assertIs(self.draw_calls[-1][1], self.alive_color)
+        self.assertEqual(self.alive_color.a, 255)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+import random
+import unittest
+
+from game_of_life_board import GameOfLifeBoard
+from game_of_life_cell import GameOfLifeCell
+from game_of_life_cycle import GameOfLifeCycleDetector
+
+
+class TestGameOfLifeCycle(unittest.TestCase):
+    """
+    Test cycle detection and fast-forwarding through cycles.
+    """
+
+    def setUp(self):
+        """
+        Called before each test method.
+        """
+        pass
+
+    def tearDown(self):
+        """
+        Called after each test method.
+        """
+        pass
+
+    def test_update(self):
+        """
+        Test the hash follows flips and a repeated state reports a cycle.
+        """
+        detector = GameOfLifeCycleDetector(5, 5)
+        detector.reset({(2, 1), (2, 2), (2, 3)}, 0)
+        self.assertEqual(detector.hash,
+                         detector.get_hash([(2, 1), (2, 2), (2, 3)]))
+        self.assertFalse(detector.update([(1, 2), (3, 2), (2, 1), (2, 3)], 1))
+        self.assertEqual(detector.hash,
+                         detector.get_hash([(1, 2), (2, 2), (3, 2)]))
+        self.assertTrue(detector.update([(1, 2), (3, 2), (2, 1), (2, 3)], 2))
+        self.assertEqual((detector.period, detector.onset), (2, 0))
+        self.assertEqual(str(detector),
+                         'entered cycle of period 2 at generation 0')
+
+    def test_history_size(self):
+        """
+        Test cycles longer than the history are not detected.
+        """
+        detector = GameOfLifeCycleDetector(5, 5, history_size=2)
+        detector.reset({(0, 0)}, 0)
+        for generation in range(1, 10):
+            self.assertFalse(detector.update(
+                [(0, (generation-1) % 3), (0, generation % 3)], generation))
+        self.assertEqual(len(detector.history), 2)
+
+    def test_advance_board_one_generation(self):
+        """
+        Test a board with cycle detection stops once it oscillates.
+        """
+        board = GameOfLifeBoard(5, 5, {(2, 1), (2, 2), (2, 3)},
+                                engine='numpy', detect_cycles=True)
+        generations = 0
+        while board.advance_board_one_generation():
+            generations += 1
+        self.assertEqual(generations, 1)
+        self.assertEqual(board.generation, 2)
+        self.assertEqual(board.cycle_detector.period, 2)
+
+    def test_fast_forward_cycle(self):
+        """
+        Test fast-forwarding gives the same stats as running every
+        generation.
+        """
+        rand = random.Random(6)  # ends in blinkers and still lifes
+        live_cell_coords = {(row, col) for row in range(12)
+                            for col in range(12) if rand.random() < 0.35}
+        for engine in ('python', 'numpy'):
+            board = GameOfLifeBoard(12, 12, live_cell_coords, engine=engine,
+                                    detect_cycles=True)
+            while board.advance_board_one_generation():
+                pass
+            self.assertEqual(board.cycle_detector.period, 2)
+            generation_limit = board.generation + 21
+            board.fast_forward_cycle(generation_limit)
+            self.assertEqual(board.generation, generation_limit)
+
+            expected_board = GameOfLifeBoard(12, 12, live_cell_coords,
+                                             engine=engine)
+            for _ in range(generation_limit):
+                expected_board.advance_board_one_generation()
+            for category in GameOfLifeCell.STAT_KEYS:
+                self.assertEqual(
+                    board.engine.get_stat_array(category).tolist(),
+                    expected_board.engine.get_stat_array(category).tolist())
+
+        board = GameOfLifeBoard(5, 5, {(2, 1), (2, 2), (2, 3)})
+        self.assertRaises(ValueError, board.fast_forward_cycle, 10)
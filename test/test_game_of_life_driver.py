@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+import unittest
+
+from game_of_life_board import GameOfLifeBoard
+from game_of_life_driver import GameOfLifeSimulationDriver
+
+BLINKER = {(2, 1), (2, 2), (2, 3)}
+
+
+class FakeClock(object):
+    """
+    Clock that moves forward a fixed step each time it is read, and when
+    slept on.
+    """
+    def __init__(self, step):
+        self.time = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.time += self.step
+        return self.time
+
+    def sleep(self, seconds):
+        self.time += seconds
+
+
+class TestGameOfLifeDriver(unittest.TestCase):
+    """
+    Test the simulation driver's limits and frame skipping.
+    """
+
+    def setUp(self):
+        """
+        Called before each test method.
+        """
+        pass
+
+    def tearDown(self):
+        """
+        Called after each test method.
+        """
+        pass
+
+    def test_run_limits(self):
+        """
+        Test each reason for stopping a simulation.
+        """
+        board = GameOfLifeBoard(5, 5, BLINKER)
+        result = GameOfLifeSimulationDriver(board, max_generations=7).run()
+        self.assertEqual(result['stop_reason'], 'max_generations')
+        self.assertEqual(result['generations'], 7)
+        self.assertEqual(board.generation, 7)
+
+        board = GameOfLifeBoard(5, 5, {(0, 0)})
+        result = GameOfLifeSimulationDriver(board, max_generations=7).run()
+        self.assertEqual(result['stop_reason'], 'stable')
+        self.assertEqual(result['generations'], 2)
+
+        board = GameOfLifeBoard(5, 5, BLINKER, detect_cycles=True)
+        result = GameOfLifeSimulationDriver(board, max_generations=7).run()
+        self.assertEqual(result['stop_reason'], 'cycle')
+        self.assertEqual(result['generations'], 2)
+
+        board = GameOfLifeBoard(4, 4, {(1, 1), (1, 2), (2, 1), (2, 2)},
+                                detect_cycles=True)
+        result = GameOfLifeSimulationDriver(board, max_generations=7).run()
+        self.assertEqual(result['stop_reason'], 'stable')
+
+        clock = FakeClock(0.125)
+        board = GameOfLifeBoard(5, 5, BLINKER)
+        result = GameOfLifeSimulationDriver(
+            board, max_seconds=1, clock=clock, sleep=clock.sleep).run()
+        self.assertEqual(result['stop_reason'], 'max_seconds')
+        self.assertEqual(result['generations'], 7)
+
+    def test_run_frames(self):
+        """
+        Test frames are drawn at the frame rate, not every generation.
+        """
+        clock = FakeClock(0.01)
+        board = GameOfLifeBoard(5, 5, BLINKER)
+        frame_generations = []
+        driver = GameOfLifeSimulationDriver(
+            board, max_generations=100, frames_per_second=10,
+            display_func=lambda: frame_generations.append(board.generation),
+            clock=clock, sleep=clock.sleep)
+        result = driver.run()
+        self.assertEqual(result['generations'], 100)
+        self.assertEqual(result['frames'], len(frame_generations))
+        self.assertLess(len(frame_generations), 20)
+        self.assertEqual(frame_generations[0], 0)
+        self.assertEqual(frame_generations[-1], 100)
+        self.assertTrue(board.draw_on_advance)
+
+    def test_run_generations_per_second(self):
+        """
+        Test limiting the step rate.
+        """
+        clock = FakeClock(0)
+        board = GameOfLifeBoard(5, 5, BLINKER)
+        result = GameOfLifeSimulationDriver(
+            board, max_seconds=2, generations_per_second=4,
+            frames_per_second=30, clock=clock, sleep=clock.sleep).run()
+        self.assertEqual(result['stop_reason'], 'max_seconds')
+        self.assertEqual(result['generations'], 8)
+        self.assertGreater(result['frames'], 50)
@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+import random
+import unittest
+
+from game_of_life_board import GameOfLifeBoard
+from game_of_life_cell import GameOfLifeCell
+
+
+def random_live_cell_coords(rows, cols, density, seed):
+    rng = random.Random(seed)
+    return {(row, col) for row in range(rows) for col in range(cols)
+            if rng.random() < density}
+
+
+def board_snapshot(board):
+    """
+    Return the alive state and stats of every cell on a board.
+    """
+    return [[(cell.is_alive,
+              tuple(cell.stats[key] for key in GameOfLifeCell.STAT_KEYS))
+             for cell in board.board[row]]
+            for row in range(board.rows)]
+
+
+def run_baseline_board(rows, cols, live_cell_coords, generations):
+    """
+    Yield the alive state and stats of every cell (as 'board_snapshot'
+    does) after each generation, computed as the original per-cell
+    GameOfLifeBoard loop did, before there were engines.
+    """
+    cells = [[{'is_alive': (row, col) in live_cell_coords,
+               'stats': dict.fromkeys(GameOfLifeCell.STAT_KEYS, 0)}
+              for col in range(cols)] for row in range(rows)]
+
+    def get_num_live_neighbors(row, col):
+        num_live_neighbors = 0
+        for curr_row in range(row-1, row+2):
+            if curr_row < 0 or curr_row >= rows:
+                continue
+            for curr_col in range(col-1, col+2):
+                if ((curr_row == row and curr_col == col) or
+                        (curr_col < 0 or curr_col >= cols)):
+                    continue
+                if cells[curr_row][curr_col]['is_alive']:
+                    num_live_neighbors += 1
+        return num_live_neighbors
+
+    for _ in range(generations):
+        cells_to_flip = []
+        for row in range(rows):
+            for col in range(cols):
+                cell = cells[row][col]
+                stats = cell['stats']
+                if cell['is_alive']:
+                    stats['gens_alive'] += 1
+                    stats['current_living_streak'] += 1
+                    if (stats['current_living_streak'] >
+                            stats['longest_living_streak']):
+                        stats['longest_living_streak'] = \
+                            stats['current_living_streak']
+                else:
+                    stats['gens_dead'] += 1
+                    stats['current_death_streak'] += 1
+                    if (stats['current_death_streak'] >
+                            stats['longest_death_streak']):
+                        stats['longest_death_streak'] = \
+                            stats['current_death_streak']
+                num_live_neighbors = get_num_live_neighbors(row, col)
+                if cell['is_alive']:
+                    will_be_alive = 2 <= num_live_neighbors <= 3
+                else:
+                    will_be_alive = num_live_neighbors == 3
+                if will_be_alive != cell['is_alive']:
+                    stats['current_living_streak'] = 0
+                    stats['current_dead_streak'] = 0
+                    cells_to_flip.append(cell)
+        for cell in cells_to_flip:
+            cell['is_alive'] = not cell['is_alive']
+            if cell['is_alive']:
+                cell['stats']['births'] += 1
+            else:
+                cell['stats']['deaths'] += 1
+        yield [[(cell['is_alive'],
+                 tuple(cell['stats'][key] for key in GameOfLifeCell.STAT_KEYS))
+                for cell in cells[row]]
+               for row in range(rows)]
+
+
+class TestGameOfLifeEngine(unittest.TestCase):
+    """
+    Test the engines that compute generations for a GameOfLifeBoard.
+    """
+
+    def setUp(self):
+        """
+        Called before each test method.
+        """
+        self.rows, self.cols = 24, 31
+        self.live_cell_coords = random_live_cell_coords(
+            self.rows, self.cols, 0.35, seed=7)
+
+    def tearDown(self):
+        """
+        Called after each test method.
+        """
+        pass
+
+    def assert_engine_matches_python(self, engine, generations=40,
+                                     engine_options=None):
+        expected = GameOfLifeBoard(
+            self.rows, self.cols, self.live_cell_coords)
+        actual = GameOfLifeBoard(
+            self.rows, self.cols, self.live_cell_coords, engine=engine,
+            engine_options=engine_options)
+        for _ in range(generations):
+            self.assertEqual(
+                sorted(map(tuple, expected.engine.advance_one_generation())),
+                sorted(map(tuple, actual.engine.advance_one_generation())))
+            self.assertEqual(board_snapshot(expected), board_snapshot(actual))
+        return actual
+
+    def test_baseline(self):
+        """
+        Test that the python and numpy engines match the original per-cell
+        board loop bit for bit, except for death streaks, which the
+        original never reset when a cell flipped (see 'test_death_streaks').
+        """
+        death_streak_keys = {'current_death_streak', 'longest_death_streak'}
+        keys = [index for index, key in enumerate(GameOfLifeCell.STAT_KEYS)
+                if key not in death_streak_keys]
+
+        def without_death_streaks(snapshot):
+            return [[(is_alive, [stats[index] for index in keys])
+                     for is_alive, stats in row] for row in snapshot]
+
+        boards = [GameOfLifeBoard(self.rows, self.cols, self.live_cell_coords,
+                                  engine=engine)
+                  for engine in ('python', 'numpy')]
+        for expected in run_baseline_board(self.rows, self.cols,
+                                           self.live_cell_coords, 40):
+            for board in boards:
+                board.advance_board_one_generation()
+                self.assertEqual(without_death_streaks(board_snapshot(board)),
+                                 without_death_streaks(expected))
+
+    def test_death_streaks(self):
+        """
+        Test that a cell's current death streak is reset when it flips, like
+        its current living streak, so its longest death streak is its
+        longest run of dead generations rather than all of them.
+        """
+        for engine in ('python', 'active', 'numpy'):
+            board = GameOfLifeBoard(5, 5, {(2, 1), (2, 2), (2, 3)},
+                                    engine=engine)
+            for _ in range(5):
+                board.advance_board_one_generation()
+            # dead, alive, dead, alive, dead
+            stats = board.board[1][2].stats
+            self.assertEqual((stats['gens_dead'],
+                              stats['current_death_streak'],
+                              stats['longest_death_streak']), (3, 0, 1))
+            # always dead
+            stats = board.board[0][0].stats
+            self.assertEqual((stats['gens_dead'],
+                              stats['current_death_streak'],
+                              stats['longest_death_streak']), (5, 5, 5))
+
+    def test_numpy_engine(self):
+        """
+        Test that the numpy engine matches the python engine.
+        """
+        self.assert_engine_matches_python('numpy')
+
+    def test_active_engine(self):
+        """
+        Test that the active engine matches the python engine and only
+        evaluates cells near last generation's flips.
+        """
+        self.assert_engine_matches_python('active')
+
+        board = GameOfLifeBoard(
+            50, 50, {(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)}, engine='active')
+        board.advance_board_one_generation()
+        self.assertEqual(board.engine.cells_evaluated, 2500)
+        board.advance_board_one_generation()
+        self.assertLess(board.engine.cells_evaluated, 40)
+        self.assertEqual(board.board[40][40].stats['gens_dead'], 2)
+
+        # cells set alive or dead are caught up in their old state first
+        boards = [GameOfLifeBoard(9, 9, {(2, 1), (2, 2), (2, 3)},
+                                  engine=engine)
+                  for engine in ('python', 'active')]
+        for board in boards:
+            for _ in range(5):
+                board.advance_board_one_generation()
+            board.board[7][7].is_alive = True
+            board.advance_board_one_generation()
+        self.assertEqual(boards[1].board[7][7].stats['gens_dead'], 5)
+        self.assertEqual(board_snapshot(boards[0]), board_snapshot(boards[1]))
+
+    def test_hashlife_engine(self):
+        """
+        Test that the hashlife engine matches the python engine while a
+        pattern stays inside the board, and can skip generations.
+        """
+        self.rows, self.cols = 60, 60
+        self.live_cell_coords = {(30, 31), (30, 32), (31, 30), (31, 31),
+                                 (32, 31)}  # R-pentomino
+        self.assert_engine_matches_python('hashlife', generations=30)
+
+        board = GameOfLifeBoard(
+            10, 10, {(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)},
+            engine='hashlife')
+        self.assertTrue(board.advance_board_power_of_two_generations(3))
+        self.assertEqual(
+            {(row, col) for row in range(10) for col in range(10)
+             if board.board[row][col].is_alive},
+            {(2, 3), (3, 4), (4, 2), (4, 3), (4, 4)})
+        for row, col in [(8, 0), (8, 1), (9, 0), (9, 1)]:
+            board.board[row][col].is_alive = True  # block, as if clicked
+        board.advance_board_one_generation()
+        self.assertTrue(board.engine.universe.get_cell(9, 1))
+        self.assertTrue(board.board[9][1].is_alive)
+
+    def test_parallel_engine(self):
+        """
+        Test that the parallel engine matches the python engine.
+        """
+        board = self.assert_engine_matches_python(
+            'parallel', engine_options={'workers': 3})
+        self.assertEqual(len(board.engine.stripes), 3)
+        self.assertIsNone(board.engine.universe)
+        self.assertEqual(board.engine.get_outside_num_live_neighbors(0, 0), 0)
+        self.assertEqual(
+            board.engine.get_num_live_neighbors_grid().tolist(),
+            [[board.engine.get_num_live_neighbors(row, col)
+              for col in range(self.cols)] for row in range(self.rows)])
+        board.engine.close()
+
+    def test_get_num_live_neighbors(self):
+        """
+        Test each engine's per-cell neighbor counts and next states.
+        """
+        for engine, engine_options in [
+                ('python', None), ('active', None), ('numpy', None),
+                ('hashlife', None), ('parallel', {'workers': 2})]:
+            board = GameOfLifeBoard(6, 6, {(2, 1), (2, 2), (2, 3)},
+                                    engine=engine,
+                                    engine_options=engine_options)
+            self.assertEqual(board.get_num_live_neighbors(board.board[1][2]),
+                             3)
+            self.assertEqual(board.get_num_live_neighbors(board.board[2][2]),
+                             2)
+            self.assertTrue(board.get_next_cell_state(board.board[1][2]))
+            self.assertFalse(board.get_next_cell_state(board.board[2][1]))
+            if engine == 'parallel':
+                board.engine.close()
+
+    def test_cell_view(self):
+        """
+        Test that cell views read and write the engine's arrays.
+        """
+        board = GameOfLifeBoard(3, 3, engine='numpy')
+        board.board[1][1].is_alive = True
+        self.assertEqual(board.engine.alive[1, 1], 1)
+        self.assertTrue(board.board[1][1].is_alive)
+        board.board[1][1].stats['births'] += 2
+        self.assertEqual(board.engine.stats['births'][1, 1], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+import statistics
+import unittest
+
+from game_of_life_ensemble import (GameOfLifeEnsemble, GameOfLifeHistogram,
+                                   get_soup, run_batch)
+
+
+class TestGameOfLifeEnsemble(unittest.TestCase):
+    """
+    Test running ensembles of random soups and aggregating their results.
+    """
+
+    def setUp(self):
+        """
+        Called before each test method.
+        """
+        self.rows, self.cols = 12, 14
+
+    def tearDown(self):
+        """
+        Called after each test method.
+        """
+        pass
+
+    def test_soups(self):
+        """
+        Test that each member's soup depends only on the seed and member.
+        """
+        soup = get_soup(self.rows, self.cols, 0.3, 7, 2)
+        self.assertEqual(soup.shape, (self.rows, self.cols))
+        self.assertEqual(soup.tolist(),
+                         get_soup(self.rows, self.cols, 0.3, 7, 2).tolist())
+        self.assertNotEqual(soup.tolist(),
+                            get_soup(self.rows, self.cols, 0.3, 7, 3).tolist())
+        self.assertNotEqual(soup.tolist(),
+                            get_soup(self.rows, self.cols, 0.3, 8, 2).tolist())
+        self.assertFalse(get_soup(self.rows, self.cols, 0, 7, 2).any())
+
+    def test_stacked_batches(self):
+        """
+        Test that stacked boards give the same results as boards run one at
+        a time, for rules with and without cycle detection.
+        """
+        for options in ({}, {'rule': 'B2/S345/C4'},
+                        {'rule': 'B36/S23', 'topology': 'torus'}):
+            ensemble = GameOfLifeEnsemble(
+                self.rows, self.cols, 0.35, 8, max_generations=150,
+                workers=1, **options)
+            self.assertTrue(ensemble.stacks_boards)
+            results = list(ensemble.iter_results())
+            self.assertEqual([result['member'] for result in results],
+                             list(range(8)))
+            settings = ensemble.get_settings()
+            settings['stacks_boards'] = False
+            self.assertEqual(run_batch(settings, range(8)), results)
+
+        # the python engine's stats match up to float rounding
+        settings['engine'] = 'python'
+        for result, python_result in zip(results,
+                                         run_batch(settings, range(8))):
+            for key in ('generations', 'stop_reason', 'period', 'lifetime',
+                        'population'):
+                self.assertEqual(python_result[key], result[key])
+            self.assertEqual(python_result['stats']['births']['max'],
+                             result['stats']['births']['max'])
+
+    def test_lifetimes(self):
+        """
+        Test members' lifetimes, periods and stop reasons.
+        """
+        ensemble = GameOfLifeEnsemble(self.rows, self.cols, 0.35, 12,
+                                      max_generations=40, workers=1)
+        for result in ensemble.iter_results():
+            if result['stop_reason'] == 'max_generations':
+                self.assertEqual(result['generations'], 40)
+                self.assertEqual(result['lifetime'], 40)
+                self.assertIsNone(result['period'])
+            else:
+                self.assertEqual(result['stop_reason'],
+                                 'cycle' if result['period'] > 1
+                                 else 'stable')
+                self.assertEqual(result['lifetime'], result['onset'])
+                self.assertEqual(result['generations'],
+                                 result['onset'] + result['period'])
+
+        # an empty soup is stable at once
+        result = next(GameOfLifeEnsemble(
+            self.rows, self.cols, 0, 1, workers=1).iter_results())
+        self.assertEqual((result['lifetime'], result['period'],
+                          result['population']), (0, 1, 0))
+
+    def test_run(self):
+        """
+        Test that results do not depend on how members are split up.
+        """
+        summary = GameOfLifeEnsemble(
+            self.rows, self.cols, 0.35, 9, max_generations=150,
+            workers=1).run()
+        self.assertEqual(summary, GameOfLifeEnsemble(
+            self.rows, self.cols, 0.35, 9, max_generations=150, workers=3,
+            batch_size=2).run())
+        self.assertEqual(summary, GameOfLifeEnsemble(
+            self.rows, self.cols, 0.35, 9, max_generations=150, workers=1,
+            batch_size=4).run())
+        self.assertEqual(sum(summary['stop_reasons'].values()), 9)
+        self.assertEqual(summary['histograms']['lifetime']['count'], 9)
+        self.assertIn('births mean', summary['histograms'])
+        self.assertRaises(ValueError, GameOfLifeEnsemble, 4, 4, 1.5, 1)
+        self.assertRaises(ValueError, GameOfLifeEnsemble, 4, 4, 0.5, 1,
+                          topology='sphere')
+
+    def test_histogram(self):
+        """
+        Test histogram stats, binning and merging.
+        """
+        values = [3, 1, 4, 1, 5, 9, 2, 6]
+        histogram = GameOfLifeHistogram()
+        for value in values:
+            histogram.add(value)
+        stats = histogram.get_stats()
+        self.assertEqual((stats['min'], stats['max'], stats['count']),
+                         (1, 9, 8))
+        self.assertEqual(stats['median'], statistics.median(values))
+        self.assertAlmostEqual(stats['mean'], statistics.mean(values))
+        self.assertAlmostEqual(stats['stdev'], statistics.pstdev(values))
+        self.assertEqual(stats['bins']['1'], 2)
+
+        half = GameOfLifeHistogram()
+        other_half = GameOfLifeHistogram()
+        for index, value in enumerate(values):
+            (half if index % 2 else other_half).add(value)
+        half.merge(other_half)
+        self.assertEqual(half.get_stats(), stats)
+        self.assertRaises(ValueError, half.merge, GameOfLifeHistogram(0.5))
+
+        histogram = GameOfLifeHistogram(0.01)
+        histogram.add(0.3)
+        self.assertEqual(histogram.get_stats()['bins'], {'0.3': 1})
+        self.assertIsNone(GameOfLifeHistogram().get_stats()['median'])
+
+
+if __name__ == '__main__':
+    unittest.main()
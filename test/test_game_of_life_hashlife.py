@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+import unittest
+
+from game_of_life_hashlife import GameOfLifeHashLife
+
+GLIDER = {(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)}
+
+
+class TestGameOfLifeHashLife(unittest.TestCase):
+    """
+    Test the GameOfLifeHashLife class.
+    """
+
+    def setUp(self):
+        """
+        Called before each test method.
+        """
+        pass
+
+    def tearDown(self):
+        """
+        Called after each test method.
+        """
+        pass
+
+    def test_init(self):
+        """
+        Test creating a new GameOfLifeHashLife.
+        """
+        universe = GameOfLifeHashLife({(-40, 3), (7, -100)})
+        self.assertEqual(universe.population, 2)
+        self.assertEqual(set(universe.get_live_cell_coords()),
+                         {(-40, 3), (7, -100)})
+
+    def test_advance(self):
+        """
+        Test GameOfLifeHashLife's 'advance' method.
+        """
+        stepped = GameOfLifeHashLife(GLIDER)
+        for _ in range(16):
+            stepped.advance()
+        jumped = GameOfLifeHashLife(GLIDER)
+        jumped.advance(4)
+        expected = {(row+4, col+4) for row, col in GLIDER}
+        self.assertEqual(set(stepped.get_live_cell_coords()), expected)
+        self.assertEqual(set(jumped.get_live_cell_coords()), expected)
+        self.assertEqual(jumped.generation, 16)
+
+        jumped.advance(20)
+        shift = 4 + (1 << 18)
+        self.assertEqual(jumped.population, 5)
+        self.assertEqual(
+            set(jumped.get_live_cell_coords(shift, shift, 3, 3)), GLIDER)
+
+    def test_bounded_cache(self):
+        """
+        Test that caches stay bounded and results stay correct.
+        """
+        universe = GameOfLifeHashLife(
+            {(0, 1), (0, 2), (1, 0), (1, 1), (2, 1)}, max_cache_size=500)
+        reference = GameOfLifeHashLife(
+            {(0, 1), (0, 2), (1, 0), (1, 1), (2, 1)})
+        for _ in range(200):
+            universe.advance()
+            reference.advance()
+            self.assertLessEqual(len(universe._results), 500)
+            self.assertLessEqual(len(universe._nodes), 500)
+        self.assertEqual(set(universe.get_live_cell_coords()),
+                         set(reference.get_live_cell_coords()))
+        # collecting garbage keeps the most recently used results
+        self.assertGreater(len(universe._results), 0)
+
+        # a jump needing more results than the cache holds keeps them all
+        # until it is done, then trims the cache
+        universe = GameOfLifeHashLife(
+            {(0, 1), (0, 2), (1, 0), (1, 1), (2, 1)}, max_cache_size=500)
+        reference = GameOfLifeHashLife(
+            {(0, 1), (0, 2), (1, 0), (1, 1), (2, 1)})
+        universe.advance(10)
+        reference.advance(10)
+        self.assertLessEqual(len(universe._results), 500)
+        self.assertEqual(set(universe.get_live_cell_coords()),
+                         set(reference.get_live_cell_coords()))
+
+    def test_set_cell(self):
+        """
+        Test GameOfLifeHashLife's 'get_cell' and 'set_cell' methods.
+        """
+        universe = GameOfLifeHashLife()
+        universe.set_cell(1000, -3, True)
+        self.assertTrue(universe.get_cell(1000, -3))
+        self.assertFalse(universe.get_cell(1000, -2))
+        universe.set_cell(1000, -3, False)
+        self.assertEqual(universe.population, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from game_of_life_headless import parse_live_cell_coords, run_simulation
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestGameOfLifeHeadless(unittest.TestCase):
+    """
+    Test the headless simulation API and CLI.
+    """
+
+    def setUp(self):
+        """
+        Called before each test method.
+        """
+        pass
+
+    def tearDown(self):
+        """
+        Called after each test method.
+        """
+        pass
+
+    def test_parse_live_cell_coords(self):
+        """
+        Test parsing live cell coords from a string.
+        """
+        self.assertEqual(parse_live_cell_coords('0,3 3,2', 4, 4),
+                         {(0, 3), (3, 2)})
+        self.assertRaises(ValueError, parse_live_cell_coords, '0,4', 4, 4)
+        self.assertRaises(ValueError, parse_live_cell_coords, '1,2,3', 4, 4)
+
+    def test_run_simulation(self):
+        """
+        Test running a simulation with a generation limit.
+        """
+        result = run_simulation(
+            5, 5, {(2, 1), (2, 2), (2, 3)}, max_generations=3,
+            stat_categories=['births'])
+        self.assertEqual(result['generations'], 3)
+        self.assertEqual(result['stop_reason'], 'max_generations')
+        self.assertEqual(result['board'][1:4], ['..O..', '..O..', '..O..'])
+        self.assertEqual(list(result['stats']), ['births'])
+        self.assertEqual(result['stats']['births']['max'], 2)
+
+        result = run_simulation(5, 5, {(2, 1), (2, 2)}, max_generations=1,
+                                rule='seeds')
+        self.assertEqual(result['rule'], 'B2/S')
+        self.assertEqual(result['board'][1:4], ['.OO..', '.....', '.OO..'])
+
+    def test_run_simulation_cycles(self):
+        """
+        Test stopping at and fast-forwarding through a cycle.
+        """
+        blinker = {(2, 1), (2, 2), (2, 3)}
+        result = run_simulation(5, 5, blinker, detect_cycles=True)
+        self.assertEqual(result['generations'], 2)
+        self.assertEqual(result['cycle'], {'period': 2, 'onset': 0})
+        self.assertEqual(result['stop_reason'], 'cycle')
+
+        result = run_simulation(5, 5, blinker, max_generations=1001,
+                                fast_forward_cycles=True)
+        self.assertEqual(result['stop_reason'], 'cycle')
+        self.assertEqual(result['generations'], 1001)
+        self.assertEqual(result['board'][1:4], ['..O..', '..O..', '..O..'])
+        self.assertEqual(result['stats']['births']['max'], 501)
+
+    def test_run_simulation_snapshot(self):
+        """
+        Test checkpointing a simulation and resuming it from the snapshot.
+        """
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'blinker.snap')
+            run_simulation(5, 5, {(2, 1), (2, 2), (2, 3)}, max_generations=3,
+                           checkpoint_path=path)
+            result = run_simulation(None, None, snapshot_path=path,
+                                    max_generations=4)
+        finally:
+            shutil.rmtree(directory)
+        self.assertEqual(result['generations'], 4)
+        self.assertEqual(result['board'][2], '.OOO.')
+        self.assertEqual(result['stats']['births']['max'], 2)
+
+    def test_run_simulation_time_series(self):
+        """
+        Test saving a simulation's time series as CSV.
+        """
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'blinker.csv')
+            run_simulation(5, 5, {(2, 1), (2, 2), (2, 3)}, max_generations=3,
+                           time_series_path=path)
+            with open(path) as csv_file:
+                lines = csv_file.read().splitlines()
+        finally:
+            shutil.rmtree(directory)
+        self.assertEqual(len(lines), 5)
+        self.assertTrue(lines[0].startswith('generation,generations,'))
+        self.assertTrue(lines[4].startswith('3,1,3.0,'))
+
+    def test_run_simulation_bit_board(self):
+        """
+        Test running a simulation on a bit board, which gives the same
+        board as a GameOfLifeBoard but no stats.
+        """
+        glider = {(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)}
+        expected = run_simulation(8, 9, glider, max_generations=30,
+                                  topology='torus')
+        result = run_simulation(8, 9, glider, max_generations=30,
+                                topology='torus', bit_board=True)
+        for key in ('rows', 'cols', 'rule', 'topology', 'generations',
+                    'stop_reason', 'board', 'live_cell_coords'):
+            self.assertEqual(result[key], expected[key])
+        self.assertIsNone(result['stats'])
+
+        result = run_simulation(4, 4, {(1, 1), (1, 2), (2, 1), (2, 2)},
+                                bit_board=True)
+        self.assertEqual(result['stop_reason'], 'stable')
+        self.assertEqual(result['generations'], 1)
+        for options in ({'detect_cycles': True}, {'streaming_stats': True},
+                        {'rule': 'B2/S/C3'}, {'topology': 'infinite'}):
+            with self.assertRaises(ValueError):
+                run_simulation(5, 5, glider, bit_board=True, **options)
+
+    def test_main(self):
+        """
+        Test the CLI prints JSON and never imports pygame.
+        """
+        script = ('import sys, game_of_life_headless; '
+                  'game_of_life_headless.main(sys.argv[1:]); '
+                  'assert "pygame" not in sys.modules')
+        output = subprocess.check_output(
+            [sys.executable, '-c', script, '--rows', '4', '--cols', '4',
+             '--live', '1,1 1,2 2,1 2,2'],
+            cwd=REPO_DIR)
+        result = json.loads(output.decode())
+        self.assertEqual(result['generations'], 1)
+        self.assertEqual(result['live_cell_coords'],
+                         [[1, 1], [1, 2], [2, 1], [2, 2]])
+
+        output = subprocess.check_output(
+            [sys.executable, '-c', script, '--rows', '5', '--cols', '5',
+             '--live', '2,1 2,2 2,3', '--max-generations', '3',
+             '--bit-board'],
+            cwd=REPO_DIR)
+        result = json.loads(output.decode())
+        self.assertEqual(result['board'][1:4], ['..O..', '..O..', '..O..'])
+        self.assertIsNone(result['stats'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+import unittest
+
+import numpy as np
+
+from game_of_life_board import GameOfLifeBoard
+from game_of_life_ensemble import get_soup
+from game_of_life_history import GameOfLifeHistory
+
+
+def get_soup_coords(rows, cols, seed):
+    return set(zip(*get_soup(rows, cols, 0.35, seed, 0).nonzero()))
+
+
+class TestGameOfLifeHistory(unittest.TestCase):
+    """
+    Test recording, looking up and seeking a board's generations.
+    """
+
+    def setUp(self):
+        """
+        Called before each test method.
+        """
+        pass
+
+    def tearDown(self):
+        """
+        Called after each test method.
+        """
+        pass
+
+    def run_board(self, board, generations):
+        """
+        Advance the board, returning a copy of its states at each
+        generation.
+        """
+        states = [board.engine.get_alive_array().copy()]
+        for _ in range(generations):
+            board.advance_board_one_generation()
+            states.append(board.engine.get_alive_array().copy())
+        return states
+
+    def test_record(self):
+        """
+        Test every recorded generation is looked up as it was, for each
+        engine and for a Generations rule.
+        """
+        for engine, rule in [('python', 'B3/S23'), ('active', 'B3/S23'),
+                             ('numpy', 'B3/S23'), ('numpy', 'B2/S/C3')]:
+            board = GameOfLifeBoard(30, 40, get_soup_coords(30, 40, 1),
+                                    engine=engine, rule=rule,
+                                    record_history=True)
+            states = self.run_board(board, 150)
+            history = board.history
+            self.assertEqual((history.first_generation,
+                              history.last_generation), (0, 150))
+            self.assertEqual(len(history), 151)
+            self.assertGreaterEqual(len(history.groups), 3)
+            self.assertTrue(all(
+                len(group[2]) <= GameOfLifeHistory.DEFAULT_KEYFRAME_INTERVAL
+                for group in history.groups))
+            for generation in [0, 1, 63, 64, 65, 100, 150]:
+                self.assertEqual(history.get_states(generation).tolist(),
+                                 states[generation].tolist())
+            for generation, generation_states in history.iter_states(60, 70):
+                self.assertEqual(generation_states.tolist(),
+                                 states[generation].tolist())
+            self.assertEqual(generation, 69)
+            keyframe_generation = next(
+                group[0] for group in history.groups if group[2])
+            self.assertIsNone(history.get_cells_changed(keyframe_generation))
+            changed = history.get_cells_changed(keyframe_generation+1)
+            self.assertEqual(sorted(changed.tolist()), np.argwhere(
+                states[keyframe_generation] !=
+                states[keyframe_generation+1]).tolist())
+            self.assertNotIn(151, history)
+            with self.assertRaises(KeyError):
+                history.get_states(151)
+
+    def test_max_bytes(self):
+        """
+        Test the oldest generations are dropped to fit max_bytes.
+        """
+        board = GameOfLifeBoard(64, 64, get_soup_coords(64, 64, 2),
+                                engine='numpy', record_history=True,
+                                history_max_bytes=4096)
+        states = self.run_board(board, 300)
+        history = board.history
+        self.assertLessEqual(history.nbytes, 4096)
+        self.assertGreater(history.first_generation, 0)
+        self.assertEqual(history.last_generation, 300)
+        self.assertNotIn(0, history)
+        self.assertEqual(history.get_states(history.first_generation).tolist(),
+                         states[history.first_generation].tolist())
+        # each cell index takes 2 bytes and each keyframe 512
+        self.assertEqual(history.index_dtype, np.uint16)
+        self.assertEqual(history.groups[-1][1].nbytes, 64*64 // 8)
+
+    def test_seek(self):
+        """
+        Test seeking a board back and advancing it again.
+        """
+        for engine in ['python', 'active', 'numpy']:
+            board = GameOfLifeBoard(20, 20, get_soup_coords(20, 20, 3),
+                                    engine=engine, topology='torus',
+                                    detect_cycles=True, record_history=True)
+            states = self.run_board(board, 40)
+            drawn = []
+            board.draw_cells = drawn.extend
+            self.assertTrue(board.seek(25))
+            self.assertEqual(board.generation, 25)
+            self.assertEqual(board.engine.get_alive_array().tolist(),
+                             states[25].tolist())
+            self.assertEqual(sorted(drawn), np.argwhere(
+                states[40] != states[25]).tolist())
+            self.assertFalse(board.seek(25))
+            board.seek(10)
+            board.advance_board_one_generation()
+            self.assertEqual(board.engine.get_alive_array().tolist(),
+                             states[11].tolist())
+            self.assertEqual(board.history.last_generation, 11)
+            self.assertEqual(board.history.get_states(11).tolist(),
+                             states[11].tolist())
+
+        with self.assertRaises(ValueError):
+            GameOfLifeBoard(5, 5).seek(0)
+        with self.assertRaises(ValueError):
+            GameOfLifeBoard(5, 5, topology='infinite',
+                            record_history=True).seek(0)
+        with self.assertRaises(KeyError):
+            GameOfLifeBoard(5, 5, record_history=True).seek(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from game_of_life_board import GameOfLifeBoard
+from game_of_life_patterns import (PATTERNS, center_coords, parse_life_106,
+                                   parse_plaintext, parse_rle, read_pattern,
+                                   to_rle)
+
+GLIDER = [(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)]
+
+
+class TestGameOfLifePatterns(unittest.TestCase):
+    """
+    Test reading and writing pattern files.
+    """
+
+    def setUp(self):
+        """
+        Called before each test method.
+        """
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """
+        Called after each test method.
+        """
+        shutil.rmtree(self.directory)
+
+    def test_parse_rle(self):
+        """
+        Test parsing RLE runs, row ends, header and comments.
+        """
+        live_cell_coords, header = parse_rle(
+            '#N Glider\n#C A comment\nx = 3, y = 3, rule = B3/S23\n'
+            'bo$2bo$3o!')
+        self.assertEqual(list(map(tuple, live_cell_coords.tolist())), GLIDER)
+        self.assertEqual(header, {'x': 3, 'y': 3, 'rule': 'B3/S23',
+                                  'name': 'Glider',
+                                  'comments': ['#C A comment']})
+
+        live_cell_coords, header = parse_rle(
+            'x = 14, y = 4\n12b2o\n$\n\n3$13\nbo!ignored 5o')
+        self.assertEqual(list(map(tuple, live_cell_coords.tolist())),
+                         [(0, 12), (0, 13), (4, 13)])
+        self.assertIsNone(header['rule'])
+        self.assertRaises(ValueError, parse_rle, 'bo$2bo$3o!')
+        self.assertRaises(ValueError, parse_rle, 'x = 3, y = 3\nbo$2b?o!')
+
+    def test_parse_life_106_and_plaintext(self):
+        """
+        Test parsing Life 1.06 and plaintext patterns.
+        """
+        live_cell_coords, header = parse_life_106(
+            '#Life 1.06\n0 -1\n1 0\n-1 1\n0 1\n1 1\n')
+        self.assertEqual(list(map(tuple, live_cell_coords.tolist())), GLIDER)
+        self.assertEqual((header['x'], header['y']), (3, 3))
+        self.assertRaises(ValueError, parse_life_106, '#Life 1.06\n0 1\n2\n')
+
+        live_cell_coords, header = parse_plaintext(
+            '!Name: Glider\n!\n.O\n..O\nOOO\n')
+        self.assertEqual(list(map(tuple, live_cell_coords.tolist())), GLIDER)
+        self.assertEqual(header['name'], 'Glider')
+        self.assertEqual(
+            sorted(map(tuple, parse_plaintext(
+                PATTERNS['acorn'])[0].tolist())),
+            [(0, 1), (1, 3), (2, 0), (2, 1), (2, 4), (2, 5), (2, 6)])
+
+    def test_to_rle(self):
+        """
+        Test writing RLE and reading it back.
+        """
+        alive = np.zeros((5, 4), dtype=bool)
+        alive[1, 1:3] = alive[4, 0] = alive[4, 2] = True
+        self.assertEqual(to_rle(alive, name='test'),
+                         '#N test\nx = 4, y = 5, rule = B3/S23\n'
+                         '$b2o3$obo!\n')
+
+        rng = np.random.default_rng(0)
+        alive = rng.random((40, 300)) < 0.4
+        rle = to_rle(alive)
+        self.assertTrue(all(len(line) <= 70 for line in rle.split('\n')))
+        live_cell_coords, header = parse_rle(rle)
+        self.assertEqual((header['x'], header['y']), (300, 40))
+        self.assertEqual(live_cell_coords.tolist(),
+                         np.argwhere(alive).tolist())
+
+    def test_read_pattern(self):
+        """
+        Test reading pattern files of each format, placed on a board.
+        """
+        contents = {
+            'glider.rle': 'x = 3, y = 3\nbo$2bo$3o!\n',
+            'glider.lif': '#Life 1.06\n1 0\n2 1\n0 2\n1 2\n2 2\n',
+            'glider.cells': '.O.\n..O\nOOO\n',
+            'glider': '#C no extension\nx = 3, y = 3\nbo$2bo$3o!\n'
+        }
+        for file_name, content in contents.items():
+            path = os.path.join(self.directory, file_name)
+            with open(path, 'w') as pattern_file:
+                pattern_file.write(content)
+            live_cell_coords, _ = read_pattern(path, 5, 7, center=True)
+            self.assertEqual(
+                sorted(map(tuple, live_cell_coords.tolist())),
+                sorted(center_coords(set(GLIDER), 5, 7)))
+            self.assertRaises(ValueError, read_pattern, path, 2, 7)
+
+    def test_board_patterns(self):
+        """
+        Test saving a board as RLE and loading it into a new board.
+        """
+        path = os.path.join(self.directory, 'board.rle')
+        board = GameOfLifeBoard(6, 6, set(GLIDER), engine='numpy')
+        board.advance_board_one_generation()
+        board.save_pattern(path, name='glider')
+
+        for engine in ('python', 'numpy'):
+            loaded_board = GameOfLifeBoard.load_pattern(path, engine=engine)
+            self.assertEqual((loaded_board.rows, loaded_board.cols), (6, 6))
+            self.assertEqual(
+                sorted(map(tuple, loaded_board.get_live_cell_coords())),
+                sorted(map(tuple, board.get_live_cell_coords())))
+
+        centered_board = GameOfLifeBoard.load_pattern(path, 20, 20,
+                                                      center=True)
+        self.assertEqual(len(centered_board.get_live_cell_coords()), 5)
+        self.assertRaises(ValueError, GameOfLifeBoard.load_pattern, path, 3, 3)
+
+        with open(path, 'w') as pattern_file:
+            pattern_file.write('x = 3, y = 3, rule = B36/S23\nbo$2bo$3o!\n')
+        self.assertEqual(GameOfLifeBoard.load_pattern(path).rule.rulestring,
+                         'B36/S23')
+        self.assertEqual(
+            GameOfLifeBoard.load_pattern(path, rule='B3/S23').rule.rulestring,
+            'B3/S23')
+        with open(path, 'w') as pattern_file:
+            pattern_file.write('x = 3, y = 3, rule = R2,C0,M1,S3..5,B3..4\n'
+                               'bo$2bo$3o!\n')
+        self.assertRaises(ValueError, GameOfLifeBoard.load_pattern, path)
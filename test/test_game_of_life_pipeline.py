@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+import os
+import unittest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+
+from game_of_life_board import GameOfLifeBoard
+from game_of_life_ensemble import get_soup
+from game_of_life_pipeline import GameOfLifePipeline
+from game_of_life_profiler import GameOfLifeProfiler
+from game_of_life_renderer import GameOfLifeRenderer
+
+from .test_game_of_life_driver import BLINKER
+from .test_game_of_life_renderer import CANVAS_COLOR, make_GUI_components
+
+
+class TestGameOfLifePipeline(unittest.TestCase):
+    """
+    Test the threaded simulation pipeline's limits, controls and frames.
+    """
+
+    def setUp(self):
+        """
+        Called before each test method.
+        """
+        pass
+
+    def tearDown(self):
+        """
+        Called after each test method.
+        """
+        pass
+
+    def test_run_limits(self):
+        """
+        Test each reason for stopping a simulation.
+        """
+        board = GameOfLifeBoard(5, 5, BLINKER)
+        result = GameOfLifePipeline(board, max_generations=7).run()
+        self.assertEqual(result['stop_reason'], 'max_generations')
+        self.assertEqual(result['generations'], 7)
+        self.assertTrue(board.draw_on_advance)
+
+        board = GameOfLifeBoard(5, 5, {(0, 0)})
+        result = GameOfLifePipeline(board, max_generations=7).run()
+        self.assertEqual(result['stop_reason'], 'stable')
+        self.assertEqual(result['generations'], 2)
+
+        board = GameOfLifeBoard(5, 5, BLINKER, detect_cycles=True)
+        result = GameOfLifePipeline(board, max_generations=7).run()
+        self.assertEqual(result['stop_reason'], 'cycle')
+
+        board = GameOfLifeBoard(5, 5, BLINKER)
+        result = GameOfLifePipeline(board, max_seconds=0.1,
+                                    generations_per_second=100).run()
+        self.assertEqual(result['stop_reason'], 'max_seconds')
+        self.assertLess(result['generations'], 20)
+
+        board = GameOfLifeBoard(5, 5, BLINKER)
+        pipeline = GameOfLifePipeline(board, frames_per_second=100,
+                                      generations_per_second=1)
+        pipeline.event_func = lambda: (pipeline.num_frames == 3 and
+                                       pipeline.stop())
+        result = pipeline.run()
+        self.assertEqual(result['stop_reason'], 'quit')
+        self.assertEqual(result['frames'], 5)
+        self.assertLess(result['seconds'], 0.5)
+
+    def test_run_controls(self):
+        """
+        Test pausing, resuming and changing speed from the event function.
+        """
+        board = GameOfLifeBoard(5, 5, BLINKER)
+        frame_generations = []
+
+        def handle_events():
+            frame_generations.append(board.generation)
+            if pipeline.num_frames == 0:
+                pipeline.pause()
+            elif pipeline.num_frames == 5:
+                pipeline.resume()
+                pipeline.set_generations_per_second(None)
+
+        pipeline = GameOfLifePipeline(
+            board, max_generations=1000, frames_per_second=100,
+            generations_per_second=0.5, event_func=handle_events)
+        result = pipeline.run()
+        self.assertEqual(result['stop_reason'], 'max_generations')
+        self.assertEqual(frame_generations[1:6], [1]*5)
+        self.assertLess(result['seconds'], 1)
+
+    def test_run_frames(self):
+        """
+        Test coalesced frames draw the board as advancing it one generation
+        at a time does, whatever the frame rate.
+        """
+        live_cell_coords = set(zip(*get_soup(60, 80, 0.35, 4,
+                                             0).nonzero()))
+        expected_surface = pygame.Surface((200, 150))
+        expected = GameOfLifeBoard(
+            60, 80, live_cell_coords,
+            make_GUI_components(expected_surface, pygame.draw.rect),
+            engine='numpy')
+        for _ in range(150):
+            expected.advance_board_one_generation()
+        expected.renderer = GameOfLifeRenderer(expected, expected_surface,
+                                               CANVAS_COLOR)
+        expected.display_self()
+
+        num_frames = {}
+        for frames_per_second in [20, 1000]:
+            actual_surface = pygame.Surface((200, 150))
+            actual = GameOfLifeBoard(
+                60, 80, live_cell_coords,
+                make_GUI_components(actual_surface, pygame.draw.rect),
+                engine='numpy')
+            actual.renderer = GameOfLifeRenderer(actual, actual_surface,
+                                                 CANVAS_COLOR)
+            actual.display_self()
+            frame_generations = []
+            profiler = GameOfLifeProfiler()
+            result = GameOfLifePipeline(
+                actual, max_generations=150,
+                frames_per_second=frames_per_second,
+                display_func=lambda: frame_generations.append(
+                    actual.generation),
+                max_queued_frames=1, profiler=profiler).run()
+            self.assertEqual(result['generations'], 150)
+            self.assertEqual(result['frames'], len(frame_generations))
+            self.assertEqual(frame_generations[-1], 150)
+            num_frames[frames_per_second] = result['frames']
+            self.assertEqual(profiler.get_summary()['generations'], 150)
+            self.assertIsNone(actual.profiler)
+            self.assertEqual(pygame.image.tobytes(expected_surface, 'RGB'),
+                             pygame.image.tobytes(actual_surface, 'RGB'))
+        # at 20 frames a second, most generations are coalesced
+        self.assertLess(num_frames[20], 150)
+
+    def test_run_error(self):
+        """
+        Test errors advancing the board are raised by 'run'.
+        """
+        board = GameOfLifeBoard(5, 5, BLINKER)
+
+        def advance_board_one_generation():
+            raise ValueError('step failed')
+
+        board.advance_board_one_generation = advance_board_one_generation
+        with self.assertRaisesRegex(ValueError, 'step failed'):
+            GameOfLifePipeline(board).run()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+import json
+import os
+import tempfile
+import unittest
+
+from game_of_life_board import GameOfLifeBoard
+from game_of_life_driver import GameOfLifeSimulationDriver
+from game_of_life_headless import run_simulation
+from game_of_life_profiler import GameOfLifeProfiler
+from .test_game_of_life_driver import BLINKER, FakeClock
+
+
+class TestGameOfLifeProfiler(unittest.TestCase):
+    """
+    Test profiling simulations.
+    """
+
+    def setUp(self):
+        """
+        Called before each test method.
+        """
+        pass
+
+    def tearDown(self):
+        """
+        Called after each test method.
+        """
+        pass
+
+    def test_generation_records(self):
+        """
+        Test the counters and phase times recorded for each generation.
+        """
+        records = []
+        profiler = GameOfLifeProfiler(on_generation=records.append,
+                                      history_size=2, clock=FakeClock(1))
+        for engine in ('python', 'active', 'numpy'):
+            board = GameOfLifeBoard(5, 5, BLINKER, engine=engine)
+            board.profiler = profiler
+            for _ in range(3):
+                self.assertTrue(board.advance_board_one_generation())
+            self.assertEqual(
+                [(record['generation'], record['population'],
+                  record['flips']) for record in records[-3:]],
+                [(1, 3, 4), (2, 3, 4), (3, 3, 4)])
+        # the active engine only evaluates cells near last generation's flips
+        self.assertEqual([record['cells_evaluated'] for record in records],
+                         [25]*3 + [25, 21, 21] + [25]*3)
+        self.assertEqual(list(profiler.history), records[-2:])
+
+        # each clock read is a second: step, render and stats phases
+        self.assertEqual(records[0]['latency'], 3)
+        self.assertEqual(records[0]['seconds'],
+                         {'step': 1, 'stats': 1, 'render': 1, 'present': 0,
+                          'idle': 0, 'checkpoint': 0})
+        summary = profiler.get_summary()
+        self.assertEqual(summary['generations'], 9)
+        self.assertEqual(summary['seconds']['step'], 9)
+        self.assertEqual(summary['latency'],
+                         {'p50': 3, 'p99': 3, 'mean': 3, 'max': 3})
+
+    def test_percentiles(self):
+        """
+        Test nearest-rank latency percentiles.
+        """
+        profiler = GameOfLifeProfiler()
+        self.assertIsNone(profiler.get_summary()['latency']['p50'])
+        profiler.latencies.extend(range(100, 0, -1))
+        latency = profiler.get_summary()['latency']
+        self.assertEqual((latency['p50'], latency['p99'], latency['max']),
+                         (50, 99, 100))
+        self.assertIn('100 generations', str(profiler))
+
+    def test_driver(self):
+        """
+        Test profiling a driver's frames and waits, and tracing to a file.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'trace.jsonl')
+            clock = FakeClock(0.125)
+            profiler = GameOfLifeProfiler(trace_path=path, clock=clock)
+            board = GameOfLifeBoard(5, 5, BLINKER)
+            GameOfLifeSimulationDriver(
+                board, max_generations=4, frames_per_second=2,
+                generations_per_second=1, clock=clock, sleep=clock.sleep,
+                profiler=profiler).run()
+            self.assertIsNone(board.profiler)
+            profiler.close()
+            with open(path) as trace_file:
+                lines = [json.loads(line) for line in trace_file]
+        self.assertEqual([line['generation'] for line in lines[:-1]],
+                         [1, 2, 3, 4])
+        summary = lines[-1]['summary']
+        self.assertEqual(summary['generations'], 4)
+        for phase in ('step', 'stats', 'render', 'present', 'idle'):
+            self.assertGreater(summary['seconds'][phase], 0, phase)
+        self.assertEqual(summary['seconds']['checkpoint'], 0)
+
+    def test_headless_trace(self):
+        """
+        Test tracing a headless simulation.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'trace.jsonl')
+            result = run_simulation(5, 5, BLINKER, max_generations=6,
+                                    trace_path=path)
+            with open(path) as trace_file:
+                self.assertEqual(len(trace_file.readlines()), 7)
+        self.assertEqual(result['profile']['generations'], 6)
+        self.assertNotIn('profile', run_simulation(5, 5, BLINKER,
+                                                   max_generations=6))
+
+
+if __name__ == '__main__':
+    unittest.main()
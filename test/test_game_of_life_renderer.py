@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+import os
+import unittest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+
+from game_of_life_board import GameOfLifeBoard
+from game_of_life_renderer import GameOfLifeRenderer
+from game_of_life_viewport import GameOfLifeViewport
+
+CANVAS_COLOR = pygame.Color('white')
+
+
+def make_GUI_components(surface, draw_func):
+    return {
+        'draw_surface': surface,
+        'cell_width': 200 / 13,
+        'cell_height': 150 / 9,
+        'cell_shape_generator': pygame.Rect,
+        'cell_outline_color': pygame.Color('black'),
+        'alive_color': pygame.Color('red'),
+        'dead_color': pygame.Color('grey'),
+        'cell_draw_func': draw_func
+    }
+
+
+class TestGameOfLifeRenderer(unittest.TestCase):
+    """
+    Test the GameOfLifeRenderer class.
+    """
+
+    def setUp(self):
+        """
+        Called before each test method.
+        """
+        pygame.display.init()
+        self.display = pygame.display.set_mode((200, 150))
+
+    def tearDown(self):
+        """
+        Called after each test method.
+        """
+        pygame.display.quit()
+
+    def assert_renders_like_cells(self, draw_func):
+        live_cell_coords = {(4, 5), (4, 6), (4, 7), (0, 0), (8, 12)}
+        expected_surface = pygame.Surface((200, 150))
+        expected_surface.fill(CANVAS_COLOR)
+        expected = GameOfLifeBoard(
+            9, 13, live_cell_coords,
+            make_GUI_components(expected_surface, draw_func))
+        actual_surface = pygame.Surface((200, 150))
+        actual = GameOfLifeBoard(
+            9, 13, live_cell_coords,
+            make_GUI_components(actual_surface, draw_func), engine='numpy')
+        actual.renderer = GameOfLifeRenderer(
+            actual, actual_surface, CANVAS_COLOR)
+
+        expected.display_self()
+        actual.display_self()
+        for _ in range(3):
+            expected.advance_board_one_generation()
+            actual.advance_board_one_generation()
+            self.assertEqual(
+                pygame.image.tobytes(expected_surface, 'RGB'),
+                pygame.image.tobytes(actual_surface, 'RGB'))
+
+    def test_draw_rects(self):
+        """
+        Test that rect cells render like GameOfLifeCell.draw_self.
+        """
+        self.assert_renders_like_cells(pygame.draw.rect)
+
+    def test_draw_ellipses(self):
+        """
+        Test that ellipse cells render like GameOfLifeCell.draw_self.
+        """
+        self.assert_renders_like_cells(pygame.draw.ellipse)
+
+    def test_draw_stat_heatmap(self):
+        """
+        Test that heatmaps match blitting an alpha surface per cell.
+        """
+        board = GameOfLifeBoard(
+            9, 13, {(4, 5), (4, 6), (4, 7), (3, 6), (0, 0), (0, 1)},
+            make_GUI_components(self.display, pygame.draw.ellipse),
+            engine='numpy')
+        for _ in range(10):
+            board.advance_board_one_generation()
+        board.calculate_game_stats()
+        renderer = GameOfLifeRenderer(board, self.display, CANVAS_COLOR)
+
+        for category in ['births', 'gens_alive']:
+            expected = pygame.Surface((200, 150))
+            expected.fill(CANVAS_COLOR)
+            color = pygame.Color(board.GUI_components['alive_color'])
+            for row in board.board:
+                for cell in row:
+                    shape = cell.GUI_components['shape']
+                    pygame.draw.ellipse(
+                        expected, pygame.Color('black'),
+                        [shape.x-1, shape.y-1, shape.width+2,
+                         shape.height+2], 1)
+                    cell_surface = pygame.Surface(
+                        (shape.width, shape.height), pygame.SRCALPHA)
+                    color.a = board.get_stat_alpha(cell, category)
+                    cell_surface.fill(color)
+                    expected.blit(cell_surface, (shape.x, shape.y))
+
+            renderer.draw_stat_heatmap(category)
+            self.assertEqual(pygame.image.tobytes(expected, 'RGB'),
+                             pygame.image.tobytes(self.display, 'RGB'))
+            heatmap = renderer.heatmaps[category][1]
+            renderer.draw_stat_heatmap(category)
+            self.assertIs(renderer.heatmaps[category][1], heatmap)
+
+    def test_draw_zoomed_view(self):
+        """
+        Test that a panned and zoomed view renders like the part of a
+        board drawn at that cell size that it shows.
+        """
+        live_cell_coords = {(0, 0), (1, 2), (2, 2), (4, 5), (4, 6), (8, 12)}
+        GUI_components = make_GUI_components(self.display,
+                                             pygame.draw.ellipse)
+        GUI_components['cell_width'] = GUI_components['cell_height'] = 20
+        expected_surface = pygame.Surface((260, 180))
+        expected_surface.fill(CANVAS_COLOR)
+        expected = GameOfLifeBoard(
+            9, 13, live_cell_coords,
+            dict(GUI_components, draw_surface=expected_surface))
+        expected.display_self()
+
+        board = GameOfLifeBoard(9, 13, live_cell_coords,
+                                make_GUI_components(self.display,
+                                                    pygame.draw.ellipse),
+                                engine='numpy')
+        viewport = GameOfLifeViewport(9, 13, 200, 150, cell_width=20,
+                                      cell_height=20)
+        viewport.pan(30, 10)
+        renderer = GameOfLifeRenderer(board, self.display, CANVAS_COLOR,
+                                      viewport)
+        renderer.draw_board()
+        self.assertEqual(
+            pygame.image.tobytes(expected_surface.subsurface(
+                (30, 10, 200, 150)), 'RGB'),
+            pygame.image.tobytes(self.display, 'RGB'))
+
+        # cells out of view are not drawn
+        board.board[0][0].is_alive = False
+        board.board[4][5].is_alive = False
+        renderer.draw_cells([(0, 0), (4, 5)])
+        self.assertEqual(len(renderer.dirty_rects), 2)
+
+    def test_draw_density_view(self):
+        """
+        Test that a view of cells too small to draw shows live cell
+        densities.
+        """
+        board = GameOfLifeBoard(
+            300, 400, {(row, col) for row in range(300) for col in range(200)},
+            make_GUI_components(self.display, pygame.draw.rect),
+            engine='numpy')
+        renderer = GameOfLifeRenderer(board, self.display, CANVAS_COLOR,
+                                      GameOfLifeViewport(300, 400, 200, 150))
+        renderer.draw_board()
+        self.assertEqual(self.display.get_at((50, 75)), pygame.Color('red'))
+        self.assertEqual(self.display.get_at((150, 75)),
+                         pygame.Color('grey'))
+
+        board.board[0][300].is_alive = True
+        renderer.draw_cells([(0, 300)])
+        self.assertEqual(self.display.get_at((150, 0)),
+                         pygame.Color('grey').lerp(pygame.Color('red'),
+                                                   0.25))
+        self.assertEqual(renderer.dirty_rects, [self.display.get_rect()])
+
+    def test_present(self):
+        """
+        Test that only cells drawn since the last present are dirty.
+        """
+        board = GameOfLifeBoard(
+            9, 13, {(4, 5), (4, 6), (4, 7)},
+            make_GUI_components(self.display, pygame.draw.rect))
+        renderer = GameOfLifeRenderer(board, self.display, CANVAS_COLOR)
+        board.renderer = renderer
+        board.display_self()
+        renderer.present()
+        self.assertEqual(renderer.dirty_rects, [])
+        board.advance_board_one_generation()
+        self.assertEqual(len(renderer.dirty_rects), 4)
+        renderer.present()
+        self.assertEqual(renderer.dirty_rects, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
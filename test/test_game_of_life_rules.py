@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+import os
+import tempfile
+import unittest
+
+from game_of_life_bitboard import GameOfLifeBitBoard
+from game_of_life_board import GameOfLifeBoard
+from game_of_life_hashlife import GameOfLifeHashLife
+from game_of_life_rules import CONWAY, GameOfLifeRule
+from .test_game_of_life_engine import board_snapshot, random_live_cell_coords
+
+
+def step_states(states, rows, cols, rule):
+    """
+    Return the next generation of a dict of (row, col) -> nonzero state,
+    computed straight from the rule's birth and survival counts.
+    """
+    next_states = {}
+    for row in range(rows):
+        for col in range(cols):
+            state = states.get((row, col), 0)
+            num_live_neighbors = sum(
+                states.get((row+d_row, col+d_col)) == 1
+                for d_row in (-1, 0, 1) for d_col in (-1, 0, 1)
+                if d_row or d_col)
+            if state == 0:
+                next_state = int(num_live_neighbors in rule.birth_counts)
+            elif state == 1 and num_live_neighbors in rule.survival_counts:
+                next_state = 1
+            else:
+                next_state = (state+1) % rule.num_states
+            if next_state:
+                next_states[(row, col)] = next_state
+    return next_states
+
+
+class TestGameOfLifeRules(unittest.TestCase):
+    """
+    Test parsing rulestrings and running boards under other rules.
+    """
+
+    def setUp(self):
+        """
+        Called before each test method.
+        """
+        self.rows, self.cols = 16, 19
+        self.live_cell_coords = random_live_cell_coords(
+            self.rows, self.cols, 0.4, seed=3)
+
+    def tearDown(self):
+        """
+        Called after each test method.
+        """
+        pass
+
+    def test_parse(self):
+        """
+        Test that rulestring notations and names parse to the same rules.
+        """
+        for rulestring in ('B3/S23', 'b3/s23', 'S23/B3', '23/3', 'life',
+                           'B3/S32/C2'):
+            self.assertEqual(GameOfLifeRule(rulestring), CONWAY)
+        self.assertEqual(str(GameOfLifeRule('highlife')), 'B36/S23')
+        self.assertEqual(str(GameOfLifeRule('B2/S')), 'B2/S')
+        self.assertEqual(str(GameOfLifeRule('/2/3')), 'B2/S/C3')
+        self.assertEqual(str(GameOfLifeRule('345/2/4')), 'B2/S345/C4')
+        self.assertEqual(GameOfLifeRule("Brian's Brain").num_states, 3)
+        for rulestring in ('B9/S23', 'B3/S23/C1', 'B2a/S23', 'R2,C0,M1',
+                           'B3/S23/C999', 'nonsense'):
+            self.assertRaises(ValueError, GameOfLifeRule, rulestring)
+
+    def test_tables(self):
+        """
+        Test the compiled next state and neighborhood tables.
+        """
+        self.assertEqual(CONWAY.next_states[0],
+                         (0, 0, 0, 1, 0, 0, 0, 0, 0))
+        self.assertEqual(CONWAY.next_states[1],
+                         (0, 0, 1, 1, 0, 0, 0, 0, 0))
+        self.assertEqual(CONWAY.table.shape, (2, 9))
+        brain = GameOfLifeRule("brian's brain")
+        self.assertEqual(brain.next_states[1], (2,)*9)
+        self.assertEqual(brain.next_states[2], (0,)*9)
+        self.assertIsNone(brain.neighborhood_table)
+
+        # a row of three with the center alive, and the same without it
+        self.assertEqual(CONWAY.neighborhood_table[0b000111010], 1)
+        self.assertEqual(CONWAY.neighborhood_table[0b000101000], 0)
+        self.assertEqual(CONWAY.neighborhood_table[0b000111000], 1)
+        for mask in range(512):
+            self.assertEqual(
+                CONWAY.neighborhood_table[mask],
+                CONWAY.get_next_state(mask >> 4 & 1,
+                                      bin(mask & ~16).count('1')))
+
+    def test_two_state_rules(self):
+        """
+        Test that every engine follows two-state rules.
+        """
+        for rulestring in ('B36/S23', 'B3678/S34678', 'B2/S', 'B0/S8',
+                           'B1357/S1357'):
+            rule = GameOfLifeRule(rulestring)
+            expected = {coords: 1 for coords in self.live_cell_coords}
+            boards = [
+                GameOfLifeBoard(self.rows, self.cols, self.live_cell_coords,
+                                engine=engine, rule=rulestring)
+                for engine in ('python', 'active', 'numpy')]
+            boards.append(GameOfLifeBoard(
+                self.rows, self.cols, self.live_cell_coords,
+                engine='parallel', engine_options={'workers': 2},
+                rule=rulestring))
+            bit_board = GameOfLifeBitBoard(
+                self.rows, self.cols, self.live_cell_coords, rule=rule)
+            for _ in range(12):
+                expected = step_states(expected, self.rows, self.cols, rule)
+                bit_board.advance_board_one_generation()
+                self.assertEqual(sorted(bit_board.get_live_cell_coords()),
+                                 sorted(expected), rulestring)
+                for board in boards:
+                    board.advance_board_one_generation()
+                    self.assertEqual(
+                        sorted(map(tuple, board.get_live_cell_coords())),
+                        sorted(expected), rulestring)
+            for board in boards[1:]:
+                self.assertEqual(board_snapshot(board),
+                                 board_snapshot(boards[0]))
+            boards[-1].engine.close()
+
+    def test_hashlife(self):
+        """
+        Test that HashLife follows the rule of its universe.
+        """
+        rule = GameOfLifeRule('B36/S23')
+        live_cell_coords = {(row+40, col+40)
+                            for row, col in self.live_cell_coords}
+        universe = GameOfLifeHashLife(live_cell_coords, rule=rule)
+        expected = {coords: 1 for coords in live_cell_coords}
+        for _ in range(8):
+            expected = step_states(expected, 100, 100, rule)
+        universe.advance(3)
+        self.assertEqual(sorted(universe.get_live_cell_coords()),
+                         sorted(expected))
+        self.assertRaises(ValueError, GameOfLifeHashLife, rule=GameOfLifeRule(
+            'B0/S8'))
+        self.assertRaises(ValueError, GameOfLifeBoard, 4, 4,
+                          engine='hashlife', rule='B2/S/C3')
+
+    def test_generations(self):
+        """
+        Test Generations rules on the engines that keep cell states.
+        """
+        rule = GameOfLifeRule('B2/S345/C4')
+        expected = {coords: 1 for coords in self.live_cell_coords}
+        board = GameOfLifeBoard(self.rows, self.cols, self.live_cell_coords,
+                                engine='numpy', rule=rule)
+        parallel_board = GameOfLifeBoard(
+            self.rows, self.cols, self.live_cell_coords, engine='parallel',
+            engine_options={'workers': 3}, rule=rule)
+        for _ in range(10):
+            previous = expected
+            expected = step_states(expected, self.rows, self.cols, rule)
+            changed = {coords for coords in set(previous) | set(expected)
+                       if previous.get(coords) != expected.get(coords)}
+            for each_board in (board, parallel_board):
+                each_board.advance_board_one_generation()
+                self.assertEqual(
+                    set(map(tuple, each_board.cells_to_flip)), changed)
+                self.assertEqual(
+                    {(row, col): int(each_board.engine.alive[row, col])
+                     for row in range(self.rows) for col in range(self.cols)
+                     if each_board.engine.alive[row, col]},
+                    expected)
+        self.assertEqual(board_snapshot(board),
+                         board_snapshot(parallel_board))
+        parallel_board.engine.close()
+
+        self.assertRaises(ValueError, GameOfLifeBoard, 4, 4, rule=rule)
+        self.assertRaises(ValueError, GameOfLifeBoard, 4, 4, engine='numpy',
+                          rule=rule, detect_cycles=True)
+
+    def test_snapshot_and_pattern_rules(self):
+        """
+        Test that snapshots and patterns keep the board's rule.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'board.snap')
+            board = GameOfLifeBoard(self.rows, self.cols,
+                                    self.live_cell_coords, engine='numpy',
+                                    rule="brian's brain")
+            for _ in range(3):
+                board.advance_board_one_generation()
+            board.save_snapshot(path)
+            loaded_board = GameOfLifeBoard.load_snapshot(path, engine='numpy')
+            self.assertEqual(loaded_board.rule, board.rule)
+            self.assertEqual(board_snapshot(loaded_board),
+                             board_snapshot(board))
+            self.assertEqual(loaded_board.engine.alive.tolist(),
+                             board.engine.alive.tolist())
+
+            path = os.path.join(directory, 'board.rle')
+            board = GameOfLifeBoard(self.rows, self.cols,
+                                    self.live_cell_coords, rule='highlife')
+            board.save_pattern(path)
+            loaded_board = GameOfLifeBoard.load_pattern(path)
+            self.assertEqual(loaded_board.rule.rulestring, 'B36/S23')
+            self.assertEqual(sorted(loaded_board.get_live_cell_coords()),
+                             sorted(board.get_live_cell_coords()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from game_of_life_board import GameOfLifeBoard
+from game_of_life_cell import GameOfLifeCell
+from game_of_life_driver import GameOfLifeSimulationDriver
+from game_of_life_snapshot import (ALIGNMENT, GameOfLifeSnapshot, get_layout,
+                                   load_snapshot, save_snapshot)
+
+from .test_game_of_life_engine import random_live_cell_coords
+
+
+class TestGameOfLifeSnapshot(unittest.TestCase):
+    """
+    Test saving, loading and checkpointing snapshots.
+    """
+
+    def setUp(self):
+        """
+        Called before each test method.
+        """
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """
+        Called after each test method.
+        """
+        shutil.rmtree(self.directory)
+
+    def test_save_snapshot(self):
+        """
+        Test a saved snapshot loads back the same arrays, memory-mapped.
+        """
+        path = os.path.join(self.directory, 'board.snap')
+        rng = np.random.default_rng(0)
+        alive = rng.random((5, 11)) < 0.5
+        stats = {'births': rng.integers(0, 100, (5, 11)),
+                 'deaths': rng.integers(0, 100, (5, 11))}
+        save_snapshot(path, alive, stats, generation=42)
+
+        snapshot = load_snapshot(path)
+        self.assertEqual((snapshot.rows, snapshot.cols), (5, 11))
+        self.assertEqual(snapshot.generation, 42)
+        self.assertIsInstance(snapshot.stats['births'], np.memmap)
+        self.assertEqual(list(snapshot.stats), ['births', 'deaths'])
+        self.assertTrue((snapshot.get_alive() == alive).all())
+        self.assertTrue((snapshot.get_alive(slice(2, 4)) == alive[2:4]).all())
+        for key in stats:
+            self.assertTrue((snapshot.stats[key] == stats[key]).all())
+
+        layout = get_layout(5, 11, list(stats))
+        for offset in layout.values():
+            self.assertEqual(offset % ALIGNMENT, 0)
+        self.assertEqual(os.path.getsize(path), layout['end'])
+
+    def test_load_snapshot_errors(self):
+        """
+        Test files that are not snapshots of this version are rejected.
+        """
+        path = os.path.join(self.directory, 'board.snap')
+        with open(path, 'wb') as snapshot_file:
+            snapshot_file.write(b'not a snapshot at all, just some bytes')
+        self.assertRaises(ValueError, GameOfLifeSnapshot, path)
+
+        save_snapshot(path, np.zeros((2, 2)), {})
+        with open(path, 'r+b') as snapshot_file:
+            snapshot_file.seek(8)
+            snapshot_file.write(b'\xff')
+        self.assertRaises(ValueError, GameOfLifeSnapshot, path)
+
+    def test_board_snapshot(self):
+        """
+        Test a board resumed from a snapshot carries on like the original.
+        """
+        path = os.path.join(self.directory, 'board.snap')
+        live_cell_coords = random_live_cell_coords(12, 9, 0.4, seed=1)
+        for engine in ('python', 'numpy'):
+            board = GameOfLifeBoard(12, 9, live_cell_coords, engine=engine)
+            for _ in range(5):
+                board.advance_board_one_generation()
+            board.save_snapshot(path)
+
+            resumed_board = GameOfLifeBoard.load_snapshot(
+                path, engine='numpy', streaming_stats=True)
+            self.assertEqual(resumed_board.generation, 5)
+            for _ in range(5):
+                board.advance_board_one_generation()
+                resumed_board.advance_board_one_generation()
+            self.assertEqual(
+                sorted(map(tuple, board.get_live_cell_coords())),
+                sorted(map(tuple, resumed_board.get_live_cell_coords())))
+            for category in GameOfLifeCell.STAT_KEYS:
+                self.assertEqual(
+                    board.engine.get_stat_array(category).tolist(),
+                    resumed_board.engine.get_stat_array(category).tolist())
+            resumed_board.calculate_game_stats()
+            self.assertEqual(
+                resumed_board.stats['births'].stats['max'],
+                int(board.engine.get_stat_array('births').max()))
+
+    def test_checkpoint(self):
+        """
+        Test the simulation driver checkpoints periodically and at the end.
+        """
+        path = os.path.join(self.directory, 'board-{generation}.snap')
+        board = GameOfLifeBoard(5, 5, {(2, 1), (2, 2), (2, 3)})
+        GameOfLifeSimulationDriver(
+            board, max_generations=7, checkpoint_path=path,
+            checkpoint_every=3).run()
+        self.assertEqual(sorted(os.listdir(self.directory)),
+                         ['board-3.snap', 'board-6.snap', 'board-7.snap'])
+        snapshot = load_snapshot(path.format(generation=7))
+        self.assertEqual(snapshot.generation, 7)
+        self.assertEqual(sorted(map(tuple, snapshot.get_live_cell_coords())),
+                         [(1, 2), (2, 2), (3, 2)])
+
+        with self.assertRaises(ValueError):
+            GameOfLifeSimulationDriver(board, checkpoint_every=3)
+        with self.assertRaises(ValueError):
+            GameOfLifeSimulationDriver(board, checkpoint_path=path,
+                                       checkpoint_every=0)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from game_of_life_board import GameOfLifeBoard
+from game_of_life_ensemble import get_soup
+from game_of_life_time_series import GameOfLifeTimeSeries
+
+
+def get_metrics(alive, previous_alive):
+    """
+    Return the time series metrics of a bool array of live cells, counted
+    over the whole board.
+    """
+    rows, cols = np.nonzero(alive)
+    births = int(np.count_nonzero(alive & ~previous_alive))
+    deaths = int(np.count_nonzero(previous_alive & ~alive))
+    if not len(rows):
+        return [0, births, deaths, -1, -1, -1, -1, -1, -1]
+    return [len(rows), births, deaths, rows.min(), rows.max(), cols.min(),
+            cols.max(), rows.mean(), cols.mean()]
+
+
+class TestGameOfLifeTimeSeries(unittest.TestCase):
+    """
+    Test recording population metrics every generation.
+    """
+
+    def setUp(self):
+        """
+        Called before each test method.
+        """
+        pass
+
+    def tearDown(self):
+        """
+        Called after each test method.
+        """
+        pass
+
+    def run_board(self, board, generations):
+        """
+        Advance the board, returning the metrics of each generation counted
+        from its cells.
+        """
+        alive = board.engine.get_alive_array() == 1
+        metrics = [get_metrics(alive, alive)]
+        for _ in range(generations):
+            board.advance_board_one_generation()
+            previous_alive = alive
+            alive = board.engine.get_alive_array() == 1
+            metrics.append(get_metrics(alive, previous_alive))
+        return np.array(metrics, dtype=float)
+
+    def test_record(self):
+        """
+        Test each generation's metrics match counting them from the cells,
+        for each engine, for a Generations rule and for a board that dies.
+        """
+        soup = set(zip(*get_soup(30, 40, 0.35, 5, 0).nonzero()))
+        for engine, rule, live_cell_coords in [
+                ('python', 'B3/S23', soup), ('active', 'B3/S23', soup),
+                ('numpy', 'B3/S23', soup), ('numpy', 'B2/S/C3', soup),
+                ('numpy', 'B3/S23', {(0, 0), (3, 3), (3, 4)})]:
+            board = GameOfLifeBoard(30, 40, live_cell_coords, engine=engine,
+                                    rule=rule, record_time_series=True,
+                                    time_series_max_buckets=None)
+            expected = self.run_board(board, 80)
+            columns = board.time_series.get_columns()
+            self.assertEqual(columns['generation'].tolist(), list(range(81)))
+            self.assertEqual(columns['generations'].tolist(), [1]*81)
+            for index, metric in enumerate(GameOfLifeTimeSeries.METRICS):
+                for suffix in ('', '_min', '_max'):
+                    np.testing.assert_allclose(columns[metric + suffix],
+                                               expected[:, index])
+
+    def test_downsample(self):
+        """
+        Test the oldest buckets are merged to keep at most max_buckets.
+        """
+        board = GameOfLifeBoard(
+            30, 40, set(zip(*get_soup(30, 40, 0.35, 6, 0).nonzero())),
+            engine='numpy', record_time_series=True,
+            time_series_max_buckets=8)
+        expected = self.run_board(board, 99)
+        time_series = board.time_series
+        self.assertEqual(time_series.bucket_size, 16)
+        self.assertEqual(len(time_series), 7)
+        columns = time_series.get_columns()
+        self.assertEqual(columns['generation'].tolist(),
+                         list(range(0, 100, 16)))
+        self.assertEqual(columns['generations'].tolist(), [16]*6 + [4])
+        for bucket, generation in enumerate(columns['generation']):
+            bucket_values = expected[generation:generation+16]
+            for index, metric in enumerate(GameOfLifeTimeSeries.METRICS):
+                self.assertAlmostEqual(columns[metric][bucket],
+                                       bucket_values[:, index].mean())
+                self.assertEqual(columns[metric + '_min'][bucket],
+                                 bucket_values[:, index].min())
+                self.assertEqual(columns[metric + '_max'][bucket],
+                                 bucket_values[:, index].max())
+
+    def test_seek(self):
+        """
+        Test the series picks the board up again after it seeks.
+        """
+        board = GameOfLifeBoard(
+            30, 40, set(zip(*get_soup(30, 40, 0.35, 7, 0).nonzero())),
+            engine='numpy', record_history=True, record_time_series=True)
+        expected = self.run_board(board, 20)
+        board.seek(10)
+        board.advance_board_one_generation()
+        columns = board.time_series.get_columns()
+        self.assertEqual(columns['generation'].tolist()[-2:], [20, 11])
+        self.assertEqual(columns['population'][-1], expected[11, 0])
+
+    def test_save(self):
+        """
+        Test saving the series as CSV and NPY.
+        """
+        board = GameOfLifeBoard(5, 5, {(2, 1), (2, 2), (2, 3)},
+                                record_time_series=True)
+        for _ in range(3):
+            board.advance_board_one_generation()
+        directory = tempfile.mkdtemp()
+        try:
+            csv_path = os.path.join(directory, 'series.csv')
+            npy_path = os.path.join(directory, 'series.npy')
+            board.time_series.save(csv_path)
+            board.time_series.save(npy_path)
+            with open(csv_path, newline='') as csv_file:
+                rows = list(csv.DictReader(csv_file))
+            array = np.load(npy_path)
+        finally:
+            shutil.rmtree(directory)
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(list(rows[0])[:4],
+                         ['generation', 'generations', 'population',
+                          'population_min'])
+        self.assertEqual([row['births'] for row in rows],
+                         ['0.0', '2.0', '2.0', '2.0'])
+        self.assertEqual(rows[1]['min_row'], '1.0')
+        self.assertEqual(array['generation'].tolist(), [0, 1, 2, 3])
+        self.assertEqual(array['center_col'].tolist(), [2, 2, 2, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from game_of_life_board import GameOfLifeBoard
+from game_of_life_topology import (TOPOLOGIES, get_rule_suffix,
+                                   get_topology, split_rule_suffix)
+from .test_game_of_life_engine import board_snapshot, random_live_cell_coords
+
+
+def step_live_cell_coords(live_cell_coords, topology):
+    """
+    Return the next generation of a set of live cell coords under B3/S23,
+    counting neighbors from the topology's neighbor table.
+    """
+    next_live_cell_coords = set([])
+    for row in range(topology.rows):
+        for col in range(topology.cols):
+            num_live_neighbors = sum(
+                coords in live_cell_coords
+                for coords in topology.neighbor_coords[row][col])
+            if (num_live_neighbors == 3 or (
+                    num_live_neighbors == 2 and
+                    (row, col) in live_cell_coords)):
+                next_live_cell_coords.add((row, col))
+    return next_live_cell_coords
+
+
+class TestGameOfLifeTopology(unittest.TestCase):
+    """
+    Test board topologies and stepping boards on them.
+    """
+
+    def setUp(self):
+        """
+        Called before each test method.
+        """
+        self.rows, self.cols = 13, 17
+        self.live_cell_coords = random_live_cell_coords(
+            self.rows, self.cols, 0.35, seed=5)
+
+    def tearDown(self):
+        """
+        Called after each test method.
+        """
+        pass
+
+    def test_neighbor_coords(self):
+        """
+        Test each topology's neighbors of a corner cell.
+        """
+        expected = {
+            'bounded': {(0, 1), (1, 0), (1, 1)},
+            'torus': {(0, 1), (1, 0), (1, 1), (0, 4), (1, 4), (3, 0),
+                      (3, 1), (3, 4)},
+            'klein bottle': {(0, 1), (1, 0), (1, 1), (0, 4), (1, 4),
+                             (3, 4), (3, 3), (3, 0)},
+            'infinite': {(0, 1), (1, 0), (1, 1)}
+        }
+        for name, neighbors in expected.items():
+            topology = get_topology(name, 4, 5)
+            self.assertEqual(set(topology.neighbor_coords[0][0]), neighbors,
+                             name)
+        self.assertRaises(ValueError, get_topology, 'sphere', 4, 5)
+
+    def test_pad(self):
+        """
+        Test that padded arrays count the same neighbors as the neighbor
+        tables, for whole boards and stripes of rows.
+        """
+        cells = np.zeros((self.rows, self.cols), dtype=np.uint8)
+        cells[tuple(np.array(sorted(self.live_cell_coords)).T)] = 1
+        for name in TOPOLOGIES:
+            topology = get_topology(name, self.rows, self.cols)
+            expected = np.array(
+                [[sum(cells[coords]
+                      for coords in topology.neighbor_coords[row][col])
+                  for col in range(self.cols)]
+                 for row in range(self.rows)])
+            for start, stop in ((0, self.rows), (0, 4), (4, 9),
+                                (9, self.rows)):
+                padded = np.zeros((stop-start+2, self.cols+2), dtype=int)
+                topology.pad(cells, padded, start, stop)
+                counts = sum(
+                    padded[d_row:d_row+stop-start, d_col:d_col+self.cols]
+                    for d_row in range(3) for d_col in range(3)
+                    if d_row != 1 or d_col != 1)
+                self.assertEqual(counts.tolist(),
+                                 expected[start:stop].tolist(), name)
+
+    def test_wrapping_engines(self):
+        """
+        Test that every engine steps torus and Klein bottle boards.
+        """
+        for name in ('torus', 'klein bottle'):
+            topology = get_topology(name, self.rows, self.cols)
+            expected = set(self.live_cell_coords)
+            boards = [
+                GameOfLifeBoard(self.rows, self.cols, self.live_cell_coords,
+                                engine=engine, topology=name)
+                for engine in ('python', 'active', 'numpy')]
+            boards.append(GameOfLifeBoard(
+                self.rows, self.cols, self.live_cell_coords,
+                engine='parallel', engine_options={'workers': 2},
+                topology=name))
+            for _ in range(20):
+                expected = step_live_cell_coords(expected, topology)
+                for board in boards:
+                    board.advance_board_one_generation()
+                    self.assertEqual(
+                        set(map(tuple, board.get_live_cell_coords())),
+                        expected, name)
+            for board in boards[1:]:
+                self.assertEqual(board_snapshot(board),
+                                 board_snapshot(boards[0]))
+            boards[-1].engine.close()
+
+    def test_torus_glider(self):
+        """
+        Test that a glider on a torus comes back after crossing the edges.
+        """
+        glider = {(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)}
+        board = GameOfLifeBoard(6, 6, glider, engine='numpy',
+                                topology='torus')
+        for _ in range(24):
+            board.advance_board_one_generation()
+        self.assertEqual(set(map(tuple, board.get_live_cell_coords())),
+                         glider)
+        self.assertEqual(board.get_num_live_neighbors(board.board[5][0]), 1)
+        self.assertEqual(board.get_num_live_neighbors(board.board[0][5]), 0)
+
+    def test_infinite_engines(self):
+        """
+        Test that engines on infinite boards match HashLife, including
+        cells that leave the board and come back.
+        """
+        boards = [
+            GameOfLifeBoard(self.rows, self.cols, self.live_cell_coords,
+                            engine=engine, topology='infinite')
+            for engine in ('hashlife', 'python', 'active', 'numpy')]
+        for _ in range(60):
+            for board in boards:
+                board.advance_board_one_generation()
+            for board in boards[1:]:
+                self.assertEqual(board_snapshot(board),
+                                 board_snapshot(boards[0]))
+        self.assertGreater(boards[-1].engine.universe.shape[0], self.rows+2)
+        for row, col in ((0, 0), (5, 16), (12, 3)):
+            self.assertEqual(
+                {board.get_num_live_neighbors(board.board[row][col])
+                 for board in boards[:-1]},
+                {boards[-1].get_num_live_neighbors(
+                    boards[-1].board[row][col])})
+
+    def test_unsupported(self):
+        """
+        Test topologies that engines or rules do not support.
+        """
+        self.assertEqual(GameOfLifeBoard(4, 4, engine='hashlife')
+                         .topology.NAME, 'infinite')
+        self.assertRaises(ValueError, GameOfLifeBoard, 4, 4,
+                          engine='hashlife', topology='torus')
+        self.assertRaises(ValueError, GameOfLifeBoard, 4, 4,
+                          engine='parallel', topology='infinite')
+        self.assertRaises(ValueError, GameOfLifeBoard, 4, 4,
+                          topology='infinite', rule='B03/S23')
+
+    def test_rule_suffixes(self):
+        """
+        Test Golly topology suffixes and saving boards' topologies.
+        """
+        self.assertEqual(split_rule_suffix('B3/S23'),
+                         ('B3/S23', None, None, None))
+        self.assertEqual(split_rule_suffix('B3/S23:T40,30'),
+                         ('B3/S23', 'torus', 30, 40))
+        self.assertEqual(split_rule_suffix('23/3:k8*,6'),
+                         ('23/3', 'klein bottle', 6, 8))
+        for suffix in ('S40,30', 'K8,6*', 'T0,30', 'P8*,6'):
+            self.assertRaises(ValueError, split_rule_suffix,
+                              'B3/S23:' + suffix)
+        self.assertEqual(get_rule_suffix(get_topology('klein bottle', 6, 8)),
+                         ':K8*,6')
+        self.assertEqual(get_rule_suffix(get_topology('infinite', 6, 8)), '')
+
+        with tempfile.TemporaryDirectory() as directory:
+            board = GameOfLifeBoard(self.rows, self.cols,
+                                    self.live_cell_coords, topology='torus')
+            for extension in ('rle', 'snap'):
+                path = os.path.join(directory, 'board.' + extension)
+                if extension == 'rle':
+                    board.save_pattern(path)
+                    loaded_board = GameOfLifeBoard.load_pattern(path)
+                else:
+                    board.save_snapshot(path)
+                    loaded_board = GameOfLifeBoard.load_snapshot(path)
+                self.assertEqual(loaded_board.topology.NAME, 'torus')
+                self.assertEqual(board_snapshot(loaded_board)[0][0][0],
+                                 board_snapshot(board)[0][0][0])
+                self.assertEqual(
+                    sorted(map(tuple, loaded_board.get_live_cell_coords())),
+                    sorted(board.get_live_cell_coords()))
+
+
+if __name__ == '__main__':
+    unittest.main()
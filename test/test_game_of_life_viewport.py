@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+import unittest
+
+import numpy as np
+
+from game_of_life_viewport import GameOfLifeViewport
+
+
+class TestGameOfLifeViewport(unittest.TestCase):
+    """
+    Test the GameOfLifeViewport class.
+    """
+
+    def setUp(self):
+        """
+        Called before each test method.
+        """
+        self.viewport = GameOfLifeViewport(300, 400, 200, 150)
+
+    def tearDown(self):
+        """
+        Called after each test method.
+        """
+        pass
+
+    def test_init(self):
+        """
+        Test that a new viewport fits the whole board.
+        """
+        viewport = self.viewport
+        self.assertEqual((viewport.cell_width, viewport.cell_height),
+                         (0.5, 0.5))
+        self.assertEqual(viewport.get_visible_cells(), (0, 300, 0, 400))
+        self.assertFalse(viewport.is_detailed())
+        self.assertTrue(GameOfLifeViewport(9, 13, 200, 150).is_detailed())
+
+    def test_zoom(self):
+        """
+        Test zooming about a pixel, up to the viewport's limits.
+        """
+        viewport = self.viewport
+        viewport.zoom(8, 100, 30)
+        self.assertEqual((viewport.cell_width, viewport.cell_height), (4, 4))
+        self.assertTrue(viewport.is_detailed())
+        self.assertEqual(viewport.get_board_coords(100, 30), (60, 200))
+        self.assertEqual(viewport.get_cell_at(100, 30), (60, 200))
+        self.assertEqual(viewport.get_visible_cells(), (52, 90, 175, 225))
+
+        viewport.zoom(1000)
+        self.assertEqual(viewport.cell_width, viewport.MAX_CELL_SIZE)
+        viewport.zoom(0.001)
+        self.assertEqual(viewport.get_state(), (0, 0, 0.5, 0.5))
+        viewport.zoom(8)
+        viewport.fit()
+        self.assertEqual(viewport.get_state(), (0, 0, 0.5, 0.5))
+
+    def test_pan(self):
+        """
+        Test panning, which stops at the board's edges.
+        """
+        viewport = self.viewport
+        viewport.pan(50, 50)
+        self.assertEqual((viewport.row, viewport.col), (0, 0))
+        viewport.zoom(10, 0, 0)
+        viewport.pan(55, 20)
+        self.assertEqual((viewport.row, viewport.col), (4, 11))
+        self.assertEqual(viewport.get_screen_coords(5, 12), (5, 5))
+        self.assertEqual(viewport.get_cell_at(5, 5), (5, 12))
+        self.assertEqual(viewport.get_cell_at(4.9, 4.9), (4, 11))
+        viewport.pan(-1000, 10**6)
+        self.assertEqual((viewport.row, viewport.col), (270, 0))
+        self.assertIsNone(viewport.get_cell_at(0, 150))
+        self.assertIsNone(viewport.get_cell_at(-1, 0))
+
+    def test_get_live_sample_counts(self):
+        """
+        Test counting live cells sampled under each pixel.
+        """
+        viewport = self.viewport
+        rng = np.random.default_rng(0)
+        states = (rng.random((300, 400)) < 0.3).astype(np.uint8)
+        states[0, 1] = 2  # dying cells are not counted
+        # two cells a pixel, each sampled twice
+        counts = viewport.get_live_sample_counts(states)
+        self.assertEqual(counts.shape, (150, 200))
+        self.assertEqual(counts.tolist(), (states == 1).reshape(
+            150, 2, 200, 2).sum(axis=(1, 3)).tolist())
+
+        # zoomed in, pixels show the cells under them
+        viewport.zoom(8, 0, 0)
+        viewport.pan(13, 7)
+        counts = viewport.get_live_sample_counts(states)
+        self.assertEqual(counts.shape, (150, 200))
+        self.assertEqual(counts[2:4, 3:6].tolist(), [[4*states[1, 4]]*3]*2)
+        self.assertEqual(
+            [counts[y, x] for y, x in ((1, 2), (5, 5), (149, 199))],
+            [4*states[viewport.get_cell_at(x+0.5, y+0.5)]
+             for y, x in ((1, 2), (5, 5), (149, 199))])
+
+        # a board that does not fill the window
+        viewport = GameOfLifeViewport(4, 4, 20, 10, cell_width=2,
+                                      cell_height=2)
+        self.assertEqual(viewport.get_live_sample_counts(
+            np.ones((4, 4), dtype=np.uint8)).shape, (8, 8))
+
+
+if __name__ == '__main__':
+    unittest.main()